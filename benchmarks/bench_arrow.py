@@ -0,0 +1,84 @@
+"""
+Benchmark peak memory pipeline: handoff pandas (lama) vs Arrow record batch
+
+Setiap varian dijalankan di subprocess terpisah supaya peak RSS (ru_maxrss)
+tidak saling mempengaruhi. Tahap yang diukur: buffer hasil extract
+(ProductColumns vs ArrowProductColumns) -> DataFrame/Table mentah ->
+transform -> baris untuk Google Sheets.
+
+Contoh:
+    python benchmarks/bench_arrow.py --cards 500000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def run_variant(variant, cards):
+    sys.path.insert(0, ROOT)
+    import contextlib
+    import io
+    import resource
+    import time
+
+    from utils.extract import ProductColumns
+    from bench_records import synthetic_records
+
+    if variant == 'arrow':
+        from utils.arrow_io import ArrowProductColumns
+        products = ArrowProductColumns()
+    else:
+        products = ProductColumns()
+    for record in synthetic_records(cards):
+        products.append(record, '2024-01-01T00:00:00')
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if variant == 'pandas':
+            from utils.transform import transform_data
+            df_clean = transform_data(products.to_dataframe())
+            rows = [df_clean.columns.tolist()] + df_clean.values.tolist()
+        else:
+            from utils.arrow_io import batch_to_sheet_rows, frame_from_batch, frame_to_arrow
+            from utils.transform import transform_data_compiled
+            df_clean = transform_data_compiled(frame_from_batch(products.to_arrow()))
+            rows = batch_to_sheet_rows(frame_to_arrow(df_clean))
+    elapsed = time.perf_counter() - started
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {'variant': variant, 'rows': len(rows) - 1, 'seconds': round(elapsed, 2),
+            'baseline_mb': round(baseline_kb / 1024, 1), 'peak_mb': round(peak_kb / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cards', type=int, default=500000)
+    parser.add_argument('--variant', choices=['pandas', 'arrow'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.cards)))
+        return
+
+    print(f"Extract buffer -> transform -> Sheets rows, {args.cards:,} synthetic cards")
+    for variant in ['pandas', 'arrow']:
+        result = subprocess.run(
+            [sys.executable, '-W', 'ignore', __file__, '--variant', variant, '--cards', str(args.cards)],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        if result.returncode != 0:
+            print(f"{variant:>7}: failed\n{result.stderr}")
+            continue
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{variant:>7}: {stats['seconds']:6.2f} s, peak RSS {stats['peak_mb']:7.1f} MB "
+              f"(after extract {stats['baseline_mb']:.1f} MB, +{stats['peak_mb'] - stats['baseline_mb']:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
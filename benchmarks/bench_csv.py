@@ -0,0 +1,51 @@
+"""
+Benchmark throughput save_to_csv: writer pandas vs writer pyarrow
+
+Frame bersih sintetis ditulis dengan setiap kombinasi engine x kompresi,
+semuanya memakai atomic write (file sementara lalu rename) seperti main.py.
+
+Contoh:
+    python benchmarks/bench_csv.py --rows 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_store import synthetic_clean
+from utils.load import save_to_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    df = synthetic_clean(args.rows)
+    print(f"save_to_csv, {args.rows:,} clean rows (atomic=True)")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for suffix in ['.csv', '.csv.gz', '.csv.zst']:
+            for engine in ['pandas', 'arrow']:
+                path = os.path.join(tmpdir, 'products' + suffix)
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()) as output:
+                    ok = save_to_csv(df, path, engine=engine, atomic=True)
+                elapsed = time.perf_counter() - started
+                label = f"{engine:>6} {suffix:<8}"
+                if not ok:
+                    print(f"{label}: failed ({output.getvalue().strip()})")
+                    continue
+                size_mb = os.path.getsize(path) / (1024 * 1024)
+                rows_per_sec = args.rows / elapsed
+                print(f"{label}: {elapsed:6.2f} s, {rows_per_sec / 1e6:5.2f} M rows/s, {size_mb:7.1f} MB on disk")
+                os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
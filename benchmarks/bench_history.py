@@ -0,0 +1,71 @@
+"""
+Benchmark PriceHistory: query as-of dan series setelah banyak run
+
+Mensimulasikan satu run per hari selama --days hari dengan --products produk;
+bulan yang sudah lewat dikompaksi otomatis saat append. Query "series satu
+produk" dan "as-of T untuk beberapa produk" hanya membuka segment yang lolos
+statistik manifest dan bloom filter, lalu membaca baris key itu lewat mmap.
+--no-compact menonaktifkan kompaksi otomatis sebagai pembanding.
+
+Contoh:
+    python benchmarks/bench_history.py --days 730 --products 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+import pandas as pd
+
+from utils.history import PriceHistory, product_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--no-compact', action='store_true')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    base = pd.DataFrame({
+        'Title': [f'T-shirt {i}' for i in range(args.products)],
+        'Size': 'M',
+        'Gender': 'Women',
+    })
+    with tempfile.TemporaryDirectory() as tmpdir:
+        history = PriceHistory(os.path.join(tmpdir, 'history'), auto_compact=not args.no_compact)
+        started = time.perf_counter()
+        day0 = pd.Timestamp('2023-01-01')
+        for day in range(args.days):
+            run = base.assign(Price=rng.integers(1000, 50000, args.products) * 16.0,
+                              Rating=rng.integers(10, 50, args.products) / 10,
+                              timestamp=(day0 + pd.Timedelta(days=day)).isoformat())
+            history.append(run)
+        elapsed = time.perf_counter() - started
+        print(f"Appended {args.days} runs x {args.products:,} products in {elapsed:.1f} s, "
+              f"{len(history.manifest['segments'])} segments, "
+              f"manifest {os.path.getsize(history.manifest_path) / 1024:.0f} KiB")
+
+        key = product_key('T-shirt 42', 'M', 'Women')
+        keys = [product_key(f'T-shirt {i}', 'M', 'Women') for i in range(100)]
+        middle = day0 + pd.Timedelta(days=args.days // 2)
+        for name, func in [
+            ('series (all time)', lambda: history.series(key)),
+            ('series (1 month)', lambda: history.series(key, middle, middle + pd.Timedelta(days=30))),
+            ('as_of 100 keys', lambda: history.as_of(middle, keys=keys)),
+            ('as_of all', lambda: history.as_of(middle)),
+            ('as_of all, 1 day window', lambda: history.as_of(middle, window=86400)),
+        ]:
+            started = time.perf_counter()
+            result = func()
+            print(f"{name:>24}: {(time.perf_counter() - started) * 1000:8.1f} ms, {len(result):,} rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark near-duplicate detection (MinHash/LSH) pada katalog sintetis
+
+Katalog berisi --products judul unik; --dup-rate dari baris adalah variasi
+format (huruf besar, tanda baca, spasi) dari judul lain. Waktu dan jumlah
+pasangan yang diverifikasi harus naik kira-kira linear terhadap jumlah
+baris karena tidak ada perbandingan all-pairs.
+
+Contoh:
+    python benchmarks/bench_neardup.py --products 100000 --dup-rate 0.1
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+import pandas as pd
+
+from utils.neardup import drop_near_duplicates
+
+ADJECTIVES = ['Classic', 'Vintage', 'Basic', 'Oversized', 'Slim', 'Relaxed', 'Cropped', 'Premium']
+ITEMS = ['T-shirt', 'Hoodie', 'Jacket', 'Pants', 'Sweater', 'Shorts', 'Dress', 'Skirt']
+VARIANTS = [str.upper, str.lower, lambda title: title + '!', lambda title: ' ' + title.replace(' ', '  ')]
+
+
+def synthetic_catalog(products, dup_rate, seed=0):
+    rng = np.random.default_rng(seed)
+    titles = [f"{ADJECTIVES[i % 8]} {ITEMS[(i // 8) % 8]} {i}" for i in range(products)]
+    sizes = rng.choice(['S', 'M', 'L', 'XL'], products)
+    genders = rng.choice(['Men', 'Women', 'Unisex'], products)
+
+    dups = int(products * dup_rate)
+    source = rng.integers(0, products, dups)
+    variant = rng.integers(0, len(VARIANTS), dups)
+    titles += [VARIANTS[v](titles[s]) for s, v in zip(source, variant)]
+    return pd.DataFrame({
+        'Title': titles,
+        'Size': np.concatenate([sizes, sizes[source]]),
+        'Gender': np.concatenate([genders, genders[source]]),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--dup-rate', type=float, default=0.1)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    args = parser.parse_args()
+
+    for scale in (0.25, 0.5, 1.0):
+        products = int(args.products * scale)
+        df = synthetic_catalog(products, args.dup_rate)
+        started = time.perf_counter()
+        df_kept, report = drop_near_duplicates(df, threshold=args.threshold)
+        elapsed = time.perf_counter() - started
+        merged = len(df) - len(df_kept)
+        expected = len(df) - products
+        print(f"{len(df):>10,} rows: {elapsed:6.2f} s, merged {merged:,} of {expected:,} "
+              f"planted duplicates into {len(report):,} clusters")
+
+
+if __name__ == '__main__':
+    main()
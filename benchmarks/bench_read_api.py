@@ -0,0 +1,59 @@
+"""
+Benchmark query read API: filter pandas per request vs ProductIndex in-memory
+
+Data bersih sintetis dimuat sekali; query "Women, Price <= X, Rating >= 4,
+urut -Price, 50 teratas" dijalankan berulang di keduanya. Juga dicetak waktu
+membangun index (biaya satu kali per snapshot/hot swap).
+
+Contoh:
+    python benchmarks/bench_read_api.py --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_store import synthetic_clean
+from utils.read_api import ProductIndex
+
+
+def timed(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--max-price', type=float, default=20000.0)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    df = synthetic_clean(args.rows)
+    started = time.perf_counter()
+    index = ProductIndex(df)
+    print(f"Index build: {args.rows:,} rows in {time.perf_counter() - started:.2f} s")
+
+    def pandas_query():
+        frame = df[(df['Gender'] == 'Women') & (df['Price'] <= args.max_price) & (df['Rating'] >= 4)]
+        return len(frame), frame.sort_values('Price', ascending=False).head(50).to_dict('records')
+
+    def index_query():
+        return index.query(gender='Women', max_price=args.max_price, min_rating=4, order_by='-Price', limit=50)
+
+    def index_selective():
+        return index.query(gender='Women', min_price=790000, order_by='Price', limit=50)
+
+    print(f"Query: Women, Price <= {args.max_price:,.0f}, Rating >= 4, -Price, limit 50 ({args.repeat} runs)")
+    for name, func in [('pandas', pandas_query), ('index', index_query), ('selective', index_selective)]:
+        seconds, (matched, _) = timed(func, args.repeat)
+        print(f"{name:>9}: {seconds * 1e6:10.0f} us/query, {matched:,} rows matched")
+
+
+if __name__ == '__main__':
+    main()
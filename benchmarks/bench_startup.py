@@ -0,0 +1,77 @@
+"""
+Benchmark waktu startup (import) pipeline dengan `python -X importtime`
+
+Contoh:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --module main --max-ms 800
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def measure_import(module, repeat=5):
+    """
+    Jalankan `python -X importtime -c "import <module>"` beberapa kali
+
+    Return (median total ms, list import langsung dari module paling mahal dari run terakhir)
+    """
+    totals = []
+    rows = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+        rows = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative_us, name = line.split('|', 2)
+            # Nama diawali satu spasi; tiap level nesting menambah dua spasi
+            rows.append((int(cumulative_us), name[1:].rstrip()))
+        # Baris terakhir importtime adalah module yang di-import paling luar
+        totals.append(rows[-1][0] / 1000.0)
+
+    direct_imports = sorted(
+        ((us / 1000.0, name.strip()) for us, name in rows
+         if name.startswith('  ') and not name.startswith('    ')),
+        reverse=True
+    )
+    totals.sort()
+    return totals[len(totals) // 2], direct_imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', action='append',
+                        help='Module yang diukur (default: main, utils.extract, utils.transform, utils.load)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--max-ms', type=float,
+                        help='Gagal (exit 1) jika median import melebihi batas ini')
+    args = parser.parse_args()
+
+    modules = args.module or ['main', 'utils.extract', 'utils.transform', 'utils.load']
+    regressed = False
+    for module in modules:
+        median_ms, direct_imports = measure_import(module, args.repeat)
+        print(f"{module}: {median_ms:.1f} ms (median of {args.repeat})")
+        for ms, name in direct_imports[:args.top]:
+            print(f"    {ms:8.1f} ms  {name}")
+        if args.max_ms is not None and median_ms > args.max_ms:
+            print(f"    REGRESSION: {median_ms:.1f} ms > {args.max_ms:.1f} ms")
+            regressed = True
+
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Benchmark query terfilter: scan products.csv dengan pandas vs embedded store
+
+Data bersih sintetis ditulis ke CSV dan ke ProductStore (SQLite WAL, ber-index)
+sebanyak --runs run (store menyimpan semua run, CSV hanya snapshot terakhir),
+lalu query "Women, Price <= X, Rating >= 4" untuk run terakhir dijalankan
+berulang di keduanya. Query plan store ikut dicetak untuk memastikan index
+(run_id, Gender, Price) yang dipakai, bukan scan semua run.
+
+Contoh:
+    python benchmarks/bench_store.py --rows 200000 --runs 30
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+import pandas as pd
+
+from utils.query import explain_query, query_products
+from utils.store import save_to_store
+
+
+def synthetic_clean(n):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Title': [f'T-shirt {i}' for i in range(n)],
+        'Price': rng.integers(1000, 50000, n) * 16.0,
+        'Rating': rng.integers(10, 50, n) / 10,
+        'Colors': rng.integers(1, 8, n),
+        'Size': rng.choice(['S', 'M', 'L', 'XL', 'XXL'], n),
+        'Gender': rng.choice(['Men', 'Women', 'Unisex'], n),
+        'timestamp': '2024-01-01T00:00:00',
+    })
+
+
+def timed(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) / repeat, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--max-price', type=float, default=20000.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    df = synthetic_clean(args.rows)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = os.path.join(tmpdir, 'products.csv')
+        db_path = os.path.join(tmpdir, 'products.db')
+        df.to_csv(csv_path, index=False)
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for run in range(args.runs):
+                save_to_store(df, db_path, run_id=f'run{run:04d}')
+        print(f"Store load: {args.runs} runs x {args.rows:,} rows in {time.perf_counter() - started:.2f} s")
+        latest = f'run{args.runs - 1:04d}'
+        plan = explain_query(db_path, run_id=latest, gender='Women', max_price=args.max_price, min_rating=4)
+        print(f"Plan: {'; '.join(plan)}")
+
+        def csv_scan():
+            frame = pd.read_csv(csv_path)
+            return frame[(frame['Gender'] == 'Women') & (frame['Price'] <= args.max_price)
+                         & (frame['Rating'] >= 4)]
+
+        def store_query():
+            return query_products(db_path, gender='Women', max_price=args.max_price, min_rating=4)
+
+        print(f"Query latest run: Women, Price <= {args.max_price:,.0f}, Rating >= 4 ({args.repeat} repeats)")
+        for name, func in [('csv scan', csv_scan), ('store', store_query)]:
+            seconds, matched = timed(func, args.repeat)
+            print(f"{name:>9}: {seconds * 1000:8.1f} ms/query, {matched:,} rows")
+
+
+if __name__ == '__main__':
+    main()
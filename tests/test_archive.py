@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import patch, Mock
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.archive import HtmlArchive, reextract_run
+from utils.extract import scrape_main, ProductColumns
+from utils.scheduler import AdaptiveScheduler
+from utils.stages import scrape_staged
+
+PAGE_HTML = '''
+<html>
+    <body>
+        <div class="collection-card">
+            <h3 class="product-title">T-shirt Test</h3>
+            <span class="price">$99.99</span>
+            <p>Rating: ⭐ 4.5 / 5</p>
+            <p>3 Colors</p>
+            <p>Size: M</p>
+            <p>Gender: Men</p>
+        </div>
+    </body>
+</html>
+'''
+
+class TestArchive(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive = HtmlArchive(os.path.join(self.tmpdir.name, 'archive'), compression='gzip')
+    
+    def tearDown(self):
+        self.archive.close()
+        self.tmpdir.cleanup()
+    
+    def _object_files(self):
+        objects = os.path.join(self.archive.root, 'objects')
+        return [name for _, _, files in os.walk(objects) for name in files]
+    
+    def test_store_and_read_back(self):
+        """Test body halaman bisa dibaca ulang dari arsip"""
+        self.archive.store('run1', 1, 'https://test.com', PAGE_HTML)
+        
+        pages = [(page, url, stream.read()) for page, url, _, stream in self.archive.iter_pages('run1')]
+        self.assertEqual(pages, [(1, 'https://test.com', PAGE_HTML.encode('utf-8'))])
+    
+    def test_identical_pages_stored_once(self):
+        """Test halaman identik antar run hanya disimpan satu kali"""
+        first = self.archive.store('run1', 1, 'https://test.com', PAGE_HTML)
+        second = self.archive.store('run2', 1, 'https://test.com', PAGE_HTML)
+        
+        self.assertEqual(first, second)
+        self.assertEqual(len(self._object_files()), 1)
+        self.assertEqual(self.archive.runs(), ['run1', 'run2'])
+    
+    def test_reextract_run(self):
+        """Test parser dijalankan ulang atas run yang diarsipkan"""
+        self.archive.store('run1', 1, 'https://test.com', PAGE_HTML, fetched_at='2024-01-01T00:00:00')
+        self.archive.store('run1', 2, 'https://test.com/page2', PAGE_HTML, fetched_at='2024-01-01T00:00:01')
+        
+        products = reextract_run(self.archive, 'run1', collector=ProductColumns())
+        df = products.to_dataframe()
+        
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df['Title'].tolist(), ['T-shirt Test', 'T-shirt Test'])
+        self.assertEqual(df['timestamp'].tolist(), ['2024-01-01T00:00:00', '2024-01-01T00:00:01'])
+    
+    def test_reextract_unknown_run(self):
+        """Test re-extract run yang tidak ada"""
+        self.assertIsNone(reextract_run(self.archive, 'missing'))
+    
+    @patch('utils.scheduler.time.sleep')
+    @patch('utils.extract.requests.get')
+    def test_scrape_main_archives_pages(self, mock_get, mock_sleep):
+        """Test scrape_main menyimpan setiap halaman ke arsip"""
+        mock_get.return_value = Mock(status_code=200, content=PAGE_HTML.encode('utf-8'))
+        
+        result = scrape_main("https://test.com", 1, 2, archive=self.archive, run_id='run1')
+        
+        self.assertEqual(len(result), 2)
+        self.assertEqual([page for page, _, _, _ in self.archive.iter_pages('run1')], [1, 2])
+    
+    @patch('utils.scheduler.time.sleep')
+    @patch('utils.extract.requests.get')
+    def test_scrape_main_logs_new_run_id(self, mock_get, mock_sleep):
+        """Test run_id baru di-log supaya bisa dipakai untuk re-extract"""
+        mock_get.return_value = Mock(status_code=200, content=PAGE_HTML.encode('utf-8'))
+        
+        with self.assertLogs('utils.extract', level='INFO') as logs:
+            scrape_main("https://test.com", 1, 1, archive=self.archive)
+        run_id = self.archive.runs()[0]
+        self.assertTrue(any(run_id in line for line in logs.output))
+    
+    def test_scrape_staged_archives_pages(self):
+        """Test scrape_staged menyimpan setiap halaman ke arsip lewat stage archive"""
+        session = Mock()
+        session.get.return_value = Mock(status_code=200, content=PAGE_HTML.encode('utf-8'))
+        scheduler = AdaptiveScheduler(initial_rate=1000.0, max_rate=1000.0, sleep=lambda seconds: None)
+        
+        products, stats = scrape_staged("https://test.com", 1, 3, scheduler=scheduler, session=session,
+                                        fetch_workers=2, archive=self.archive, run_id='staged')
+        self.assertEqual(len(products), 3)
+        self.assertEqual(stats['stages']['archive']['items_out'], 3)
+        self.assertEqual([url for _, url, _, _ in self.archive.iter_pages('staged')],
+                         ['https://test.com', 'https://test.com/page2', 'https://test.com/page3'])
+    
+    def test_unsupported_compression(self):
+        """Test format kompresi yang tidak didukung"""
+        with self.assertRaises(ValueError):
+            HtmlArchive(os.path.join(self.tmpdir.name, 'other'), compression='lz4')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.arrow_io import arrow_available
+from utils.extract import ProductColumns, ProductRecord
+from utils.transform import transform_data, transform_data_compiled
+
+@unittest.skipUnless(arrow_available(), "pyarrow not installed")
+class TestArrowIO(unittest.TestCase):
+    
+    def setUp(self):
+        self.records = [
+            ProductRecord('T-shirt 1', '$99.99', 'Rating: ⭐ 4.5 / 5', '3 Colors', 'Size: M', 'Gender: Men'),
+            ProductRecord('Unknown Product', '$100.00', 'Rating: ⭐ Invalid Rating / 5', '5 Colors',
+                          'Size: M', 'Gender: Men'),
+            ProductRecord('Hoodie 2', '$149.99', 'Rating: ⭐ 3.8 / 5', '2 Colors', 'Size: L', 'Gender: Unisex'),
+        ]
+    
+    def _fill(self, products):
+        for i, record in enumerate(self.records):
+            products.append(record, f'2024-01-01T00:00:0{i}')
+        return products
+    
+    def test_arrow_product_columns_flushes_to_batches(self):
+        """Test ArrowProductColumns menyimpan data sebagai batch Arrow"""
+        from utils.arrow_io import ArrowProductColumns
+        products = self._fill(ArrowProductColumns(flush_rows=2))
+        
+        table = products.to_arrow()
+        self.assertEqual(len(products), 3)
+        self.assertEqual(table.num_rows, 3)
+        pd.testing.assert_frame_equal(products.to_dataframe(), self._fill(ProductColumns()).to_dataframe())
+    
+    def test_arrow_handoff_matches_pandas_path(self):
+        """Test transform atas DataFrame Arrow-backed sama dengan jalur pandas"""
+        from utils.arrow_io import ArrowProductColumns, frame_from_batch
+        products = self._fill(ArrowProductColumns())
+        
+        df_arrow = frame_from_batch(products.to_arrow())
+        expected = transform_data(self._fill(ProductColumns()).to_dataframe())
+        result = transform_data_compiled(df_arrow)
+        
+        self.assertIsInstance(df_arrow['Title'].dtype, pd.ArrowDtype)
+        pd.testing.assert_frame_equal(result.astype({'Title': object, 'timestamp': object}), expected)
+    
+    def test_batch_to_sheet_rows(self):
+        """Test baris Google Sheets dibangun dari Arrow dan karakter non-ASCII dihapus"""
+        from utils.arrow_io import batch_to_sheet_rows, frame_to_arrow
+        df = transform_data(self._fill(ProductColumns()).to_dataframe())
+        df.loc[0, 'Title'] = 'T-shirt ⭐ 1'
+        
+        rows = batch_to_sheet_rows(frame_to_arrow(df))
+        
+        self.assertEqual(rows[0], ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp'])
+        self.assertEqual(rows[1][0], 'T-shirt  1')
+        self.assertEqual(rows[1][3], 3)
+    
+    def test_save_to_parquet(self):
+        """Test save ke Parquet dan baca ulang"""
+        from utils.arrow_io import save_to_parquet
+        import pyarrow.parquet as pq
+        df = transform_data(self._fill(ProductColumns()).to_dataframe())
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'products.parquet')
+            self.assertTrue(save_to_parquet(df, path))
+            pd.testing.assert_frame_equal(pq.read_table(path).to_pandas(), df)
+    
+    @patch('utils.load._lazy')
+    def test_save_to_google_sheets_accepts_arrow(self, mock_lazy):
+        """Test save_to_google_sheets menerima Arrow Table"""
+        from utils.arrow_io import frame_to_arrow
+        from utils.load import save_to_google_sheets
+        df = transform_data(self._fill(ProductColumns()).to_dataframe())
+        
+        with tempfile.NamedTemporaryFile(suffix='.json') as credentials:
+            result = save_to_google_sheets(frame_to_arrow(df), 'sheet-id', credentials_file=credentials.name)
+        
+        self.assertTrue(result)
+        service = mock_lazy.return_value.return_value
+        body = service.spreadsheets().values().update.call_args.kwargs['body']
+        self.assertEqual(len(body['values']), 3)
+
+if __name__ == '__main__':
+    unittest.main()
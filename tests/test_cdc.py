@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import tempfile
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.cdc import compute_changeset, summarize_changeset, load_snapshot, save_changeset
+from utils.load import apply_changeset
+
+class TestCDC(unittest.TestCase):
+    
+    def setUp(self):
+        self.old_data = pd.DataFrame({
+            'Title': ['T-shirt 1', 'Hoodie 2', 'Pants 3'],
+            'Price': [1599840.0, 2399840.0, 1272000.0],
+            'Rating': [4.5, 3.8, 4.0],
+            'Colors': [3, 2, 1],
+            'Size': ['M', 'L', 'S'],
+            'Gender': ['Men', 'Unisex', 'Women'],
+            'timestamp': ['2024-01-01'] * 3
+        })
+        # Run baru: Hoodie 2 naik harga, Pants 3 hilang, Jacket 4 baru
+        self.new_data = pd.DataFrame({
+            'Title': ['T-shirt 1', 'Hoodie 2', 'Jacket 4'],
+            'Price': [1599840.0, 2559840.0, 3200000.0],
+            'Rating': [4.5, 3.8, 4.9],
+            'Colors': [3, 2, 5],
+            'Size': ['M', 'L', 'XL'],
+            'Gender': ['Men', 'Unisex', 'Men'],
+            'timestamp': ['2024-01-02'] * 3
+        })
+    
+    def test_changeset_detects_insert_update_delete(self):
+        """Test changeset berisi insert, update dan delete"""
+        changeset = compute_changeset(self.new_data, self.old_data)
+        
+        self.assertEqual(changeset['op'].tolist(), ['insert', 'update', 'delete'])
+        self.assertEqual(changeset['Title'].tolist(), ['Jacket 4', 'Hoodie 2', 'Pants 3'])
+        self.assertEqual(summarize_changeset(changeset), {'insert': 1, 'update': 1, 'delete': 1})
+    
+    def test_changeset_update_has_old_and_new_values(self):
+        """Test baris update menyimpan nilai lama dan baru"""
+        changeset = compute_changeset(self.new_data, self.old_data)
+        update = changeset[changeset['op'] == 'update'].iloc[0]
+        
+        self.assertEqual(update['Price'], 2559840.0)
+        self.assertEqual(update['old_Price'], 2399840.0)
+    
+    def test_changeset_ignores_timestamp_only_changes(self):
+        """Test produk yang hanya berubah timestamp tidak dianggap update"""
+        same = self.old_data.copy()
+        same['timestamp'] = '2024-03-01'
+        
+        changeset = compute_changeset(same, self.old_data)
+        self.assertTrue(changeset.empty)
+    
+    def test_changeset_without_previous_snapshot(self):
+        """Test run pertama: semua produk menjadi insert"""
+        changeset = compute_changeset(self.new_data, None)
+        
+        self.assertEqual(len(changeset), 3)
+        self.assertTrue((changeset['op'] == 'insert').all())
+    
+    def test_snapshot_roundtrip(self):
+        """Test snapshot CSV yang dibaca ulang tidak menghasilkan update palsu"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'products.csv')
+            data = self.old_data.copy()
+            data['Price'] = data['Price'] * 1.0000001
+            data.to_csv(path, index=False)
+            
+            changeset = compute_changeset(data, load_snapshot(path))
+            self.assertTrue(changeset.empty)
+            self.assertIsNone(load_snapshot(os.path.join(tmpdir, 'missing.csv')))
+    
+    def test_save_changeset(self):
+        """Test save changeset ke CSV"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'changes.csv')
+            changeset = compute_changeset(self.new_data, self.old_data)
+            
+            self.assertTrue(save_changeset(changeset, path))
+            self.assertEqual(len(pd.read_csv(path)), 3)
+    
+    def test_apply_changeset_matches_full_reload(self):
+        """Test menerapkan changeset menghasilkan isi tabel yang sama dengan full reload"""
+        from sqlalchemy import create_engine
+        engine = create_engine('sqlite://')
+        self.old_data.to_sql('products', engine, index=False)
+        
+        changeset = compute_changeset(self.new_data, self.old_data)
+        apply_changeset(engine, changeset, 'products')
+        
+        # Produk yang tidak berubah tetap memakai timestamp lama
+        result = pd.read_sql('SELECT * FROM products ORDER BY "Title"', engine).drop(columns='timestamp')
+        expected = self.new_data.sort_values('Title').reset_index(drop=True).drop(columns='timestamp')
+        pd.testing.assert_frame_equal(result, expected)
+    
+    @patch('utils.load.pd.DataFrame.to_sql')
+    def test_apply_changeset_postgres_keeps_history(self, mock_to_sql):
+        """Test delete changeset di PostgreSQL dibatasi ke scrape_date run ini"""
+        engine = MagicMock()
+        engine.dialect.name = 'postgresql'
+        conn = engine.begin.return_value.__enter__.return_value
+        
+        changeset = compute_changeset(self.new_data, self.old_data)
+        apply_changeset(engine, changeset, 'products')
+        statements = [str(call.args[0]) for call in conn.execute.call_args_list]
+        delete = next(statement for statement in statements if statement.startswith('DELETE'))
+        self.assertIn('t."scrape_date" IN (\'2024-01-02\')', delete)
+
+if __name__ == '__main__':
+    unittest.main()
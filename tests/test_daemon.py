@@ -0,0 +1,170 @@
+import unittest
+from unittest.mock import patch, Mock
+import sys
+import os
+import json
+import urllib.request
+import urllib.error
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.daemon import (WarmResources, PipelineDaemon, IntervalSchedule, CronSchedule,
+                          parse_interval, start_health_server)
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+class TestSchedules(unittest.TestCase):
+    
+    def test_parse_interval(self):
+        """Test parsing interval dengan satuan"""
+        self.assertEqual(parse_interval('90'), 90)
+        self.assertEqual(parse_interval('15m'), 900)
+        self.assertEqual(parse_interval('6h'), 21600)
+        with self.assertRaises(ValueError):
+            parse_interval('soon')
+        with self.assertRaises(ValueError):
+            parse_interval('0')
+    
+    def test_cron_next_after(self):
+        """Test waktu run berikutnya dari ekspresi cron"""
+        every_six = CronSchedule('0 */6 * * *')
+        self.assertEqual(every_six.next_after(datetime(2024, 1, 1, 7, 30)), datetime(2024, 1, 1, 12, 0))
+        self.assertEqual(every_six.next_after(datetime(2024, 1, 1, 18, 0)), datetime(2024, 1, 2, 0, 0))
+        
+        # Senin 02:30; 2024-01-01 adalah hari Senin
+        weekly = CronSchedule('30 2 * * 1')
+        self.assertEqual(weekly.next_after(datetime(2024, 1, 1, 3, 0)), datetime(2024, 1, 8, 2, 30))
+    
+    def test_cron_invalid(self):
+        """Test ekspresi cron yang tidak valid ditolak"""
+        with self.assertRaises(ValueError):
+            CronSchedule('0 25 * * *')
+        with self.assertRaises(ValueError):
+            CronSchedule('* * *')
+
+class TestPipelineDaemon(unittest.TestCase):
+    
+    def test_run_once_records_status(self):
+        """Test status mencatat timing dan hasil run terakhir"""
+        daemon = PipelineDaemon(lambda: {'records': 10, 'timings': {'extract': 1.5}}, IntervalSchedule('1h'))
+        self.assertTrue(daemon.run_once())
+        
+        status = daemon.status()
+        self.assertEqual(status['runs'], 1)
+        self.assertTrue(status['last_run']['success'])
+        self.assertEqual(status['last_run']['timings'], {'extract': 1.5})
+        self.assertEqual(status['last_run']['records'], 10)
+    
+    def test_run_once_failure(self):
+        """Test exception atau return None dihitung sebagai run gagal"""
+        def broken():
+            raise RuntimeError('boom')
+        daemon = PipelineDaemon(broken, IntervalSchedule('1h'))
+        self.assertFalse(daemon.run_once())
+        self.assertIn('boom', daemon.status()['last_run']['error'])
+        
+        daemon.run_pipeline = lambda: None
+        self.assertFalse(daemon.run_once())
+        self.assertEqual(daemon.status()['failures'], 2)
+    
+    def test_run_once_failed_sink(self):
+        """Test sink yang gagal membuat run dihitung gagal walaupun CSV tersimpan"""
+        result = {'records': 10, 'sheets_success': True, 'postgres_success': False}
+        daemon = PipelineDaemon(lambda: result, IntervalSchedule('1h'))
+        self.assertFalse(daemon.run_once())
+        
+        last_run = daemon.status()['last_run']
+        self.assertFalse(last_run['success'])
+        self.assertEqual(last_run['failed_sinks'], ['postgres'])
+        self.assertEqual(daemon.status()['failures'], 1)
+        
+        result['postgres_success'] = True
+        self.assertTrue(daemon.run_once())
+        self.assertEqual(daemon.status()['last_run']['failed_sinks'], [])
+    
+    def test_serve_forever_follows_schedule(self):
+        """Test loop daemon menjalankan pipeline sesuai interval"""
+        clock = FakeClock(datetime(2024, 1, 1, 0, 0))
+        started = []
+        
+        def pipeline():
+            started.append(clock.now)
+            return True
+        
+        daemon = PipelineDaemon(pipeline, IntervalSchedule('1h'), clock=clock, sleep=clock.sleep)
+        daemon.serve_forever(max_runs=3)
+        
+        self.assertEqual(started, [datetime(2024, 1, 1, 0, 0), datetime(2024, 1, 1, 1, 0),
+                                   datetime(2024, 1, 1, 2, 0)])
+        self.assertEqual(daemon.status()['state'], 'stopped')
+    
+    def test_health_endpoint(self):
+        """Test endpoint /health dan /status"""
+        daemon = PipelineDaemon(lambda: None, IntervalSchedule('1h'))
+        server = start_health_server(daemon, port=0)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with urllib.request.urlopen(base + '/health') as response:
+                self.assertEqual(response.status, 200)
+            
+            daemon.run_once()
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(base + '/health')
+            self.assertEqual(ctx.exception.code, 503)
+            
+            daemon.run_pipeline = lambda: {'records': 1, 'postgres_success': False}
+            daemon.run_once()
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(base + '/health')
+            self.assertEqual(json.loads(ctx.exception.read())['failed_sinks'], ['postgres'])
+            
+            with urllib.request.urlopen(base + '/status') as response:
+                status = json.loads(response.read())
+            self.assertEqual(status['runs'], 2)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+class TestWarmResources(unittest.TestCase):
+    
+    def test_session_is_reused(self):
+        """Test HTTP session dibuat sekali"""
+        resources = WarmResources()
+        self.assertIs(resources.session, resources.session)
+        resources.close()
+    
+    @patch('utils.load._create_postgresql_engine')
+    def test_engine_is_cached(self, mock_create):
+        """Test engine dibuat sekali per connection string"""
+        mock_create.return_value = Mock()
+        resources = WarmResources()
+        
+        first = resources.postgres_engine('postgresql://user:pw@localhost/db')
+        second = resources.postgres_engine('postgresql://user:pw@localhost/db')
+        
+        self.assertIs(first, second)
+        mock_create.assert_called_once()
+        self.assertIsNone(resources.postgres_engine(None))
+        resources.close()
+        first.dispose.assert_called_once()
+    
+    @patch('utils.load._create_postgresql_engine', return_value=None)
+    def test_failed_engine_not_cached(self, mock_create):
+        """Test engine yang gagal dibuat dicoba lagi di run berikutnya"""
+        resources = WarmResources()
+        resources.postgres_engine('postgresql://user:pw@localhost/db')
+        resources.postgres_engine('postgresql://user:pw@localhost/db')
+        self.assertEqual(mock_create.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
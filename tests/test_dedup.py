@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+import tempfile
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.dedup import DedupIndex, DiskHashSet, compute_row_hash
+
+class TestDedup(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.tmpdir.name, 'dedup.sqlite')
+        self.sample_data = pd.DataFrame({
+            'Title': ['T-shirt 1', 'Hoodie 2'],
+            'Price': [1599840.0, 2399840.0],
+            'Rating': [4.5, 3.8],
+            'Colors': [3, 2],
+            'Size': ['M', 'L'],
+            'Gender': ['Men', 'Unisex'],
+            'timestamp': ['2024-01-01T10:00:00', '2024-01-01T10:00:01']
+        })
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_row_hash_ignores_timestamp(self):
+        """Test hash tidak berubah jika hanya timestamp yang berbeda"""
+        later = self.sample_data.copy()
+        later['timestamp'] = '2024-02-01T00:00:00'
+        
+        self.assertEqual(compute_row_hash(self.sample_data).tolist(), compute_row_hash(later).tolist())
+    
+    def test_row_hash_detects_changes(self):
+        """Test hash berubah jika kolom bisnis berubah"""
+        changed = self.sample_data.copy()
+        changed.loc[0, 'Price'] = 1.0
+        
+        hashes = compute_row_hash(self.sample_data)
+        changed_hashes = compute_row_hash(changed)
+        self.assertNotEqual(hashes.iloc[0], changed_hashes.iloc[0])
+        self.assertEqual(hashes.iloc[1], changed_hashes.iloc[1])
+    
+    def test_filter_new_across_runs(self):
+        """Test run kedua hanya mengirim produk baru/berubah"""
+        index = DedupIndex(self.index_path)
+        new_df, hashes = index.filter_new(self.sample_data)
+        self.assertEqual(len(new_df), 2)
+        index.commit(hashes)
+        index.close()
+        
+        # Run berikutnya: satu produk berubah harga, satu produk baru
+        next_run = self.sample_data.copy()
+        next_run['timestamp'] = '2024-01-02T10:00:00'
+        next_run.loc[1, 'Price'] = 1999840.0
+        next_run = pd.concat([next_run, pd.DataFrame([{
+            'Title': 'Pants 3', 'Price': 800000.0, 'Rating': 4.0, 'Colors': 1,
+            'Size': 'S', 'Gender': 'Women', 'timestamp': '2024-01-02T10:00:00'
+        }])], ignore_index=True)
+        
+        index = DedupIndex(self.index_path)
+        new_df, hashes = index.filter_new(next_run)
+        self.assertEqual(new_df['Title'].tolist(), ['Hoodie 2', 'Pants 3'])
+        index.close()
+    
+    def test_filter_new_without_commit(self):
+        """Test hash tidak tercatat jika commit tidak dipanggil (load gagal)"""
+        index = DedupIndex(self.index_path)
+        index.filter_new(self.sample_data)
+        new_df, _ = index.filter_new(self.sample_data)
+        
+        self.assertEqual(len(new_df), 2)
+        self.assertEqual(len(index), 0)
+        index.close()
+    
+    def test_filter_new_drops_in_run_duplicates(self):
+        """Test duplikat dalam satu run hanya dikirim sekali"""
+        doubled = pd.concat([self.sample_data, self.sample_data], ignore_index=True)
+        index = DedupIndex(self.index_path)
+        new_df, _ = index.filter_new(doubled)
+        
+        self.assertEqual(len(new_df), 2)
+        index.close()
+    
+    def test_filter_new_empty_dataframe(self):
+        """Test dengan dataframe kosong"""
+        index = DedupIndex(self.index_path)
+        new_df, hashes = index.filter_new(self.sample_data.iloc[0:0])
+        
+        self.assertEqual(len(new_df), 0)
+        self.assertEqual(len(hashes), 0)
+        index.close()
+    
+    def test_disk_hash_set_marks_first_occurrence(self):
+        """Test DiskHashSet hanya menandai kemunculan pertama sebagai baru"""
+        seen = DiskHashSet(os.path.join(self.tmpdir.name, 'hashset.sqlite'))
+        
+        self.assertEqual(seen.add(['a', 'b', 'a']).tolist(), [True, True, False])
+        self.assertEqual(seen.add(['b', 'c']).tolist(), [False, True])
+        self.assertEqual(len(seen), 3)
+        seen.close()
+    
+    def test_disk_hash_set_temp_file_removed(self):
+        """Test file sementara DiskHashSet dihapus saat close"""
+        seen = DiskHashSet()
+        seen.add(['a'])
+        seen.close()
+        
+        self.assertFalse(os.path.exists(seen.path))
+
+if __name__ == '__main__':
+    unittest.main()
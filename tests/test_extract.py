@@ -8,7 +8,9 @@ import requests
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.extract import scrape_main, extract_product_data, save_raw_data
+from utils.extract import (scrape_main, extract_product_data, save_raw_data,
+                           extract_product_record, ProductColumns, ProductRecord)
+from utils.scheduler import AdaptiveScheduler
 from bs4 import BeautifulSoup
 
 class TestExtract(unittest.TestCase):
@@ -36,8 +38,9 @@ class TestExtract(unittest.TestCase):
         </div>
         """
     
+    @patch('utils.scheduler.time.sleep')
     @patch('utils.extract.requests.get')
-    def test_scrape_main_success(self, mock_get):
+    def test_scrape_main_success(self, mock_get, mock_sleep):
         """Test scraping berhasil"""
         # Mock successful response dengan konten yang valid
         mock_response = Mock()
@@ -65,8 +68,9 @@ class TestExtract(unittest.TestCase):
         self.assertIsInstance(result, list)
         self.assertGreater(len(result), 0)  # Harus ada produk yang berhasil di-scrape
     
+    @patch('utils.scheduler.time.sleep')
     @patch('utils.extract.requests.get')
-    def test_scrape_main_failure(self, mock_get):
+    def test_scrape_main_failure(self, mock_get, mock_sleep):
         """Test scraping gagal - FINAL FIXED VERSION"""
         # Mock failed response pada semua halaman
         mock_get.side_effect = requests.exceptions.RequestException("Network error")
@@ -76,8 +80,31 @@ class TestExtract(unittest.TestCase):
         # Karena semua halaman gagal, seharusnya return None
         self.assertIsNone(result)
     
+    @patch('utils.scheduler.time.sleep')
     @patch('utils.extract.requests.get')
-    def test_scrape_main_partial_failure(self, mock_get):
+    def test_scrape_main_client_error_not_retried(self, mock_get, mock_sleep):
+        """Test 404 langsung gagal tanpa retry, 5xx tetap di-retry"""
+        not_found = Mock(status_code=404)
+        not_found.raise_for_status.side_effect = requests.exceptions.HTTPError("404", response=not_found)
+        mock_get.return_value = not_found
+        scheduler = AdaptiveScheduler(max_retries=3, sleep=lambda seconds: None)
+        
+        self.assertIsNone(scrape_main("https://test.com", 1, 1, scheduler=scheduler))
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(scheduler.failed_pages, [1])
+        self.assertEqual(scheduler.retried_pages, set())
+        
+        not_implemented = Mock(status_code=501)
+        not_implemented.raise_for_status.side_effect = requests.exceptions.HTTPError("501",
+                                                                                    response=not_implemented)
+        mock_get.reset_mock()
+        mock_get.return_value = not_implemented
+        scrape_main("https://test.com", 1, 1, scheduler=AdaptiveScheduler(max_retries=2, sleep=lambda s: None))
+        self.assertEqual(mock_get.call_count, 3)
+    
+    @patch('utils.scheduler.time.sleep')
+    @patch('utils.extract.requests.get')
+    def test_scrape_main_partial_failure(self, mock_get, mock_sleep):
         """Test scraping sebagian gagal"""
         # Mock: halaman pertama gagal, halaman kedua berhasil
         mock_responses = [
@@ -110,8 +137,9 @@ class TestExtract(unittest.TestCase):
         self.assertIsInstance(result, list)
         self.assertGreater(len(result), 0)
     
+    @patch('utils.scheduler.time.sleep')
     @patch('utils.extract.requests.get')
-    def test_scrape_main_no_products(self, mock_get):
+    def test_scrape_main_no_products(self, mock_get, mock_sleep):
         """Test scraping ketika tidak ada produk"""
         # Mock successful response tapi tanpa product cards
         mock_response = Mock()
@@ -179,6 +207,45 @@ class TestExtract(unittest.TestCase):
         """Test save raw data dengan list kosong"""
         result = save_raw_data([], 'test.csv')
         self.assertFalse(result)
+    
+    def test_extract_product_record(self):
+        """Test extract product card sebagai ProductRecord"""
+        soup = BeautifulSoup(self.sample_html, 'html.parser')
+        card = soup.find('div', class_='collection-card')
+        
+        result = extract_product_record(card)
+        
+        self.assertIsInstance(result, ProductRecord)
+        self.assertEqual(result.Title, 'T-shirt Test')
+        self.assertEqual(result.Gender, 'Gender: Men')
+    
+    def test_product_columns_to_dataframe(self):
+        """Test ProductColumns membangun DataFrame dari kolom"""
+        products = ProductColumns()
+        products.append(ProductRecord('A', '$1', 'Rating: 4 / 5', '1 Colors', 'Size: M', 'Gender: Men'), 't1')
+        products.append(ProductRecord('B', '$2', 'Rating: 3 / 5', '2 Colors', 'Size: L', 'Gender: Women'), 't2')
+        
+        df = products.to_dataframe()
+        
+        self.assertEqual(len(products), 2)
+        self.assertEqual(list(df.columns), ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp'])
+        self.assertEqual(df['timestamp'].tolist(), ['t1', 't2'])
+        self.assertEqual(products.to_records()[1]['Title'], 'B')
+    
+    @patch('utils.scheduler.time.sleep')
+    @patch('utils.extract.requests.get')
+    def test_scrape_main_with_collector(self, mock_get, mock_sleep):
+        """Test scrape_main mengisi ProductColumns jika collector diberikan"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = f'<html><body>{self.sample_html}</body></html>'
+        mock_get.return_value = mock_response
+        
+        result = scrape_main("https://test.com", 1, 2, collector=ProductColumns())
+        
+        self.assertIsInstance(result, ProductColumns)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result.to_dataframe()['Price'].tolist(), ['$99.99', '$99.99'])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,131 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.history import PriceHistory, product_key, append_history, build_bloom, bloom_contains
+
+def make_run(timestamp, price_a, price_b, rating_a=4.5):
+    return pd.DataFrame({
+        'Title': ['Shirt A', 'Shirt B'],
+        'Price': [price_a, price_b],
+        'Rating': [rating_a, 3.9],
+        'Colors': [3, 2],
+        'Size': ['M', 'L'],
+        'Gender': ['Women', 'Men'],
+        'timestamp': [timestamp, timestamp]
+    })
+
+class TestPriceHistory(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmpdir.name, 'history')
+        self.history = PriceHistory(self.root, auto_compact=False)
+        self.history.append(make_run('2024-01-10T08:00:00', 100.0, 200.0))
+        self.history.append(make_run('2024-01-20T08:00:00', 110.0, 200.0))
+        self.history.append(make_run('2024-02-05T08:00:00', 120.0, 190.0, rating_a=4.7))
+        self.key_a = product_key('Shirt A', 'M', 'Women')
+        self.key_b = product_key('Shirt B', 'L', 'Men')
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_partitions_by_month(self):
+        """Test segment dipartisi per bulan dan tercatat di manifest"""
+        self.assertEqual(self.history.partitions(), ['2024-01', '2024-02'])
+        reopened = PriceHistory(self.root)
+        self.assertEqual(len(reopened.manifest['segments']), 3)
+    
+    def test_auto_compact_closed_months(self):
+        """Test append otomatis mengkompaksi bulan yang sudah lewat, bulan berjalan tidak"""
+        history = PriceHistory(os.path.join(self.tmpdir.name, 'auto'))
+        history.append(make_run('2024-01-10T08:00:00', 100.0, 200.0))
+        history.append(make_run('2024-01-20T08:00:00', 110.0, 200.0))
+        now = datetime.now().isoformat()
+        history.append(make_run(now, 120.0, 190.0))
+        history.append(make_run(now, 130.0, 190.0))
+        
+        counts = pd.Series([s['partition'] for s in history.manifest['segments']]).value_counts()
+        self.assertEqual(counts['2024-01'], 1)
+        self.assertEqual(counts[datetime.now().strftime('%Y-%m')], 2)
+        self.assertEqual(history.series(self.key_a)['Price'].tolist(), [100.0, 110.0, 120.0, 130.0])
+        self.assertEqual(len(os.listdir(os.path.join(history.root, '2024-01'))), 1)
+    
+    def test_bloom_filter(self):
+        """Test bloom filter tanpa false negative dan false positive rendah"""
+        keys = np.random.default_rng(0).integers(0, 2**63, 5000, dtype=np.uint64)
+        bitset = np.unpackbits(build_bloom(keys)).astype(bool)
+        self.assertTrue(bloom_contains(bitset, keys).all())
+        others = np.random.default_rng(1).integers(0, 2**63, 5000, dtype=np.uint64)
+        self.assertLess(bloom_contains(bitset, others).mean(), 0.05)
+    
+    def test_queries_skip_segments_without_key(self):
+        """Test series/as_of tidak membuka segment yang tidak memuat key"""
+        key_c = product_key('Shirt C', 'S', 'Women')
+        run = make_run('2024-02-10T08:00:00', 1.0, 2.0).assign(Title=['Shirt C', 'Shirt D'], Size='S')
+        self.history.append(run)
+        with patch.object(PriceHistory, '_load_segment', autospec=True,
+                          side_effect=PriceHistory._load_segment) as load:
+            self.assertEqual(self.history.series(key_c)['Price'].tolist(), [1.0])
+            self.assertEqual(load.call_count, 1)
+            load.reset_mock()
+            result = self.history.as_of('2024-03-01', keys=[key_c, self.key_a])
+            self.assertEqual(dict(zip(result['key'], result['Price'])), {key_c: 1.0, self.key_a: 120.0})
+            self.assertEqual(load.call_count, 2)
+    
+    def test_series_for_product(self):
+        """Test deret harga satu produk urut berdasarkan waktu"""
+        series = self.history.series(self.key_a)
+        self.assertEqual(series['Price'].tolist(), [100.0, 110.0, 120.0])
+        self.assertEqual(series['Rating'].tolist(), [4.5, 4.5, 4.7])
+        
+        ranged = self.history.series(self.key_a, start='2024-01-15', end='2024-01-31')
+        self.assertEqual(ranged['Price'].tolist(), [110.0])
+    
+    def test_series_unknown_product(self):
+        """Test produk yang tidak ada menghasilkan DataFrame kosong"""
+        series = self.history.series(product_key('Unknown', 'S', 'Men'))
+        self.assertTrue(series.empty)
+    
+    def test_as_of(self):
+        """Test nilai terakhir per produk pada waktu tertentu"""
+        result = self.history.as_of('2024-01-25', keys=[self.key_a, self.key_b])
+        prices = dict(zip(result['key'].tolist(), result['Price'].tolist()))
+        self.assertEqual(prices, {self.key_a: 110.0, self.key_b: 200.0})
+        
+        latest = self.history.as_of('2024-03-01')
+        self.assertEqual(sorted(latest['Price'].tolist()), [120.0, 190.0])
+        
+        before = self.history.as_of('2023-12-31')
+        self.assertTrue(before.empty)
+    
+    def test_as_of_window(self):
+        """Test window membuang observasi yang terlalu lama"""
+        result = self.history.as_of('2024-02-01', window=3 * 86400)
+        self.assertTrue(result.empty)
+    
+    def test_compact_preserves_queries(self):
+        """Test compact menggabungkan segment tanpa mengubah hasil query"""
+        before = self.history.series(self.key_a)
+        self.history.compact('2024-01')
+        
+        segments = [s for s in self.history.manifest['segments'] if s['partition'] == '2024-01']
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(segments[0]['rows'], 4)
+        pd.testing.assert_frame_equal(self.history.series(self.key_a), before)
+    
+    def test_append_history(self):
+        """Test helper append_history return True jika sukses"""
+        self.assertTrue(append_history(make_run('2024-03-01T00:00:00', 1.0, 2.0), self.root))
+        self.assertFalse(append_history(pd.DataFrame({'Title': ['x']}), self.root))
+
+if __name__ == '__main__':
+    unittest.main()
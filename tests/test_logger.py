@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import json
+import logging
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.logger import ErrorAggregator, JsonFormatter, setup_logging, shutdown_logging
+from utils.extract import parse_page
+
+PAGE_HTML = '''
+<html><body>
+    <div class="collection-card"><h3 class="product-title">Card 1</h3></div>
+    <div class="collection-card"><h3 class="product-title">Card 2</h3></div>
+    <div class="collection-card"><h3 class="product-title">Card 3</h3></div>
+</body></html>
+'''
+
+class TestLogger(unittest.TestCase):
+    
+    def test_error_aggregator_logs_once(self):
+        """Test error berulang diringkas menjadi satu record"""
+        logger = logging.getLogger('test.aggregator')
+        errors = ErrorAggregator(logger, {'page': 7})
+        for _ in range(3):
+            errors.add(ValueError('bad price'))
+        errors.add(KeyError('title'))
+        
+        with self.assertLogs('test.aggregator', level='WARNING') as logs:
+            self.assertEqual(errors.flush('cards failed'), 4)
+        
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertIn('ValueError: bad price x3', record.getMessage())
+        self.assertEqual(record.page, 7)
+        self.assertEqual(record.error_count, 4)
+        self.assertEqual(len(errors), 0)
+    
+    def test_error_aggregator_silent_without_errors(self):
+        """Test flush tanpa error tidak menulis log"""
+        errors = ErrorAggregator(logging.getLogger('test.silent'))
+        with self.assertNoLogs('test.silent'):
+            self.assertEqual(errors.flush(), 0)
+    
+    def test_json_formatter_includes_extra(self):
+        """Test formatter JSON menyertakan field dari extra"""
+        record = logging.LogRecord('utils.extract', logging.INFO, __file__, 1, "Scraped %d products", (20,), None)
+        record.page = 3
+        entry = json.loads(JsonFormatter().format(record))
+        
+        self.assertEqual(entry['msg'], 'Scraped 20 products')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['page'], 3)
+    
+    def test_setup_logging_queue_listener(self):
+        """Test record dikirim lewat queue ke file log dengan level yang diatur"""
+        root = logging.getLogger()
+        old_level, old_handlers = root.level, list(root.handlers)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = os.path.join(tmpdir, 'etl.log')
+            try:
+                with patch('sys.stdout'):
+                    setup_logging('INFO', 'json', log_file)
+                    logging.getLogger('utils.test').debug("hidden")
+                    logging.getLogger('utils.test').info("visible %s", 'line')
+                    shutdown_logging()
+            finally:
+                root.handlers[:] = old_handlers
+                root.setLevel(old_level)
+            
+            with open(log_file) as f:
+                lines = [json.loads(line) for line in f]
+        
+        self.assertEqual([line['msg'] for line in lines], ['visible line'])
+    
+    def test_parse_page_aggregates_card_errors(self):
+        """Test card yang gagal di-extract dilaporkan sekali per halaman"""
+        products = []
+        with patch('utils.extract.ProductRecord', side_effect=ValueError('broken card')):
+            with self.assertLogs('utils.extract', level='WARNING') as logs:
+                card_count, added = parse_page(PAGE_HTML, products, page=5)
+        
+        self.assertEqual((card_count, added), (3, 0))
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('3 cards could not be extracted', logs.records[0].getMessage())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+import subprocess
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+class TestMainStartup(unittest.TestCase):
+    
+    def test_import_main_does_not_load_pipeline_dependencies(self):
+        """Test import main (dan --help) tidak memuat pandas, numpy atau requests"""
+        code = "import sys, main; print(sorted(m for m in ('pandas', 'numpy', 'requests') if m in sys.modules))"
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '[]')
+    
+    def test_parse_args(self):
+        """Test subcommand worker dibaca tanpa menjalankan pipeline"""
+        import main
+        
+        args = main.parse_args(['worker', '--batch', '3'])
+        self.assertEqual(args.command, 'worker')
+        self.assertEqual(args.batch, 3)
+
+if __name__ == '__main__':
+    unittest.main()
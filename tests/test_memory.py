@@ -0,0 +1,127 @@
+import unittest
+import sys
+import os
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.memory import (parse_size, current_rss, estimate_row_bytes, MemoryGovernor, load_chunksize,
+                          load_slices, POSTGRES_MAX_PARAMS, STAGE_MINIMUMS)
+from utils.transform import transform_chunked, transform_data
+
+MB = 1024 ** 2
+
+class FakeRss:
+    """RSS yang bisa diatur dari test"""
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def __call__(self):
+        return self.value
+
+def make_raw(n):
+    return pd.DataFrame({
+        'Title': [f'T-shirt {i}' for i in range(n)],
+        'Price': [f'${i}.00' for i in range(1, n + 1)],
+        'Rating': ['Rating: ⭐ 4.5 / 5'] * n,
+        'Colors': ['3 Colors'] * n,
+        'Size': ['Size: M'] * n,
+        'Gender': ['Gender: Men'] * n,
+        'timestamp': ['2024-01-01T00:00:00'] * n
+    })
+
+class TestMemoryGovernor(unittest.TestCase):
+    
+    def test_parse_size(self):
+        """Test parsing ukuran memori"""
+        self.assertEqual(parse_size('512M'), 512 * MB)
+        self.assertEqual(parse_size('1.5g'), int(1.5 * 1024 * MB))
+        self.assertEqual(parse_size('2GB'), 2 * 1024 * MB)
+        self.assertEqual(parse_size(4096), 4096)
+        self.assertIsNone(parse_size(None))
+        with self.assertRaises(ValueError):
+            parse_size('lots')
+        for invalid in (0, -1, '0M'):
+            with self.assertRaises(ValueError):
+                parse_size(invalid)
+    
+    def test_current_rss(self):
+        """Test RSS proses terbaca dan masuk akal"""
+        self.assertGreater(current_rss(), MB)
+    
+    def test_without_budget_keeps_defaults(self):
+        """Test tanpa budget ukuran default tidak berubah"""
+        governor = MemoryGovernor(rss_reader=FakeRss(10 * 1024 * MB))
+        self.assertEqual(governor.initial_size('load', 1000, item_bytes=500), 1000)
+        self.assertEqual(governor.adapt('load'), 1000)
+        self.assertEqual(governor.report()['sizes']['load'], {'initial': 1000, 'size': 1000, 'adjustments': 0})
+    
+    def test_initial_size_from_headroom(self):
+        """Test ukuran awal = headroom / (bytes per item * overhead)"""
+        rss = FakeRss(100 * MB)
+        governor = MemoryGovernor('200M', high_water=1.0, overhead=1.0, rss_reader=rss)
+        self.assertEqual(governor.initial_size('load', 1000, item_bytes=1024), 100 * 1024)
+        self.assertEqual(governor.initial_size('load', 1000, item_bytes=1024, maximum=5000), 5000)
+        rss.value = 300 * MB
+        self.assertEqual(governor.initial_size('load', 1000, item_bytes=1024, minimum=10), 10)
+    
+    def test_adapt_shrinks_and_grows(self):
+        """Test ukuran mengecil saat RSS di atas budget dan membesar saat ada headroom"""
+        rss = FakeRss(50 * MB)
+        governor = MemoryGovernor('100M', rss_reader=rss)
+        governor.initial_size('transform', 1000, minimum=100, maximum=4000)
+        rss.value = 95 * MB
+        self.assertEqual(governor.adapt('transform'), 500)
+        self.assertEqual(governor.adapt('transform'), 250)
+        rss.value = 40 * MB
+        self.assertEqual(governor.adapt('transform'), 376)
+        report = governor.report()
+        self.assertEqual(report['budget_mb'], 100.0)
+        self.assertEqual(report['peak_rss_mb'], 95.0)
+        self.assertEqual(report['sizes']['transform']['adjustments'], 3)
+    
+    def test_budget_below_baseline_uses_stage_minimum(self):
+        """Test budget di bawah RSS awal: peringatan dan ukuran minimum per stage, bukan 1 baris"""
+        with self.assertLogs('utils.memory', level='WARNING') as logs:
+            governor = MemoryGovernor('100M', rss_reader=FakeRss(500 * MB))
+        self.assertIn('below current RSS', logs.output[0])
+        self.assertEqual(governor.initial_size('transform', 100000, item_bytes=500), STAGE_MINIMUMS['transform'])
+        self.assertEqual(governor.initial_size('load', 1000, item_bytes=500), STAGE_MINIMUMS['load'])
+        self.assertEqual(governor.adapt('load'), STAGE_MINIMUMS['load'])
+    
+    def test_load_slices_adapt_during_load(self):
+        """Test chunk load berikutnya mengecil ketika RSS naik di tengah load"""
+        rss = FakeRss(10 * MB)
+        governor = MemoryGovernor('100M', rss_reader=rss)
+        governor.initial_size('load', 400, minimum=100)
+        sizes = []
+        for rows in load_slices(1000, 1000, governor):
+            sizes.append(rows.stop - rows.start)
+            rss.value = 99 * MB
+        self.assertEqual(sizes, [400, 200, 100, 100, 100, 100])
+        self.assertEqual([rows.stop for rows in load_slices(5, 2)], [2, 4, 6])
+    
+    def test_load_chunksize_respects_parameter_limit(self):
+        """Test chunksize load tidak melebihi batas parameter PostgreSQL"""
+        df = make_raw(10)
+        self.assertEqual(load_chunksize(df), 1000)
+        governor = MemoryGovernor('64G', rss_reader=FakeRss(0))
+        self.assertEqual(load_chunksize(df, governor), POSTGRES_MAX_PARAMS // len(df.columns))
+        self.assertGreater(estimate_row_bytes(df), 0)
+    
+    def test_transform_chunked_with_governor(self):
+        """Test chunk transform mengecil di bawah tekanan memori tanpa mengubah hasil"""
+        raw = make_raw(40)
+        chunks = []
+        governor = MemoryGovernor('100M', rss_reader=FakeRss(99 * MB))
+        written = transform_chunked([raw], chunks.append, chunksize=16, governor=governor)
+        self.assertEqual(written, 40)
+        # Ukuran default 16 di bawah STAGE_MINIMUMS['transform'] jadi tidak menyusut lagi
+        self.assertEqual([len(chunk) for chunk in chunks], [16, 16, 8])
+        expected = transform_data(raw).reset_index(drop=True)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import tempfile
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.neardup import (normalize_text, choose_bands, MinHasher, find_near_duplicates,
+                           drop_near_duplicates)
+
+def make_products(titles, sizes=None, genders=None):
+    n = len(titles)
+    return pd.DataFrame({
+        'Title': titles,
+        'Price': [100.0] * n,
+        'Rating': [4.5] * n,
+        'Colors': [3] * n,
+        'Size': sizes or ['M'] * n,
+        'Gender': genders or ['Men'] * n,
+        'timestamp': ['2024-01-01T00:00:00'] * n
+    })
+
+class TestNearDup(unittest.TestCase):
+    
+    def test_normalize_text(self):
+        """Test normalisasi huruf besar, tanda baca dan spasi"""
+        self.assertEqual(normalize_text('  T-Shirt 2 !'), 't shirt 2')
+        self.assertEqual(normalize_text('Hoodie_5'), 'hoodie 5')
+    
+    def test_choose_bands(self):
+        """Test bands * rows selalu sama dengan num_perm"""
+        for threshold in (0.5, 0.8, 0.9):
+            bands, rows = choose_bands(64, threshold)
+            self.assertEqual(bands * rows, 64)
+        # Threshold lebih tinggi -> band lebih panjang (lebih selektif)
+        self.assertGreaterEqual(choose_bands(64, 0.9)[1], choose_bands(64, 0.5)[1])
+    
+    def test_signatures_deterministic(self):
+        """Test signature identik untuk teks identik dan seed yang sama"""
+        texts = ['classic denim jacket', 'classic denim jacket', 'plain hoodie']
+        signatures = MinHasher(num_perm=32, seed=7).signatures(texts, block_shingles=10)
+        self.assertEqual(signatures.shape, (3, 32))
+        self.assertTrue((signatures[0] == signatures[1]).all())
+        self.assertFalse((signatures[0] == signatures[2]).all())
+        again = MinHasher(num_perm=32, seed=7).signatures(texts)
+        self.assertTrue((signatures == again).all())
+    
+    def test_clusters_near_duplicate_titles(self):
+        """Test judul yang hanya beda format digabung, produk lain tidak"""
+        df = make_products(['Classic Denim Jacket 7', 'classic denim-jacket 7!', 'Hoodie 5', 'Pants 11'])
+        labels = find_near_duplicates(df, threshold=0.8)
+        self.assertEqual(list(labels), [0, 0, 2, 3])
+    
+    def test_numbers_and_attributes_must_match(self):
+        """Test judul beda angka atau beda Size/Gender tidak dianggap duplikat"""
+        df = make_products(['T-shirt 2', 'T-shirt 3', 'T-shirt 2', 'T-shirt 2'],
+                           sizes=['M', 'M', 'L', 'M'], genders=['Men', 'Men', 'Men', 'Women'])
+        labels = find_near_duplicates(df, threshold=0.5)
+        self.assertEqual(list(labels), [0, 1, 2, 3])
+    
+    def test_threshold_controls_merging(self):
+        """Test threshold tinggi tidak menggabungkan judul yang cukup berbeda"""
+        df = make_products(['Vintage Oversized Cotton Shirt', 'Vintage Oversized Cotton Shirts'])
+        self.assertEqual(list(find_near_duplicates(df, threshold=0.7)), [0, 0])
+        self.assertEqual(list(find_near_duplicates(df, threshold=0.99)), [0, 1])
+    
+    def test_large_bucket(self):
+        """Test bucket besar (> max_bucket) tetap menghasilkan satu cluster"""
+        df = make_products(['Basic Tee'] * 30 + ['basic tee!'] * 30)
+        labels = find_near_duplicates(df, max_bucket=4)
+        self.assertTrue((labels == 0).all())
+    
+    def test_drop_near_duplicates_report(self):
+        """Test baris pertama per cluster disimpan dan report ditulis"""
+        df = make_products(['Hoodie 5', 'Pants 11', 'hoodie 5 ', 'HOODIE-5'])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report_path = os.path.join(tmpdir, 'report.csv')
+            df_kept, report = drop_near_duplicates(df, report_path=report_path)
+            self.assertTrue(os.path.exists(report_path))
+        self.assertEqual(list(df_kept['Title']), ['Hoodie 5', 'Pants 11'])
+        self.assertEqual(len(report), 1)
+        self.assertEqual(report['size'].iloc[0], 3)
+        self.assertEqual(report['kept_title'].iloc[0], 'Hoodie 5')
+        self.assertEqual(report['merged_titles'].iloc[0], 'hoodie 5  | HOODIE-5')
+    
+    def test_empty_dataframe(self):
+        """Test DataFrame kosong"""
+        df_kept, report = drop_near_duplicates(make_products([]))
+        self.assertTrue(df_kept.empty)
+        self.assertTrue(report.empty)
+
+if __name__ == '__main__':
+    unittest.main()
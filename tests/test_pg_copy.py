@@ -0,0 +1,187 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import struct
+from datetime import date, datetime, timedelta
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.pg_copy import (PGCOPY_HEADER, PGCOPY_TRAILER, BinaryCopyEncoder, UnsupportedCopyType, column_codec,
+                           copy_frame)
+from utils.pg_schema import PG_COLUMNS, bulk_load, prepare_frame
+
+def make_products():
+    return pd.DataFrame({
+        'Title': ['T-shirt 1', 'Hoodie é', 'Jacket 3'],
+        'Price': [1599840.0, np.nan, 2399840.0],
+        'Rating': [4.5, 3.8, np.nan],
+        'Colors': [3, 2, 5],
+        'Size': ['M', 'L', None],
+        'Gender': ['Men', 'Unisex', 'Women'],
+        'timestamp': ['2024-01-31T23:00:00', '2024-02-01T08:30:00.250000', '1999-12-31T12:00:00']
+    })
+
+def decode_field(kind, raw):
+    """Decoder referensi untuk satu field COPY binary"""
+    if kind == 'text':
+        return raw.decode('utf-8')
+    if kind == 'float8':
+        return struct.unpack('!d', raw)[0]
+    if kind == 'float4':
+        return struct.unpack('!f', raw)[0]
+    if kind == 'int4':
+        return struct.unpack('!i', raw)[0]
+    if kind == 'date':
+        return date(2000, 1, 1) + timedelta(days=struct.unpack('!i', raw)[0])
+    return datetime(2000, 1, 1) + timedelta(microseconds=struct.unpack('!q', raw)[0])
+
+KINDS = {'product_hash': 'text', 'scrape_date': 'date', 'Title': 'text', 'Price': 'float8', 'Rating': 'float4',
+         'Colors': 'int4', 'Size': 'text', 'Gender': 'text', 'timestamp': 'timestamp'}
+
+def decode_rows(payload):
+    """Parse isi COPY binary (tanpa header/trailer) menjadi list of dict"""
+    rows, pos = [], 0
+    while pos < len(payload):
+        count, = struct.unpack_from('!h', payload, pos)
+        pos += 2
+        row = {}
+        for name in list(PG_COLUMNS)[:count]:
+            length, = struct.unpack_from('!i', payload, pos)
+            pos += 4
+            if length == -1:
+                row[name] = None
+            else:
+                row[name] = decode_field(KINDS[name], bytes(payload[pos:pos + length]))
+                pos += length
+        rows.append(row)
+    return rows
+
+class CapturingCursor:
+    """Cursor palsu yang membaca seluruh stream COPY seperti psycopg2"""
+    
+    def __init__(self):
+        self.sql = None
+        self.data = b''
+    
+    def copy_expert(self, sql, file, size=8192):
+        self.sql = sql
+        while True:
+            chunk = file.read(size)
+            if not chunk:
+                break
+            self.data += chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+    
+    def close(self):
+        pass
+
+class TestPgCopy(unittest.TestCase):
+    
+    def setUp(self):
+        self.prepared = prepare_frame(make_products())
+    
+    def test_column_codec(self):
+        """Test pemetaan tipe SQL ke encoder binary"""
+        self.assertEqual(column_codec('DOUBLE PRECISION'), ('float', '>f8'))
+        self.assertEqual(column_codec('CHAR(40) NOT NULL'), ('text', None))
+        self.assertEqual(column_codec('timestamp'), ('timestamp', '>i8'))
+        self.assertIsNone(column_codec('NUMERIC(10, 2)'))
+        self.assertIsNone(column_codec('JSONB'))
+    
+    def test_encode_roundtrip(self):
+        """Test buffer binary terbaca kembali sama dengan DataFrame (termasuk NULL)"""
+        rows = decode_rows(BinaryCopyEncoder().encode(self.prepared))
+        self.assertEqual(len(rows), 3)
+        for row, (_, expected) in zip(rows, self.prepared.iterrows()):
+            self.assertEqual(row['product_hash'], expected['product_hash'])
+            self.assertEqual(row['scrape_date'], expected['scrape_date'])
+            self.assertEqual(row['Title'], expected['Title'])
+            self.assertEqual(row['Colors'], expected['Colors'])
+            self.assertEqual(row['timestamp'], expected['timestamp'].to_pydatetime())
+        self.assertEqual(rows[0]['Price'], 1599840.0)
+        self.assertIsNone(rows[1]['Price'])
+        self.assertAlmostEqual(rows[1]['Rating'], 3.8, places=5)
+        self.assertIsNone(rows[2]['Rating'])
+        self.assertIsNone(rows[2]['Size'])
+        self.assertEqual(rows[1]['Title'], 'Hoodie é')
+        self.assertEqual(rows[2]['scrape_date'], date(1999, 12, 31))
+    
+    def test_buffer_is_reused(self):
+        """Test buffer dipakai ulang untuk batch yang tidak lebih besar"""
+        encoder = BinaryCopyEncoder()
+        encoder.encode(self.prepared)
+        buffer = encoder._buffer
+        view = encoder.encode(self.prepared.iloc[:1])
+        self.assertIs(encoder._buffer, buffer)
+        self.assertEqual(len(decode_rows(view)), 1)
+        self.assertEqual(len(encoder.encode(self.prepared.iloc[:0])), 0)
+    
+    def test_copy_frame_binary_stream(self):
+        """Test copy_frame mengirim header, semua batch dan trailer"""
+        connection = MagicMock()
+        cursor = connection.cursor.return_value = CapturingCursor()
+        big = pd.concat([self.prepared] * 5, ignore_index=True)
+        
+        self.assertEqual(copy_frame(connection, big, 'products_staging', batch_rows=4), 'binary')
+        self.assertIn('FORMAT binary', cursor.sql)
+        self.assertTrue(cursor.data.startswith(PGCOPY_HEADER))
+        self.assertTrue(cursor.data.endswith(PGCOPY_TRAILER))
+        rows = decode_rows(cursor.data[len(PGCOPY_HEADER):-len(PGCOPY_TRAILER)])
+        self.assertEqual([row['Title'] for row in rows], big['Title'].tolist())
+    
+    def test_copy_frame_text_fallback(self):
+        """Test tipe yang tidak didukung encoder dikirim sebagai COPY CSV"""
+        connection = MagicMock()
+        cursor = connection.cursor.return_value = CapturingCursor()
+        columns = dict(PG_COLUMNS, Price='NUMERIC(12, 2)')
+        
+        self.assertEqual(copy_frame(connection, self.prepared, 'products_staging', columns=columns), 'text')
+        self.assertIn('FORMAT csv', cursor.sql)
+        self.assertEqual(len(cursor.data.decode('utf-8').splitlines()), 3)
+        
+        overflow = self.prepared.assign(Colors=[3, 2, 2 ** 40])
+        with self.assertRaises(UnsupportedCopyType):
+            BinaryCopyEncoder().encode(overflow)
+        self.assertEqual(copy_frame(connection, overflow, 'products_staging'), 'text')
+    
+    def test_copy_frame_validates_every_batch(self):
+        """Test nilai tidak didukung di batch terakhir tetap fallback ke text sebelum COPY dimulai"""
+        connection = MagicMock()
+        cursor = connection.cursor.return_value = CapturingCursor()
+        df = pd.DataFrame({'a': [1, 2, 3, 2 ** 40]})
+        
+        self.assertEqual(copy_frame(connection, df, 't', columns={'a': 'INTEGER'}, batch_rows=2), 'text')
+        self.assertIn('FORMAT csv', cursor.sql)
+        self.assertEqual(cursor.data.decode('utf-8').split(), ['1', '2', '3', str(2 ** 40)])
+    
+    def test_invalid_timestamp_is_not_null(self):
+        """Test timestamp yang gagal di-parse tidak diam-diam dikirim sebagai NULL"""
+        invalid = self.prepared.astype({'timestamp': object})
+        invalid.loc[0, 'timestamp'] = 'not a date'
+        with self.assertRaises(UnsupportedCopyType):
+            BinaryCopyEncoder().encode(invalid)
+        
+        connection = MagicMock()
+        connection.cursor.return_value = CapturingCursor()
+        self.assertEqual(copy_frame(connection, invalid, 'products_staging'), 'text')
+    
+    @patch('utils.pg_schema.pd.DataFrame.to_sql')
+    def test_bulk_load_uses_copy_with_psycopg2(self, mock_to_sql):
+        """Test bulk_load memakai COPY binary (bukan to_sql) untuk engine psycopg2"""
+        engine = MagicMock()
+        engine.dialect.driver = 'psycopg2'
+        conn = engine.begin.return_value.__enter__.return_value
+        cursor = conn.connection.cursor.return_value = CapturingCursor()
+        
+        result = bulk_load(engine, make_products())
+        statements = [str(call.args[0]) for call in conn.execute.call_args_list]
+        mock_to_sql.assert_not_called()
+        self.assertEqual(result['format'], 'binary')
+        self.assertTrue(statements[1].startswith('CREATE UNLOGGED TABLE "products_staging"'))
+        self.assertEqual(len(decode_rows(cursor.data[len(PGCOPY_HEADER):-len(PGCOPY_TRAILER)])), 3)
+
+if __name__ == '__main__':
+    unittest.main()
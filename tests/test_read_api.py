@@ -0,0 +1,173 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import urllib.request
+import urllib.error
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.read_api import ProductIndex, ProductReadService, parse_query_params, start_read_api
+
+def make_clean(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Title': [f'T-shirt {i}' for i in range(n)],
+        'Price': rng.integers(1, 50, n) * 16000.0,
+        'Rating': rng.integers(10, 50, n) / 10,
+        'Colors': rng.integers(1, 6, n),
+        'Size': rng.choice(['S', 'M', 'L', 'XL'], n),
+        'Gender': rng.choice(['Men', 'Women', 'Unisex'], n),
+        'timestamp': ['2024-01-01T00:00:00'] * n
+    })
+
+def get_json(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+class TestProductIndex(unittest.TestCase):
+    
+    def setUp(self):
+        self.df = make_clean(2000)
+        self.index = ProductIndex(self.df)
+    
+    def expected(self, gender=None, size=None, min_price=None, max_price=None, min_rating=None, max_rating=None):
+        df = self.df
+        mask = pd.Series(True, index=df.index)
+        if gender is not None:
+            mask &= df['Gender'] == gender
+        if size is not None:
+            mask &= df['Size'] == size
+        if min_price is not None:
+            mask &= df['Price'] >= min_price
+        if max_price is not None:
+            mask &= df['Price'] <= max_price
+        if min_rating is not None:
+            mask &= df['Rating'] >= min_rating
+        if max_rating is not None:
+            mask &= df['Rating'] <= max_rating
+        return np.flatnonzero(mask.to_numpy())
+    
+    def test_match_equals_pandas_filter(self):
+        """Test hasil filter index sama dengan boolean filter pandas"""
+        cases = [
+            {},
+            {'gender': 'Men'},
+            {'gender': 'Women', 'size': 'M'},
+            {'min_price': 300000.0},
+            {'min_price': 160000.0, 'max_price': 320000.0, 'gender': 'Unisex'},
+            {'min_rating': 4.5, 'size': 'XL'},
+            {'min_rating': 2.0, 'max_rating': 2.0},
+            {'gender': 'Men', 'size': 'S', 'min_price': 16000.0, 'max_price': 480000.0, 'min_rating': 3.0},
+        ]
+        for filters in cases:
+            with self.subTest(filters=filters):
+                np.testing.assert_array_equal(self.index.match(**filters), self.expected(**filters))
+    
+    def test_unknown_category_returns_empty(self):
+        """Test nilai kategori yang tidak ada menghasilkan kosong"""
+        self.assertEqual(len(self.index.match(gender='Kids')), 0)
+    
+    def test_order_and_pagination(self):
+        """Test urutan -Price/Rating dan paginasi offset/limit"""
+        total, items = self.index.query(gender='Men', order_by='-Price', offset=5, limit=10)
+        expected = self.df[self.df['Gender'] == 'Men'].sort_values('Price', ascending=False, kind='stable')
+        self.assertEqual(total, len(expected))
+        self.assertEqual(len(items), 10)
+        self.assertEqual([item['Price'] for item in items], expected['Price'].iloc[5:15].tolist())
+        
+        # Hasil besar memakai sorted index tanpa sort per query
+        total, items = self.index.query(order_by='Rating', limit=1000)
+        self.assertEqual(total, 2000)
+        ratings = [item['Rating'] for item in items]
+        self.assertEqual(ratings, sorted(ratings))
+        self.assertIsInstance(items[0]['Colors'], int)
+    
+    def test_invalid_order_by(self):
+        """Test order_by kolom tanpa sorted index ditolak"""
+        with self.assertRaises(ValueError):
+            self.index.query(order_by='Title')
+    
+    def test_parse_query_params(self):
+        """Test parsing query string HTTP"""
+        params = parse_query_params('gender=Men&min_price=1000&limit=5&order_by=-Price')
+        self.assertEqual(params, {'gender': 'Men', 'order_by': '-Price', 'min_price': 1000.0, 'limit': 5})
+        with self.assertRaises(ValueError):
+            parse_query_params('colour=red')
+        with self.assertRaises(ValueError):
+            parse_query_params('min_price=cheap')
+
+class TestReadService(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmpdir.name, 'products.csv')
+        self.service = ProductReadService(self.source)
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def write(self, df, mtime):
+        df.to_csv(self.source, index=False)
+        os.utime(self.source, (mtime, mtime))
+    
+    def test_hot_swap_on_change(self):
+        """Test snapshot di-swap hanya jika file sumber berubah"""
+        self.assertFalse(self.service.reload_if_changed())
+        self.write(make_clean(10), 1700000000)
+        self.assertTrue(self.service.reload_if_changed())
+        old_index = self.service.index
+        self.assertFalse(self.service.reload_if_changed())
+        
+        self.write(make_clean(25, seed=1), 1700000100)
+        self.assertTrue(self.service.reload_if_changed())
+        self.assertIsNot(self.service.index, old_index)
+        self.assertEqual(self.service.status()['rows'], 25)
+        # Snapshot lama tetap utuh untuk query yang sedang berjalan
+        self.assertEqual(old_index.size, 10)
+    
+    def test_broken_file_keeps_snapshot(self):
+        """Test file rusak tidak menggantikan snapshot yang sedang dilayani"""
+        self.write(make_clean(10), 1700000000)
+        self.service.reload_if_changed()
+        with open(self.source, 'w') as f:
+            f.write('not,a,product,file\n')
+        self.assertFalse(self.service.reload_if_changed())
+        self.assertEqual(self.service.index.size, 10)
+    
+    def test_http_endpoints(self):
+        """Test endpoint /products, /facets dan /status"""
+        server = start_read_api(self.service, port=0)
+        base = f'http://127.0.0.1:{server.server_address[1]}'
+        try:
+            status, body = get_json(base + '/products')
+            self.assertEqual(status, 503)
+            
+            df = make_clean(100)
+            self.write(df, 1700000000)
+            self.service.reload_if_changed()
+            status, body = get_json(base + '/products?gender=Men&order_by=-Price&limit=3')
+            self.assertEqual(status, 200)
+            self.assertEqual(body['total'], int((df['Gender'] == 'Men').sum()))
+            self.assertEqual(len(body['items']), 3)
+            self.assertEqual(body['items'][0]['Price'], df[df['Gender'] == 'Men']['Price'].max())
+            
+            status, body = get_json(base + '/products?min_price=abc')
+            self.assertEqual(status, 400)
+            status, body = get_json(base + '/facets')
+            self.assertEqual(sum(body['facets']['Size'].values()), 100)
+            status, body = get_json(base + '/status')
+            self.assertEqual(body['rows'], 100)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
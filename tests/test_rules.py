@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.rules import ColumnRule, DEFAULT_SPEC, compile_spec
+from utils.transform import (transform_data, transform_data_compiled, apply_cleaning_rules,
+                             clean_price_simple, clean_rating_simple, clean_colors_simple,
+                             clean_size_simple, clean_gender_simple)
+
+class TestRules(unittest.TestCase):
+    
+    def setUp(self):
+        # Termasuk format-format tidak biasa untuk menguji kesetaraan dengan fungsi lama
+        self.sample_data = pd.DataFrame({
+            'Title': ['T-shirt 1', 'Hoodie 2', 'Pants 3', 'Jacket 4', 'Shoes 5', 'Hat 6', 'Bag 7'],
+            'Price': ['$99.99', '$1,149.99', 'Price Unavailable', '25.75', 'free', '$10', '$5.00'],
+            'Rating': ['Rating: ⭐ 4.5 / 5', '3.8 / 5', '4.0 / 5', '4.2', '7', 'Not Rated', 'Rating: ⭐ 4.9 / 5'],
+            'Colors': ['3 Colors', '2 Colors', '1 Colors', 'Colors', '4 Colors', '5 Colors', '6 Colors'],
+            'Size': ['Size: M', 'Size: L', 'Size: S', 'Size: XL', 'Size: Unknown', 'Size: M', 'Size: S'],
+            'Gender': ['Gender: Men', 'Gender: Women', 'Gender: Unisex', 'Gender: Men', 'Gender: Men',
+                       'Gender: Women', 'Gender: Unknown'],
+            'timestamp': ['2024-01-01'] * 7
+        })
+    
+    def _single_rule_plan(self, column):
+        return compile_spec([rule for rule in DEFAULT_SPEC if rule.column == column])
+    
+    def test_price_rule_matches_clean_price_simple(self):
+        """Test rule Price setara dengan clean_price_simple"""
+        expected = clean_price_simple(self.sample_data)['Price']
+        result = self._single_rule_plan('Price').execute(self.sample_data)['Price']
+        pd.testing.assert_series_equal(result, expected)
+    
+    def test_rating_rule_matches_clean_rating_simple(self):
+        """Test rule Rating setara dengan clean_rating_simple"""
+        expected = clean_rating_simple(self.sample_data)['Rating']
+        result = self._single_rule_plan('Rating').execute(self.sample_data)['Rating']
+        pd.testing.assert_series_equal(result, expected)
+    
+    def test_colors_rule_matches_clean_colors_simple(self):
+        """Test rule Colors setara dengan clean_colors_simple"""
+        expected = clean_colors_simple(self.sample_data)['Colors'].astype('int64')
+        result = self._single_rule_plan('Colors').execute(self.sample_data)['Colors']
+        pd.testing.assert_series_equal(result, expected)
+    
+    def test_text_rules_match_clean_size_and_gender(self):
+        """Test rule Size dan Gender setara dengan fungsi lama"""
+        expected = clean_size_simple(self.sample_data)['Size']
+        result = self._single_rule_plan('Size').execute(self.sample_data)['Size']
+        pd.testing.assert_series_equal(result, expected)
+        
+        expected = clean_gender_simple(self.sample_data)['Gender']
+        result = self._single_rule_plan('Gender').execute(self.sample_data)['Gender']
+        pd.testing.assert_series_equal(result, expected)
+    
+    def test_default_plan_matches_cleaning_chain(self):
+        """Test plan bawaan setara dengan seluruh rantai clean_*_simple"""
+        expected = apply_cleaning_rules(self.sample_data)
+        result = compile_spec().execute(self.sample_data)
+        pd.testing.assert_frame_equal(result, expected)
+    
+    def test_numeric_values_pass_through(self):
+        """Test nilai yang sudah numerik diperlakukan sama seperti parser lama"""
+        mixed = self.sample_data.copy()
+        mixed['Price'] = pd.Series([99.99, '$10', 5, '$1.00', '$2.00', '$3.00', '$4.00'], dtype=object)
+        
+        expected = apply_cleaning_rules(mixed)
+        result = compile_spec().execute(mixed)
+        pd.testing.assert_frame_equal(result, expected)
+    
+    def test_transform_data_compiled_matches_transform_data(self):
+        """Test transform_data_compiled setara dengan transform_data"""
+        raw = pd.concat([self.sample_data, self.sample_data], ignore_index=True)
+        pd.testing.assert_frame_equal(transform_data_compiled(raw), transform_data(raw))
+    
+    def test_custom_rule(self):
+        """Test menambah kolom baru cukup dengan menambah ColumnRule"""
+        data = self.sample_data.copy()
+        data['Stock'] = ['12 left', 'Sold out', '3 left', '1 left', '0 left', '9 left', '2 left']
+        spec = DEFAULT_SPEC + [ColumnRule('Stock', dtype='int64', patterns=[(r'(\d+) left', None)],
+                                          sentinels=['Sold out'])]
+        
+        result = compile_spec(spec).execute(data)
+        self.assertEqual(str(result['Stock'].dtype), 'int64')
+        self.assertNotIn('Hoodie 2', result['Title'].values)
+
+if __name__ == '__main__':
+    unittest.main()
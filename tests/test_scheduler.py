@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import patch, Mock
+import sys
+import os
+import requests
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.scheduler import AdaptiveScheduler, parse_retry_after
+from utils.extract import scrape_main
+
+
+class FakeClock:
+    """Clock palsu supaya test tidak benar-benar menunggu"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+PAGE_HTML = '''
+<html>
+    <body>
+        <div class="collection-card">
+            <h3 class="product-title">Test Product</h3>
+            <span class="price">$100.00</span>
+            <p>Rating: 4.5 / 5</p>
+            <p>2 Colors</p>
+            <p>Size: M</p>
+            <p>Gender: Men</p>
+        </div>
+    </body>
+</html>
+'''
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = AdaptiveScheduler(sleep=self.clock.sleep, clock=self.clock)
+
+    def test_rate_increases_additively_on_success(self):
+        """Test rate naik sedikit saat server sehat"""
+        self.scheduler.record_success(latency=0.1)
+        self.assertAlmostEqual(self.scheduler.rate, 1.5)
+
+    def test_rate_decreases_multiplicatively_on_slow_response(self):
+        """Test rate turun setengah saat latency melewati target"""
+        self.scheduler.record_success(latency=5.0)
+        self.assertAlmostEqual(self.scheduler.rate, 0.5)
+
+    def test_failed_page_is_requeued_with_backoff(self):
+        """Test halaman gagal masuk antrian retry dengan backoff"""
+        self.scheduler.add_pages([1])
+        page, attempt = next(self.scheduler)
+        self.assertTrue(self.scheduler.record_failure(page, attempt))
+
+        page, attempt = next(self.scheduler)
+        self.assertEqual((page, attempt), (1, 1))
+        # Backoff pertama = backoff_base detik
+        self.assertAlmostEqual(self.clock.now, 1.0)
+        self.assertEqual(self.scheduler.summary()['retried_pages'], 1)
+
+    def test_retry_budget_exhausted(self):
+        """Test halaman tidak di-retry lagi setelah budget habis"""
+        self.assertFalse(self.scheduler.record_failure(7, attempt=3))
+        self.assertEqual(self.scheduler.failed_pages, [7])
+        self.assertEqual(list(self.scheduler), [])
+
+    def test_retry_after_delays_next_request(self):
+        """Test Retry-After dihormati sebelum request berikutnya"""
+        self.scheduler.record_failure(1, 0, retry_after=30)
+        self.scheduler.wait()
+        self.assertGreaterEqual(self.clock.now, 30)
+
+    def test_parse_retry_after(self):
+        """Test parsing header Retry-After"""
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('not a date'))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+    @patch('utils.extract.requests.get')
+    def test_scrape_main_retries_server_errors(self, mock_get):
+        """Test scrape_main me-retry halaman yang membalas 503"""
+        busy = Mock(status_code=503, headers={'Retry-After': '2'})
+        ok = Mock(status_code=200, content=PAGE_HTML)
+        mock_get.side_effect = [busy, ok]
+
+        result = scrape_main("https://test.com", 1, 1, scheduler=self.scheduler)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(self.scheduler.summary()['retried_pages'], 1)
+
+    @patch('utils.extract.requests.get')
+    def test_scrape_main_gives_up_after_budget(self, mock_get):
+        """Test scrape_main berhenti me-retry setelah budget habis"""
+        mock_get.side_effect = requests.exceptions.ConnectionError("down")
+        scheduler = AdaptiveScheduler(max_retries=2, sleep=self.clock.sleep, clock=self.clock)
+
+        result = scrape_main("https://test.com", 1, 1, scheduler=scheduler)
+
+        self.assertIsNone(result)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(scheduler.failed_pages, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+import threading
+import requests
+from bs4 import BeautifulSoup
+import soupsieve
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.extract import ProductColumns, ProductRecord, extract_product_record
+from utils.scheduler import AdaptiveScheduler
+from utils.sites import FASHION_STUDIO, SiteProfile, crawl_sites, load_profiles, resolve_profiles
+from utils.transform import transform_data
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+def threadline():
+    return load_profiles(os.path.join(FIXTURES, 'threadline_profile.json'))[0]
+
+def make_response(status_code, content=b''):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = {}
+    response.raise_for_status = Mock()
+    return response
+
+class FixtureSession:
+    """Session HTTP palsu: URL -> isi fixture, URL lain 404"""
+    
+    def __init__(self, pages):
+        self.pages = pages
+        self.lock = threading.Lock()
+        self.calls = []
+    
+    def get(self, url, timeout=None):
+        with self.lock:
+            self.calls.append(url)
+        if url in self.pages:
+            return make_response(200, fixture(self.pages[url]))
+        response = make_response(404)
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError("404", response=response)
+        return response
+
+def fast_scheduler(max_rate, max_retries):
+    return AdaptiveScheduler(initial_rate=1000.0, max_rate=1000.0, max_retries=0, sleep=lambda seconds: None)
+
+class TestSiteProfiles(unittest.TestCase):
+    
+    def test_fashion_studio_matches_legacy_extractor(self):
+        """Test profil bawaan menghasilkan record yang sama dengan extract_product_record"""
+        soup = BeautifulSoup(fixture('fashion_studio_page2.html'), 'html.parser')
+        cards = FASHION_STUDIO.select_cards(soup)
+        self.assertEqual(len(cards), 4)
+        for card in cards:
+            self.assertEqual(FASHION_STUDIO.extract_record(card), extract_product_record(card))
+        self.assertEqual(FASHION_STUDIO.extract_record(cards[2]).Price, 'Price Unavailable')
+    
+    def test_fashion_studio_fixture_transform(self):
+        """Test fixture Fashion Studio lolos transform seperti scrape biasa"""
+        products = ProductColumns()
+        self.assertEqual(FASHION_STUDIO.parse(fixture('fashion_studio_page2.html'), products, page=2), (4, 4))
+        df = transform_data(products.to_dataframe())
+        self.assertEqual(df['Title'].tolist(), ['T-shirt 21', 'Pants 24'])
+        self.assertEqual(df['Price'].tolist(), [102.15 * 16000, 1204.50 * 16000])
+    
+    def test_threadline_profile_from_json(self):
+        """Test profil JSON: atribut, jumlah elemen, template dan default field"""
+        profile = threadline()
+        soup = BeautifulSoup(fixture('threadline_page1.html'), 'html.parser')
+        records = [profile.extract_record(card) for card in profile.select_cards(soup)]
+        self.assertEqual(records[0], ProductRecord('Linen Shirt', '$32.50', 'Rating: ⭐ 4.2 / 5', '3 Colors',
+                                                   'Size: L', 'Gender: Women'))
+        self.assertEqual(records[1].Rating, 'Not Rated')
+        self.assertEqual(records[2].Colors, '2 Colors')
+        
+        products = ProductColumns()
+        profile.parse(fixture('threadline_page1.html'), products, page=1)
+        df = transform_data(products.to_dataframe())
+        self.assertEqual(df['Title'].tolist(), ['Linen Shirt', 'Wool Beanie'])
+        self.assertEqual(df['Rating'].tolist(), [4.2, 4.9])
+        self.assertEqual(df['Gender'].tolist(), ['Women', 'Unisex'])
+    
+    def test_page_url(self):
+        """Test skema URL pagination per profil"""
+        self.assertEqual(FASHION_STUDIO.page_url(1), 'https://fashion-studio.dicoding.dev')
+        self.assertEqual(FASHION_STUDIO.page_url(2), 'https://fashion-studio.dicoding.dev/page2')
+        self.assertEqual(threadline().page_url(1), 'https://threadline.example/catalog?page=1')
+    
+    def test_missing_field_uses_default(self):
+        """Test field tanpa selector atau dengan default khusus"""
+        profile = SiteProfile('no-gender', 'https://shop.example', 'div.item',
+                              {'Title': {'css': 'h4'}, 'Gender': {'default': 'Gender: Unisex'}})
+        record = profile.extract_record(BeautifulSoup('<div class="item"><h4>Cap</h4></div>', 'html.parser'))
+        self.assertEqual(record.Title, 'Cap')
+        self.assertEqual(record.Gender, 'Gender: Unisex')
+        self.assertEqual(record.Size, 'Size: Unknown')
+    
+    def test_invalid_profiles(self):
+        """Test field tidak dikenal dan selector rusak gagal saat profil dibuat"""
+        with self.assertRaises(ValueError):
+            SiteProfile('bad', 'https://shop.example', 'div.item', {'Brand': {'css': 'span'}})
+        with self.assertRaises(soupsieve.SelectorSyntaxError):
+            SiteProfile('bad', 'https://shop.example', 'div.item', {'Title': {'css': 'h4[['}})
+        with self.assertRaises(ValueError):
+            resolve_profiles(['fashion-studio', 'unknown-shop'])
+    
+    def test_crawl_sites_two_hosts(self):
+        """Test crawl dua situs bersamaan: scheduler per host, hasil digabung urut per situs"""
+        fashion = SiteProfile.from_dict({
+            'name': 'fashion-fixture', 'base_url': 'https://fashion.example', 'card': 'div.collection-card',
+            'fields': {field: {'css': selector.selectors} for field, selector in FASHION_STUDIO.fields.items()},
+            'first_page': '{base_url}', 'start_page': 1, 'end_page': 2,
+        })
+        session = FixtureSession({
+            'https://fashion.example/page2': 'fashion_studio_page2.html',
+            'https://threadline.example/catalog?page=1': 'threadline_page1.html',
+            'https://threadline.example/catalog?page=2': 'threadline_page2.html',
+        })
+        products, stats = crawl_sites([fashion, threadline()], session=session, fetch_workers=2,
+                                      scheduler_factory=fast_scheduler)
+        
+        self.assertEqual(len(session.calls), 4)
+        self.assertEqual(stats['sites']['fashion-fixture'], {'host': 'fashion.example', 'pages': 1, 'products': 4})
+        self.assertEqual(stats['sites']['threadline'], {'host': 'threadline.example', 'pages': 2, 'products': 4})
+        self.assertEqual(set(stats['hosts']), {'fashion.example', 'threadline.example'})
+        self.assertEqual(stats['hosts']['fashion.example']['failed_pages'], 1)
+        
+        df = transform_data(products.to_dataframe())
+        self.assertEqual(df['Title'].tolist(), ['T-shirt 21', 'Pants 24', 'Linen Shirt', 'Wool Beanie',
+                                                'Denim Jacket'])
+    
+    def test_crawl_sites_shared_host(self):
+        """Test profil di host yang sama berbagi satu scheduler dengan rate terkecil"""
+        rates = []
+        
+        def factory(max_rate, max_retries):
+            rates.append(max_rate)
+            return fast_scheduler(max_rate, max_retries)
+        
+        base = threadline()
+        second = SiteProfile('threadline-sale', base.base_url, 'article.product',
+                             {'Title': {'css': 'h2 a'}}, page_pattern='{base_url}/sale?page={page}',
+                             end_page=1, max_rate=0.5)
+        products, stats = crawl_sites([base, second], session=FixtureSession({}), scheduler_factory=factory)
+        self.assertIsNone(products)
+        self.assertEqual(rates, [0.5])
+        self.assertEqual(list(stats['hosts']), ['threadline.example'])
+        with self.assertRaises(ValueError):
+            crawl_sites([base, base])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import requests
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.stages import (Stage, StagedExecutor, PageFetcher, PageTransformer, PageWindow, parse_fetched_page,
+                          scrape_staged, run_staged_etl)
+from utils.scheduler import AdaptiveScheduler
+from utils.dedup import DiskHashSet
+
+def square(value):
+    return value * value
+
+def page_html(page):
+    return f"""
+    <html><body>
+        <div class="collection-card">
+            <h3 class="product-title">T-shirt {page}</h3>
+            <span class="price">${page}.00</span>
+            <p>Rating: ⭐ 4.5 / 5</p>
+            <p>3 Colors</p>
+            <p>Size: M</p>
+            <p>Gender: Men</p>
+        </div>
+    </body></html>
+    """.encode('utf-8')
+
+def make_response(status_code, content=b'', headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    response.raise_for_status = Mock()
+    return response
+
+class FakeSession:
+    """Session HTTP palsu: halaman ke-n berisi satu produk 'T-shirt n'"""
+    
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.lock = threading.Lock()
+        self.calls = []
+    
+    def get(self, url, timeout=None):
+        page = 1 if url.rstrip('/').endswith('test.com') else int(url.rsplit('page', 1)[1])
+        with self.lock:
+            self.calls.append(page)
+            if self.failures.get(page):
+                self.failures[page] -= 1
+                return make_response(503)
+        return make_response(200, page_html(page))
+
+def fast_scheduler():
+    return AdaptiveScheduler(initial_rate=1000.0, max_rate=1000.0, sleep=lambda seconds: None)
+
+class TestStagedExecutor(unittest.TestCase):
+    
+    def test_items_flow_through_stages(self):
+        """Test item melewati semua stage dan statistik tercatat"""
+        results = []
+        executor = StagedExecutor([
+            Stage('square', square, workers=3),
+            Stage('sink', results.append),
+        ], queue_size=2)
+        stats = executor.run(range(20))
+        self.assertEqual(sorted(results), [value * value for value in range(20)])
+        self.assertEqual(stats['stages']['square']['items_in'], 20)
+        self.assertEqual(stats['stages']['square']['items_out'], 20)
+        self.assertEqual(stats['stages']['square']['workers'], 3)
+        self.assertIn(stats['bottleneck'], ('square', 'sink'))
+    
+    def test_none_and_errors_are_dropped(self):
+        """Test return None membuang item, exception dihitung sebagai error"""
+        results = []
+        
+        def only_even(value):
+            if value == 3:
+                raise ValueError("broken item")
+            return value if value % 2 == 0 else None
+        
+        stats = StagedExecutor([Stage('filter', only_even), Stage('sink', results.append)]).run(range(6))
+        self.assertEqual(sorted(results), [0, 2, 4])
+        self.assertEqual(stats['stages']['filter']['errors'], 1)
+        self.assertEqual(stats['stages']['filter']['items_out'], 3)
+    
+    def test_backpressure_bounds_items_in_flight(self):
+        """Test sink lambat menahan source: item yang belum selesai tetap terbatas"""
+        produced = []
+        consumed = []
+        max_in_flight = []
+        
+        def source():
+            for value in range(30):
+                produced.append(value)
+                max_in_flight.append(len(produced) - len(consumed))
+                yield value
+        
+        def slow_sink(value):
+            time.sleep(0.002)
+            consumed.append(value)
+        
+        stats = StagedExecutor([
+            Stage('fetch', lambda value: value, workers=2),
+            Stage('load', slow_sink),
+        ], queue_size=2).run(source())
+        self.assertEqual(len(consumed), 30)
+        # 2 antrian x 2 slot + 2 worker fetch + 1 worker load + 1 item di tangan feeder
+        self.assertLessEqual(max(max_in_flight), 8)
+        self.assertEqual(stats['bottleneck'], 'load')
+        self.assertGreater(stats['stages']['fetch']['blocked_seconds'], 0)
+    
+    def test_process_stage(self):
+        """Test stage CPU di ProcessPoolExecutor"""
+        results = []
+        StagedExecutor([
+            Stage('square', square, workers=2, kind='process'),
+            Stage('sink', results.append),
+        ]).run(range(10))
+        self.assertEqual(sorted(results), [value * value for value in range(10)])
+    
+    def test_invalid_stage_kind(self):
+        """Test kind yang tidak dikenal ditolak"""
+        with self.assertRaises(ValueError):
+            Stage('bad', square, kind='gpu')
+
+class TestStagedScrape(unittest.TestCase):
+    
+    def test_page_fetcher_retries(self):
+        """Test fetcher me-retry 503 dengan backoff lalu berhasil"""
+        sleeps = []
+        session = FakeSession(failures={2: 1})
+        fetcher = PageFetcher("https://test.com", fast_scheduler(), session, sleep=sleeps.append)
+        page, content = fetcher(2)
+        self.assertEqual(page, 2)
+        self.assertIn(b'T-shirt 2', content)
+        self.assertEqual(session.calls, [2, 2])
+        self.assertEqual(sleeps, [1.0])
+    
+    def test_page_fetcher_client_error_not_retried(self):
+        """Test fetcher tidak me-retry 4xx selain 429"""
+        response = make_response(404)
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError("404", response=response)
+        session = Mock()
+        session.get.return_value = response
+        scheduler = fast_scheduler()
+        fetcher = PageFetcher("https://test.com", scheduler, session, sleep=lambda s: None)
+        self.assertIsNone(fetcher(4))
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(scheduler.failed_pages, [4])
+    
+    def test_page_fetcher_gives_up(self):
+        """Test fetcher menyerah setelah retry budget habis"""
+        scheduler = fast_scheduler()
+        scheduler.max_retries = 1
+        fetcher = PageFetcher("https://test.com", scheduler, FakeSession(failures={3: 5}), sleep=lambda s: None)
+        self.assertIsNone(fetcher(3))
+        self.assertEqual(scheduler.failed_pages, [3])
+    
+    def test_scrape_staged_keeps_page_order(self):
+        """Test hasil scrape bertahap urut per halaman seperti scrape_main"""
+        products, stats = scrape_staged("https://test.com", 1, 8, scheduler=fast_scheduler(),
+                                        session=FakeSession(), fetch_workers=3)
+        titles = products.to_dataframe()['Title'].tolist()
+        self.assertEqual(titles, [f'T-shirt {page}' for page in range(1, 9)])
+        self.assertEqual(stats['stages']['fetch']['items_out'], 8)
+        self.assertEqual(stats['stages']['collect']['items_in'], 8)
+    
+    def test_page_window_follows_governor(self):
+        """Test halaman berikutnya menunggu sampai halaman di pipeline di bawah ukuran extract"""
+        from utils.memory import MemoryGovernor
+        
+        rss = [0]
+        governor = MemoryGovernor('1G', rss_reader=lambda: rss[0])
+        window = PageWindow(range(10), governor, default=4)
+        pages = iter(window)
+        self.assertEqual([next(pages) for _ in range(4)], [0, 1, 2, 3])
+        
+        rss[0] = 10 ** 12
+        window.done()
+        self.assertEqual(governor.size('extract'), 2)
+        fed = []
+        thread = threading.Thread(target=lambda: fed.append(next(pages)))
+        thread.start()
+        thread.join(0.05)
+        self.assertEqual(fed, [])
+        
+        rss[0] = 0
+        window.done()
+        thread.join(1)
+        self.assertEqual(fed, [4])
+    
+    def test_scrape_staged_with_governor(self):
+        """Test scrape bertahap dengan governor tetap lengkap dan mencatat stage extract"""
+        from utils.memory import MemoryGovernor
+        
+        governor = MemoryGovernor()
+        products, _ = scrape_staged("https://test.com", 1, 12, scheduler=fast_scheduler(), session=FakeSession(),
+                                    fetch_workers=3, queue_size=2, governor=governor)
+        self.assertEqual(len(products), 12)
+        self.assertEqual(governor.size('extract'), 2)
+    
+    def test_run_staged_etl(self):
+        """Test ETL streaming: sink menerima DataFrame bersih per halaman"""
+        frames = []
+        stats = run_staged_etl("https://test.com", [1, 2, 3], frames.append, scheduler=fast_scheduler(),
+                               session=FakeSession(), fetch_workers=2)
+        df = pd.concat(frames, ignore_index=True).sort_values('Title', ignore_index=True)
+        self.assertEqual(df['Title'].tolist(), ['T-shirt 1', 'T-shirt 2', 'T-shirt 3'])
+        self.assertEqual(df['Price'].tolist(), [16000.0, 32000.0, 48000.0])
+        self.assertEqual(stats['stages']['load']['items_in'], 3)
+    
+    def test_page_transformer_dedups_across_pages(self):
+        """Test baris mentah yang sudah pernah dilihat di halaman lain dibuang"""
+        products = parse_fetched_page((1, page_html(1)))
+        transformer = PageTransformer()
+        df_clean = transformer(products)
+        self.assertEqual(df_clean['Title'].tolist(), ['T-shirt 1'])
+        self.assertIsNone(transformer(products))
+        transformer.close()
+        self.assertFalse(os.path.exists(transformer.seen.path))
+    
+    def test_page_transformer_shared_hashset_across_threads(self):
+        """Test DiskHashSet bersama dipakai dari thread worker lain, file tetap milik pemanggil"""
+        products = parse_fetched_page((1, page_html(1)))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            seen = DiskHashSet(os.path.join(tmpdir, 'seen.sqlite'))
+            transformer = PageTransformer(seen=seen)
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                self.assertEqual(len(pool.submit(transformer, products).result()), 1)
+                self.assertIsNone(pool.submit(transformer, products).result())
+            transformer.close()
+            self.assertEqual(len(seen), 1)
+            seen.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import json
+import pickle
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.stats import RunningMoments, KLLSketch, StatsAccumulator, stats_path_for, write_stats
+from utils.transform import transform_chunked, transform_data_parallel
+
+def make_clean(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Title': [f'T-shirt {i}' for i in range(n)],
+        'Price': rng.integers(1, 50, n) * 16000.0,
+        'Rating': rng.integers(10, 50, n) / 10,
+        'Colors': rng.integers(1, 6, n),
+        'Size': rng.choice(['S', 'M', 'L'], n),
+        'Gender': rng.choice(['Men', 'Women'], n),
+        'timestamp': ['2024-01-01T00:00:00'] * n
+    })
+
+class TestStats(unittest.TestCase):
+    
+    def test_running_moments_matches_numpy(self):
+        """Test Welford per batch + merge sama dengan numpy pada seluruh data"""
+        values = np.random.default_rng(1).normal(100, 15, 10000)
+        left = RunningMoments().update(values[:3000])
+        right = RunningMoments().update(values[3000:7000]).update(values[7000:])
+        merged = left.merge(right).to_dict()
+        self.assertEqual(merged['count'], 10000)
+        self.assertAlmostEqual(merged['mean'], values.mean(), places=9)
+        self.assertAlmostEqual(merged['std'], values.std(), places=9)
+        self.assertEqual(merged['min'], values.min())
+        self.assertEqual(merged['max'], values.max())
+    
+    def test_running_moments_ignores_nan(self):
+        """Test NaN tidak dihitung dan state kosong tetap valid"""
+        self.assertEqual(RunningMoments().update([1.0, np.nan, 3.0]).to_dict()['mean'], 2.0)
+        self.assertEqual(RunningMoments().to_dict(), {'count': 0})
+    
+    def test_kll_sketch_quantiles(self):
+        """Test kuantil KLL mendekati kuantil exact dengan memori terbatas"""
+        values = np.random.default_rng(2).permutation(100000).astype(float)
+        sketch = KLLSketch(k=200)
+        for start in range(0, len(values), 7000):
+            sketch.update(values[start:start + 7000])
+        self.assertEqual(sketch.count, 100000)
+        self.assertLess(len(sketch), 2000)
+        for q, estimate in zip((0.05, 0.5, 0.95), sketch.quantiles((0.05, 0.5, 0.95))):
+            self.assertLess(abs(estimate - q * 100000), 2000)
+    
+    def test_kll_sketch_merge(self):
+        """Test merge dua sketch setara dengan satu sketch atas semua data"""
+        left = KLLSketch().update(np.arange(0, 50000, dtype=float))
+        right = KLLSketch(seed=1).update(np.arange(50000, 100000, dtype=float))
+        merged = left.merge(right)
+        self.assertEqual(merged.count, 100000)
+        self.assertLess(abs(merged.quantiles([0.5])[0] - 50000), 2000)
+    
+    def test_accumulator_batches_equal_single_pass(self):
+        """Test statistik per batch dan hasil merge sama dengan satu batch"""
+        df = make_clean(5000)
+        whole = StatsAccumulator().update(df).to_dict()
+        first = StatsAccumulator().update(df.iloc[:2000])
+        second = pickle.loads(pickle.dumps(StatsAccumulator().update(df.iloc[2000:])))
+        merged = first.merge(second).to_dict()
+        
+        self.assertEqual(merged['rows'], 5000)
+        self.assertEqual(merged['categorical'], whole['categorical'])
+        self.assertEqual(merged['categorical']['Gender'], df['Gender'].value_counts().to_dict())
+        self.assertAlmostEqual(merged['numeric']['Price']['mean'], df['Price'].mean(), places=6)
+        men = df[df['Gender'] == 'Men']
+        self.assertEqual(merged['breakdown']['Gender']['Men']['count'], len(men))
+        self.assertAlmostEqual(merged['breakdown']['Gender']['Men']['Price']['mean'], men['Price'].mean(), places=6)
+        self.assertAlmostEqual(merged['breakdown']['Size']['M']['Rating']['std'],
+                               df[df['Size'] == 'M']['Rating'].std(ddof=0), places=9)
+    
+    def test_write_stats(self):
+        """Test stats JSON ditulis di samping output"""
+        self.assertEqual(stats_path_for('out/products.csv'), 'out/products.stats.json')
+        self.assertEqual(stats_path_for('products.csv.gz'), 'products.stats.json')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'products.stats.json')
+            self.assertTrue(write_stats(StatsAccumulator().update(make_clean(100)), path))
+            with open(path) as f:
+                summary = json.load(f)
+            self.assertEqual(os.listdir(tmpdir), ['products.stats.json'])
+        self.assertEqual(summary['rows'], 100)
+        self.assertIn('p50', summary['numeric']['Price']['quantiles'])
+    
+    def test_write_stats_failure_removes_temp_file(self):
+        """Test write yang gagal tidak meninggalkan file sementara"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'products.stats.json')
+            self.assertFalse(write_stats({'rows': object()}, path))
+            self.assertEqual(os.listdir(tmpdir), [])
+    
+    def test_streaming_and_parallel_transform_stats(self):
+        """Test stats dari transform_chunked dan transform_data_parallel sama"""
+        raw = pd.DataFrame({
+            'Title': [f'T-shirt {i}' for i in range(40)] + ['Unknown Product'],
+            'Price': [f'${i}.00' for i in range(1, 42)],
+            'Rating': ['Rating: ⭐ 4.5 / 5'] * 41,
+            'Colors': ['3 Colors'] * 41,
+            'Size': ['Size: M', 'Size: L'] * 20 + ['Size: M'],
+            'Gender': ['Gender: Men'] * 41,
+            'timestamp': ['2024-01-01T00:00:00'] * 41
+        })
+        streaming = StatsAccumulator()
+        transform_chunked([raw], lambda chunk: None, chunksize=7, stats=streaming)
+        parallel = StatsAccumulator()
+        transform_data_parallel(raw, workers=2, partitions=3, stats=parallel)
+        
+        self.assertEqual(streaming.rows, 40)
+        self.assertEqual(streaming.to_dict()['categorical'], parallel.to_dict()['categorical'])
+        self.assertAlmostEqual(streaming.moments['Price'].mean, parallel.moments['Price'].mean)
+        self.assertEqual(streaming.to_dict()['numeric']['Price']['max'], 40 * 16000.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+import tempfile
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.store import ProductStore, save_to_store
+from utils.query import build_product_query, query_products, explain_query
+
+class TestStore(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'products.db')
+        self.df = pd.DataFrame({
+            'Title': ['Shirt A', 'Shirt B', 'Shirt C', 'Shirt D'],
+            'Price': [160000.0, 480000.0, 320000.0, 800000.0],
+            'Rating': [4.5, 3.9, 4.8, 4.2],
+            'Colors': [3, 2, 5, 1],
+            'Size': ['M', 'L', 'M', 'XL'],
+            'Gender': ['Women', 'Women', 'Women', 'Men'],
+            'timestamp': ['2024-01-01T00:00:00'] * 4
+        })
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_append_and_runs(self):
+        """Test append menyimpan run_id dan jumlah baris per run"""
+        store = ProductStore(self.path)
+        store.append(self.df, run_id='run1')
+        store.append(self.df.head(2), run_id='run2')
+        
+        self.assertEqual(store.latest_run_id(), 'run2')
+        self.assertEqual([(run_id, count) for run_id, _, count in store.runs()], [('run1', 4), ('run2', 2)])
+        total = store.conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+        self.assertEqual(total, 6)
+        mode = store.conn.execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode, 'wal')
+        store.close()
+    
+    def test_query_filters_latest_run(self):
+        """Test query helper memfilter run terakhir saja secara default"""
+        save_to_store(self.df, self.path, run_id='run1')
+        save_to_store(self.df, self.path, run_id='run2')
+        
+        result = query_products(self.path, gender='Women', max_price=400000, min_rating=4, order_by='-Rating')
+        
+        self.assertEqual(result['Title'].tolist(), ['Shirt C', 'Shirt A'])
+        self.assertTrue((result['run_id'] == 'run2').all())
+        
+        all_runs = query_products(self.path, run_id=None, gender='Women', max_price=400000, min_rating=4)
+        self.assertEqual(len(all_runs), 4)
+    
+    def test_query_empty_store(self):
+        """Test query pada store kosong return DataFrame kosong"""
+        ProductStore(self.path).close()
+        result = query_products(self.path, gender='Women')
+        self.assertTrue(result.empty)
+    
+    def test_query_uses_index(self):
+        """Test filter run + Gender + Price memakai index komposit run_id di depan"""
+        # Cukup banyak baris supaya planner (dengan statistik ANALYZE) tidak memilih scan
+        df = pd.concat([self.df.assign(Gender=gender) for gender in ['Men', 'Women', 'Unisex']] * 20,
+                       ignore_index=True)
+        save_to_store(df, self.path, run_id='run1')
+        save_to_store(df, self.path, run_id='run2')
+        plan = ' '.join(explain_query(self.path, run_id='run2', gender='Women', max_price=400000))
+        self.assertIn('USING INDEX idx_products_run_gender_price (run_id=? AND Gender=? AND Price<?)', plan)
+    
+    def test_legacy_indexes_replaced(self):
+        """Test index lama tanpa run_id dibuang saat store dibuka"""
+        store = ProductStore(self.path)
+        store.conn.execute('CREATE INDEX idx_products_gender_price ON products ("Gender", "Price")')
+        store.close()
+        store = ProductStore(self.path)
+        names = {row[0] for row in store.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        store.close()
+        self.assertNotIn('idx_products_gender_price', names)
+        self.assertIn('idx_products_run_gender_price', names)
+    
+    def test_build_query_rejects_unknown_order(self):
+        """Test order_by kolom yang tidak dikenal ditolak"""
+        with self.assertRaises(ValueError):
+            build_product_query(order_by='Price; DROP TABLE products')
+    
+    def test_save_to_store_error(self):
+        """Test save_to_store return False jika DataFrame tidak lengkap"""
+        result = save_to_store(self.df.drop(columns=['Rating']), self.path)
+        self.assertFalse(result)
+
+if __name__ == '__main__':
+    unittest.main()
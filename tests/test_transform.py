@@ -7,7 +7,10 @@ import numpy as np
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.transform import transform_data, convert_dtypes_fixed
+from utils.transform import (transform_data, convert_dtypes_fixed, transform_chunked, transform_data_parallel,
+                             transform_data_factorized, transform_data_chunked, FactorizedCleaner, ParseMemo,
+                             extract_rating)
+import tempfile
 
 class TestTransform(unittest.TestCase):
     
@@ -141,6 +144,113 @@ class TestTransform(unittest.TestCase):
         # Semua price harus berhasil dikonversi
         self.assertEqual(len(result), 3)
         self.assertEqual(str(result['Price'].dtype), 'float64')
+    
+    def test_transform_chunked_matches_transform_data(self):
+        """Test transform per chunk menghasilkan data yang sama dengan transform_data"""
+        # Duplikat yang tersebar di chunk berbeda harus tetap terbuang
+        raw = pd.concat([self.sample_data, self.sample_data], ignore_index=True)
+        expected = transform_data(raw)
+        
+        chunks = []
+        written = transform_chunked([raw], chunks.append, chunksize=3)
+        result = pd.concat(chunks, ignore_index=True)
+        
+        self.assertEqual(written, len(expected))
+        pd.testing.assert_frame_equal(result, expected)
+    
+    def test_transform_chunked_csv_to_csv(self):
+        """Test transform per chunk dari CSV mentah ke CSV output"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            raw_path = os.path.join(tmpdir, 'raw.csv')
+            out_path = os.path.join(tmpdir, 'clean.csv')
+            self.sample_data.to_csv(raw_path, index=False)
+            
+            written = transform_chunked(raw_path, out_path, chunksize=1)
+            result = pd.read_csv(out_path)
+            
+            self.assertEqual(written, 2)
+            self.assertEqual(result['Title'].tolist(), ['T-shirt 1', 'Hoodie 2'])
+    
+    def test_transform_chunked_empty_input(self):
+        """Test transform per chunk tanpa baris valid tetap menulis header"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out_path = os.path.join(tmpdir, 'clean.csv')
+            written = transform_chunked([self.sample_data.iloc[1:2]], out_path)
+            
+            self.assertEqual(written, 0)
+            self.assertEqual(list(pd.read_csv(out_path).columns), list(self.sample_data.columns))
+    
+    def test_transform_data_parallel_matches_serial(self):
+        """Test transform paralel menghasilkan output CSV yang identik dengan serial"""
+        raw = pd.concat([self.sample_data] * 3, ignore_index=True)
+        raw['timestamp'] = [f'2024-01-{i + 1:02d}' for i in range(len(raw))]
+        
+        expected = transform_data(raw)
+        result = transform_data_parallel(raw, workers=2, partitions=3)
+        
+        self.assertEqual(result.to_csv(index=False), expected.to_csv(index=False))
+    
+    def test_transform_data_parallel_from_csv(self):
+        """Test transform paralel dari path CSV mentah"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            raw_path = os.path.join(tmpdir, 'raw.csv')
+            self.sample_data.to_csv(raw_path, index=False)
+            
+            result = transform_data_parallel(raw_path, workers=1)
+            self.assertEqual(len(result), 2)
+            self.assertEqual(str(result['Colors'].dtype), 'int64')
+    
+    def test_transform_data_factorized_matches_serial(self):
+        """Test transform factorized menghasilkan data yang sama dengan transform_data"""
+        raw = pd.concat([self.sample_data] * 5, ignore_index=True)
+        raw['timestamp'] = [f'2024-01-{i + 1:02d}' for i in range(len(raw))]
+        
+        expected = transform_data(raw)
+        result = transform_data_factorized(raw)
+        
+        pd.testing.assert_frame_equal(result, expected)
+    
+    def test_factorized_cleaner_parses_unique_values_once(self):
+        """Test parser hanya dijalankan sekali per nilai unik, memo dipakai antar batch"""
+        cleaner = FactorizedCleaner()
+        batch = pd.Series(['4.5 / 5', '3.8 / 5', '4.5 / 5', '4.5 / 5'])
+        
+        first = cleaner.map(batch, extract_rating)
+        cleaner.map(batch, extract_rating)
+        
+        self.assertEqual(first.tolist(), [4.5, 3.8, 4.5, 4.5])
+        self.assertEqual(str(first.dtype), 'float64')
+        self.assertEqual(cleaner.stats()['extract_rating'], {'hits': 2, 'misses': 2, 'size': 2})
+    
+    def test_parse_memo_is_bounded(self):
+        """Test memo cache membuang entry paling lama saat penuh"""
+        memo = ParseMemo(maxsize=2)
+        for value in ['a', 'b', 'c']:
+            memo.get(value, str.upper)
+        
+        self.assertEqual(len(memo), 2)
+        memo.get('a', str.upper)
+        self.assertEqual(memo.misses, 4)
+    
+    def test_transform_chunked_with_factorized_cleaner(self):
+        """Test transform per chunk dengan memo yang dipakai ulang antar chunk"""
+        cleaner = FactorizedCleaner()
+        chunks = []
+        transform_chunked([self.sample_data], chunks.append, chunksize=2, cleaner=cleaner)
+        
+        result = pd.concat(chunks, ignore_index=True)
+        pd.testing.assert_frame_equal(result, transform_data(self.sample_data))
+    
+    def test_transform_data_chunked_with_governor(self):
+        """Test transform per chunk dari DataFrame di memori dengan chunk dari governor"""
+        from utils.memory import MemoryGovernor
+        
+        raw = pd.concat([self.sample_data, self.sample_data], ignore_index=True)
+        governor = MemoryGovernor()
+        result = transform_data_chunked(raw, chunksize=3, governor=governor, cleaner=FactorizedCleaner())
+        pd.testing.assert_frame_equal(result, transform_data(raw))
+        self.assertEqual(governor.report()['sizes']['transform']['size'], 3)
+        self.assertTrue(transform_data_chunked(raw[raw['Title'] == 'Unknown Product']).empty)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
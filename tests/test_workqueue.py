@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.extract import ProductColumns, ProductRecord
+from utils.workqueue import PageQueue, run_worker, merge_shards, write_shard
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+def fake_scrape(base_url, start_page, end_page, scheduler=None, collector=None):
+    """scrape_main palsu: satu produk per halaman, halaman 3 selalu gagal"""
+    if start_page == 3:
+        return None
+    collector.append(ProductRecord(f'Shirt {start_page}', '$10.00', 'Rating: ⭐ 4.0 / 5',
+                                   '2 Colors', 'Size: M', 'Gender: Men'), '2024-01-01T00:00:00')
+    return collector
+
+class TestPageQueue(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.queue = PageQueue(os.path.join(self.tmpdir.name, 'queue.sqlite'), lease_seconds=60,
+                               max_attempts=2, clock=self.clock)
+        self.shard_dir = os.path.join(self.tmpdir.name, 'shards')
+    
+    def tearDown(self):
+        self.queue.close()
+        self.tmpdir.cleanup()
+    
+    def test_enqueue_is_idempotent(self):
+        """Test halaman yang sama tidak dimasukkan dua kali"""
+        self.assertEqual(self.queue.enqueue(range(1, 6)), 5)
+        self.assertEqual(self.queue.enqueue(range(1, 8)), 2)
+        self.assertEqual(self.queue.stats()['pending'], 7)
+    
+    def test_lease_is_exclusive(self):
+        """Test halaman yang sedang di-lease tidak diberikan ke worker lain"""
+        self.queue.enqueue(range(1, 6))
+        self.assertEqual(self.queue.lease('a', batch=3), [1, 2, 3])
+        self.assertEqual(self.queue.lease('b', batch=3), [4, 5])
+        self.assertEqual(self.queue.lease('c', batch=3), [])
+    
+    def test_expired_lease_is_requeued(self):
+        """Test lease worker yang crash bisa diambil worker lain setelah kadaluarsa"""
+        self.queue.enqueue([1, 2])
+        self.queue.lease('crashed', batch=2)
+        self.clock.now += 61
+        self.assertEqual(self.queue.lease('b', batch=2), [1, 2])
+        
+        # Worker lama yang terlambat selesai tidak diterima
+        self.assertEqual(self.queue.complete([1, 2], 'crashed', 'old.csv'), [])
+        self.assertEqual(self.queue.complete([1, 2], 'b', 'new.csv'), [1, 2])
+        self.assertTrue(self.queue.finished())
+    
+    def test_expired_lease_fails_after_max_attempts(self):
+        """Test halaman yang membuat worker crash berulang ditandai failed, tidak di-lease ulang"""
+        self.queue.enqueue([1, 2])
+        self.assertEqual(self.queue.lease('crash1', batch=2), [1, 2])
+        self.clock.now += 61
+        self.assertEqual(self.queue.lease('crash2', batch=1), [1])
+        self.clock.now += 61
+        self.assertEqual(self.queue.lease('b', batch=2), [2])
+        self.assertEqual(self.queue.stats()['failed'], 1)
+        self.assertEqual(self.queue.complete([1], 'crash2', 'late.csv'), [])
+        self.assertEqual(self.queue.complete([2], 'b', 'b.csv'), [2])
+        self.assertTrue(self.queue.finished())
+    
+    def test_heartbeat_extends_lease(self):
+        """Test heartbeat mencegah lease kadaluarsa"""
+        self.queue.enqueue([1])
+        self.queue.lease('a')
+        self.clock.now += 50
+        self.queue.heartbeat('a')
+        self.clock.now += 50
+        self.assertEqual(self.queue.lease('b'), [])
+    
+    def test_release_marks_failed_after_max_attempts(self):
+        """Test halaman gagal kembali ke pending, lalu failed setelah max_attempts"""
+        self.queue.enqueue([1])
+        self.queue.release(self.queue.lease('a'), 'a')
+        self.assertEqual(self.queue.stats()['pending'], 1)
+        self.queue.release(self.queue.lease('a'), 'a')
+        self.assertEqual(self.queue.stats()['failed'], 1)
+        self.assertTrue(self.queue.finished())
+    
+    @patch('utils.workqueue.scrape_main', side_effect=fake_scrape)
+    def test_run_worker_and_merge(self, mock_scrape):
+        """Test worker menulis shard dan merge menggabungkannya urut per halaman"""
+        self.queue.enqueue(range(1, 6))
+        completed = run_worker(self.queue, 'https://example.com', shard_dir=self.shard_dir,
+                               worker_id='w1', batch=2)
+        
+        self.assertEqual(completed, 4)
+        self.assertEqual(self.queue.stats()['failed'], 1)
+        products = merge_shards(self.queue)
+        self.assertIsInstance(products, ProductColumns)
+        self.assertEqual(products.to_dataframe()['Title'].tolist(),
+                         ['Shirt 1', 'Shirt 2', 'Shirt 4', 'Shirt 5'])
+    
+    def test_merge_ignores_stale_shard(self):
+        """Test merge hanya mengambil halaman yang diterima dari shard tersebut"""
+        self.queue.enqueue([1])
+        self.queue.lease('old')
+        stale = write_shard(pd.DataFrame({'Title': ['Stale'], 'Price': ['$1'], 'Rating': ['x'],
+                                          'Colors': ['1 Colors'], 'Size': ['Size: M'],
+                                          'Gender': ['Gender: Men'], 'timestamp': ['t'], 'page': [1]}),
+                            self.shard_dir, 'old')
+        self.clock.now += 61
+        self.queue.lease('new')
+        fresh = write_shard(pd.DataFrame({'Title': ['Fresh'], 'Price': ['$1'], 'Rating': ['x'],
+                                          'Colors': ['1 Colors'], 'Size': ['Size: M'],
+                                          'Gender': ['Gender: Men'], 'timestamp': ['t'], 'page': [1]}),
+                            self.shard_dir, 'new')
+        self.queue.complete([1], 'old', stale)
+        self.queue.complete([1], 'new', fresh)
+        
+        self.assertEqual(merge_shards(self.queue).to_dataframe()['Title'].tolist(), ['Fresh'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+
+from utils.logger import get_logger
+
+try:
+    import zstandard
+except ImportError:  # zstd opsional, gzip selalu tersedia
+    zstandard = None
+
+_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+logger = get_logger(__name__)
+
+
+class HtmlArchive:
+    """
+    Arsip HTML mentah yang terkompresi dan content-addressed
+
+    Body halaman disimpan sekali per sha256 di objects/<2 char>/<digest><ext>,
+    sehingga halaman identik antar run tidak disimpan dua kali. Index SQLite
+    mencatat (run_id, page, url, digest) untuk replay dan audit. store() aman
+    dipanggil dari thread lain (mis. stage archive di scrape_staged).
+    """
+
+    def __init__(self, root='html_archive', compression=None):
+        if compression is None:
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError("zstd compression requires the 'zstandard' package")
+
+        self.root = root
+        self.compression = compression
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            ' run_id TEXT NOT NULL,'
+            ' page INTEGER NOT NULL,'
+            ' url TEXT NOT NULL,'
+            ' digest TEXT NOT NULL,'
+            ' compression TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' fetched_at TEXT NOT NULL,'
+            ' PRIMARY KEY (run_id, page))'
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def new_run_id():
+        return datetime.now().strftime('%Y%m%dT%H%M%S%f')
+
+    def _object_path(self, digest, compression):
+        return os.path.join(self.root, 'objects', digest[:2], digest + _EXTENSIONS[compression])
+
+    def store(self, run_id, page, url, content, fetched_at=None):
+        """
+        Simpan body halaman dan catat di index
+
+        Return digest sha256 dari body (tidak terkompresi)
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+
+        with self._lock:
+            # Object yang sudah ada (format kompresi apapun) tidak ditulis ulang
+            compression = self._existing_compression(digest)
+            if compression is None:
+                compression = self.compression
+                self._write_object(self._object_path(digest, compression), content, compression)
+
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (run_id, page, url, digest, compression, size, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (run_id, page, url, digest, compression, len(content), fetched_at or datetime.now().isoformat())
+            )
+            self.conn.commit()
+        return digest
+
+    def _existing_compression(self, digest):
+        for compression in _EXTENSIONS:
+            if os.path.exists(self._object_path(digest, compression)):
+                return compression
+        return None
+
+    def _write_object(self, path, content, compression):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Tulis ke file sementara lalu rename supaya object tidak pernah setengah jadi
+        handle, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as raw:
+                if compression == 'zstd':
+                    with zstandard.ZstdCompressor(level=10).stream_writer(raw) as writer:
+                        writer.write(content)
+                else:
+                    with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0) as writer:
+                        writer.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def open_object(self, digest, compression):
+        """Buka object sebagai stream (dekompresi bertahap, tidak dibaca sekaligus)"""
+        path = self._object_path(digest, compression)
+        if compression == 'zstd':
+            if zstandard is None:
+                raise ImportError("Reading zstd objects requires the 'zstandard' package")
+            return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return gzip.open(path, 'rb')
+
+    def runs(self):
+        """List run_id yang ada di arsip, urut dari yang paling lama"""
+        rows = self.conn.execute('SELECT run_id FROM pages GROUP BY run_id ORDER BY MIN(fetched_at)')
+        return [row[0] for row in rows]
+
+    def iter_pages(self, run_id):
+        """Iterasi (page, url, fetched_at, stream) untuk satu run, urut per halaman"""
+        rows = self.conn.execute(
+            'SELECT page, url, digest, compression, fetched_at FROM pages WHERE run_id = ? ORDER BY page',
+            (run_id,)
+        ).fetchall()
+        for page, url, digest, compression, fetched_at in rows:
+            with self.open_object(digest, compression) as stream:
+                yield page, url, fetched_at, stream
+
+    def close(self):
+        self.conn.close()
+
+
+def reextract_run(archive, run_id, collector=None):
+    """
+    Jalankan parser ulang atas halaman yang diarsipkan (tanpa network)
+
+    Timestamp produk memakai waktu fetch asli dari index arsip.
+    Return list of dict / collector seperti scrape_main, atau None jika kosong.
+    """
+    from utils.extract import parse_page
+
+    products = collector if collector is not None else []
+    pages = 0
+    for page, url, fetched_at, stream in archive.iter_pages(run_id):
+        try:
+            _, added = parse_page(stream, products, timestamp=fetched_at, page=page)
+            pages += 1
+            logger.debug("Re-extracted %d products from archived page %d: %s", added, page, url)
+        except Exception as e:
+            logger.error("Error re-extracting archived page %d: %s", page, e)
+
+    logger.info("Re-extraction completed: %d pages, %d total products", pages, len(products))
+    if len(products) == 0:
+        return None
+    return products
@@ -0,0 +1,160 @@
+import pandas as pd
+
+from utils.extract import ProductColumns
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Arrow record batch sebagai kontrak data antar stage pipeline.
+# pyarrow bersifat opsional: baru di-import saat fungsi di modul ini dipanggil,
+# sehingga pipeline tetap jalan tanpa pyarrow (jalur pandas biasa).
+
+RAW_FIELDS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp']
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Arrow handoff requires the 'pyarrow' package (pip install pyarrow)") from e
+    return pyarrow
+
+
+def arrow_available():
+    try:
+        _pyarrow()
+        return True
+    except ImportError:
+        return False
+
+
+def raw_schema():
+    """Schema data mentah: semua kolom string, sama seperti hasil scrape"""
+    pa = _pyarrow()
+    return pa.schema([(name, pa.string()) for name in RAW_FIELDS])
+
+
+def clean_schema():
+    """Schema data bersih, sesuai tipe yang dicek validate_data"""
+    pa = _pyarrow()
+    return pa.schema([
+        ('Title', pa.string()),
+        ('Price', pa.float64()),
+        ('Rating', pa.float64()),
+        ('Colors', pa.int64()),
+        ('Size', pa.string()),
+        ('Gender', pa.string()),
+        ('timestamp', pa.string()),
+    ])
+
+
+def columns_to_batch(columns, schema=None):
+    """Bangun RecordBatch dari dict list per kolom (tanpa dict per baris)"""
+    pa = _pyarrow()
+    schema = schema or raw_schema()
+    arrays = [pa.array(columns[field.name], type=field.type) for field in schema]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def frame_from_batch(batch):
+    """
+    RecordBatch/Table -> DataFrame dengan kolom Arrow-backed (pd.ArrowDtype)
+
+    Buffer Arrow dipakai langsung, string tidak diubah menjadi object Python.
+    """
+    return batch.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def frame_to_arrow(df, schema=None):
+    """DataFrame bersih -> Table Arrow dengan clean schema"""
+    pa = _pyarrow()
+    return pa.Table.from_pandas(df, schema=schema or clean_schema(), preserve_index=False)
+
+
+class ArrowProductColumns(ProductColumns):
+    """
+    ProductColumns yang mem-flush buffer ke Arrow setiap flush_rows baris
+
+    String Python hanya hidup sampai buffer di-flush; setelah itu data
+    tersimpan di buffer Arrow yang padat, sehingga memori hasil extract
+    tidak tumbuh sebesar list of str untuk scrape besar.
+    """
+
+    __slots__ = ('flush_rows', '_batches', '_flushed_rows')
+
+    def __init__(self, flush_rows=65536):
+        super().__init__()
+        self.flush_rows = flush_rows
+        self._batches = []
+        self._flushed_rows = 0
+
+    def __len__(self):
+        return self._flushed_rows + super().__len__()
+
+    def append(self, record, timestamp):
+        super().append(record, timestamp)
+        if super().__len__() >= self.flush_rows:
+            self._flush()
+
+    def extend(self, other):
+        for batch in other.to_arrow().to_batches():
+            self._flush()
+            self._batches.append(batch)
+            self._flushed_rows += batch.num_rows
+
+    def _flush(self):
+        pending = super().__len__()
+        if not pending:
+            return
+        self._batches.append(columns_to_batch(self._columns))
+        self._flushed_rows += pending
+        for values in self._columns.values():
+            values.clear()
+
+    def to_arrow(self):
+        """Table Arrow dari semua batch yang sudah di-flush"""
+        pa = _pyarrow()
+        self._flush()
+        return pa.Table.from_batches(self._batches, schema=raw_schema())
+
+    def to_dataframe(self):
+        return self.to_arrow().to_pandas()
+
+    def to_records(self):
+        return self.to_arrow().to_pylist()
+
+
+def save_to_parquet(data, filename='products.parquet', compression='zstd'):
+    """
+    Save RecordBatch/Table (atau DataFrame) ke file Parquet
+    """
+    try:
+        pa = _pyarrow()
+        import pyarrow.parquet as pq
+
+        if isinstance(data, pd.DataFrame):
+            data = frame_to_arrow(data)
+        table = pa.Table.from_batches([data]) if isinstance(data, pa.RecordBatch) else data
+        pq.write_table(table, filename, compression=compression)
+        logger.info("Data successfully saved to %s (%d records)", filename, table.num_rows)
+        return True
+    except Exception as e:
+        logger.error("Error saving to Parquet: %s", e)
+        return False
+
+
+def batch_to_sheet_rows(batch):
+    """
+    Materialisasi baris untuk Google Sheets langsung dari RecordBatch/Table
+
+    Karakter non-ASCII dihapus dengan kernel Arrow (vektor), bukan apply per sel.
+    """
+    pa = _pyarrow()
+    import pyarrow.compute as pc
+
+    columns = []
+    for column in batch.columns:
+        if pa.types.is_string(column.type):
+            column = pc.replace_substring_regex(column, pattern=r'[^\x00-\x7F]+', replacement='')
+        columns.append(column.to_pylist())
+    return [list(batch.schema.names)] + [list(row) for row in zip(*columns)]
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.dedup import BUSINESS_COLUMNS, KEY_COLUMNS
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Kolom yang dibandingkan untuk mendeteksi update (selain natural key)
+VALUE_COLUMNS = [col for col in BUSINESS_COLUMNS if col not in KEY_COLUMNS]
+
+OP_INSERT = 'insert'
+OP_UPDATE = 'update'
+OP_DELETE = 'delete'
+
+
+def load_snapshot(path='products.csv'):
+    """
+    Baca snapshot run sebelumnya, return None jika belum ada
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        # round_trip supaya float hasil baca identik dengan yang ditulis
+        return pd.read_csv(path, float_precision='round_trip')
+    except Exception as e:
+        logger.error("Error reading previous snapshot %s: %s", path, e)
+        return None
+
+
+def compute_changeset(new_df, old_df, key=None, value_columns=None):
+    """
+    Bandingkan snapshot baru dengan snapshot lama berdasarkan natural key
+
+    Join dilakukan dengan hash join (pd.merge) sehingga skala ke jutaan baris
+    tanpa loop per baris. Hasilnya DataFrame dengan kolom:
+        op, <key...>, <value...>, old_<value...>, timestamp
+    - insert: nilai baru, old_* kosong
+    - update: nilai baru dan nilai lama di old_*
+    - delete: nilai terakhir yang diketahui di old_*, kolom nilai kosong
+    """
+    key = key or KEY_COLUMNS
+    value_columns = value_columns or VALUE_COLUMNS
+    old_columns = [f'old_{col}' for col in value_columns]
+    output_columns = ['op'] + key + value_columns + old_columns + ['timestamp']
+
+    new_side = new_df.drop_duplicates(subset=key, keep='last')
+    new_side = new_side[key + value_columns + ['timestamp']]
+
+    if old_df is None or old_df.empty:
+        changeset = new_side.copy()
+        changeset.insert(0, 'op', OP_INSERT)
+        for col in old_columns:
+            changeset[col] = np.nan
+        return changeset[output_columns].reset_index(drop=True)
+
+    old_side = old_df.drop_duplicates(subset=key, keep='last')[key + value_columns]
+    old_side = old_side.rename(columns=dict(zip(value_columns, old_columns)))
+
+    merged = new_side.merge(old_side, on=key, how='outer', indicator=True, sort=False)
+
+    changed = np.zeros(len(merged), dtype=bool)
+    for col, old_col in zip(value_columns, old_columns):
+        new_values = merged[col]
+        old_values = merged[old_col]
+        both_missing = new_values.isna() & old_values.isna()
+        changed |= ((new_values != old_values) & ~both_missing).to_numpy()
+
+    is_insert = (merged['_merge'] == 'left_only').to_numpy()
+    is_delete = (merged['_merge'] == 'right_only').to_numpy()
+    is_update = (merged['_merge'] == 'both').to_numpy() & changed
+
+    merged['op'] = np.select([is_insert, is_update, is_delete], [OP_INSERT, OP_UPDATE, OP_DELETE], default='')
+    changeset = merged[merged['op'] != ''].copy()
+
+    # Urutkan: insert, update, delete supaya mudah dibaca
+    order = {OP_INSERT: 0, OP_UPDATE: 1, OP_DELETE: 2}
+    changeset = changeset.sort_values('op', key=lambda s: s.map(order), kind='stable')
+    return changeset[output_columns].reset_index(drop=True)
+
+
+def summarize_changeset(changeset):
+    """Hitung jumlah insert/update/delete"""
+    counts = changeset['op'].value_counts()
+    return {op: int(counts.get(op, 0)) for op in (OP_INSERT, OP_UPDATE, OP_DELETE)}
+
+
+def save_changeset(changeset, filename='products_changes.csv'):
+    """
+    Simpan changeset ke CSV
+    """
+    try:
+        changeset.to_csv(filename, index=False, encoding='utf-8')
+        summary = summarize_changeset(changeset)
+        logger.info("Changeset saved to %s: %d inserted, %d updated, %d deleted",
+                    filename, summary[OP_INSERT], summary[OP_UPDATE], summary[OP_DELETE])
+        return True
+    except Exception as e:
+        logger.error("Error saving changeset: %s", e)
+        return False
@@ -0,0 +1,333 @@
+import json
+import re
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.logger import get_logger
+from utils.transform import FactorizedCleaner
+
+logger = get_logger(__name__)
+
+
+class WarmResources:
+    """
+    Resource yang dipakai ulang antar run di mode daemon
+
+    HTTP session, Sheets service, SQLAlchemy engine (connection pool), dedup
+    index dan memo parser dibuat sekali saat pertama dibutuhkan. Resource yang
+    gagal dibuat tidak di-cache supaya dicoba lagi di run berikutnya.
+    """
+
+    def __init__(self, pool_size=10):
+        self.pool_size = pool_size
+        self._session = None
+        self._sheets_services = {}
+        self._engines = {}
+        self._dedup_indexes = {}
+        self.cleaner = FactorizedCleaner()
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+
+    def sheets_service(self, credentials_file='google-sheets-api.json'):
+        service = self._sheets_services.get(credentials_file)
+        if service is None:
+            from utils.load import _create_sheets_service
+
+            service = _create_sheets_service(credentials_file)
+            if service is not None:
+                self._sheets_services[credentials_file] = service
+        return service
+
+    def postgres_engine(self, connection_string):
+        if not connection_string or not connection_string.startswith('postgresql://'):
+            return None
+        engine = self._engines.get(connection_string)
+        if engine is None:
+            from utils.load import _create_postgresql_engine
+
+            engine = _create_postgresql_engine(connection_string)
+            if engine is not None:
+                self._engines[connection_string] = engine
+        return engine
+
+    def dedup_index(self, path='dedup_index.sqlite'):
+        index = self._dedup_indexes.get(path)
+        if index is None:
+            from utils.dedup import DedupIndex
+
+            index = self._dedup_indexes[path] = DedupIndex(path)
+        return index
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+        for engine in self._engines.values():
+            engine.dispose()
+        for index in self._dedup_indexes.values():
+            index.close()
+        self._session = None
+        self._engines.clear()
+        self._dedup_indexes.clear()
+        self._sheets_services.clear()
+
+
+_INTERVAL_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_interval(spec):
+    """'90', '15m', '6h', '1d' -> detik"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*', str(spec))
+    if not match:
+        raise ValueError(f"Invalid interval: {spec!r}")
+    seconds = float(match.group(1)) * _INTERVAL_UNITS[match.group(2) or 's']
+    if seconds <= 0:
+        raise ValueError(f"Interval must be positive: {spec!r}")
+    return seconds
+
+
+class IntervalSchedule:
+    """Run setiap N detik, dihitung dari waktu mulai run sebelumnya"""
+
+    def __init__(self, seconds):
+        self.seconds = parse_interval(seconds)
+
+    def next_after(self, moment):
+        return moment + timedelta(seconds=self.seconds)
+
+    def __str__(self):
+        return f"every {self.seconds:g}s"
+
+
+class CronSchedule:
+    """
+    Ekspresi cron 5 field: menit jam tanggal bulan hari-dalam-minggu
+
+    Mendukung '*', '*/n', 'a-b', 'a-b/n' dan daftar 'a,b,c'. Hari-dalam-minggu
+    0-6 dengan 0 = Minggu (7 juga diterima sebagai Minggu).
+    """
+
+    _RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        parsed = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self._RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        # Semantik cron: jika tanggal dan hari dibatasi keduanya, cukup salah satu cocok
+        self._day_restricted = fields[2] != '*'
+        self._weekday_restricted = fields[4] != '*'
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f"Invalid cron step: {field!r}")
+            if part == '*':
+                start, stop = low, high
+            elif '-' in part:
+                start, stop = (int(value) for value in part.split('-', 1))
+            else:
+                start = stop = int(part)
+            if start < low or stop > high or start > stop:
+                raise ValueError(f"Cron field out of range: {field!r}")
+            values.update(range(start, stop + 1, step))
+        return values
+
+    def _day_matches(self, moment):
+        cron_weekday = (moment.weekday() + 1) % 7
+        day_ok = moment.day in self.days
+        weekday_ok = cron_weekday in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment):
+        """Waktu berikutnya (> moment) yang cocok dengan ekspresi"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def __str__(self):
+        return f"cron '{self.expression}'"
+
+
+class PipelineDaemon:
+    """
+    Jalankan pipeline berulang dalam satu proses sesuai schedule
+
+    run_pipeline dipanggil tanpa argumen dan return nilai truthy jika sukses
+    (None/False/exception = gagal). Jika return dict, isinya (mis. 'timings'
+    per fase) ikut dilaporkan di endpoint status; key '<sink>_success' yang
+    False (mis. 'postgres_success') membuat run dihitung gagal dan sink-nya
+    dicatat di 'failed_sinks'.
+    """
+
+    def __init__(self, run_pipeline, schedule, run_immediately=True, clock=None, sleep=None):
+        self.run_pipeline = run_pipeline
+        self.schedule = schedule
+        self.run_immediately = run_immediately
+        self._clock = clock or datetime.now
+        self._stop = threading.Event()
+        self._sleep = sleep or self._stop.wait
+        self._lock = threading.Lock()
+        self._status = {
+            'state': 'starting',
+            'schedule': str(schedule),
+            'started_at': self._clock().isoformat(),
+            'runs': 0,
+            'failures': 0,
+            'next_run_at': None,
+            'last_run': None,
+        }
+
+    def status(self):
+        with self._lock:
+            return json.loads(json.dumps(self._status))
+
+    def _update(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def run_once(self):
+        """Jalankan satu run pipeline dan catat hasil serta durasinya"""
+        started_at = self._clock()
+        self._update(state='running')
+        started = time.perf_counter()
+        error = None
+        result = None
+        try:
+            result = self.run_pipeline()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.exception("Pipeline run raised an exception")
+        duration = time.perf_counter() - started
+
+        failed_sinks = []
+        if isinstance(result, dict):
+            failed_sinks = sorted(key[:-len('_success')] for key, value in result.items()
+                                  if key.endswith('_success') and not value)
+        if error is not None or not result:
+            success = False
+        else:
+            success = not failed_sinks and (not isinstance(result, dict) or result.get('success', True))
+        last_run = {
+            'started_at': started_at.isoformat(),
+            'duration_seconds': round(duration, 3),
+            'success': success,
+            'error': error,
+            'failed_sinks': failed_sinks,
+        }
+        if isinstance(result, dict):
+            last_run.update({key: value for key, value in result.items() if key != 'success'})
+        with self._lock:
+            self._status['runs'] += 1
+            self._status['failures'] += 0 if success else 1
+            self._status['last_run'] = last_run
+            self._status['state'] = 'idle'
+        if failed_sinks:
+            logger.warning("Pipeline run finished with failed sinks: %s", ', '.join(failed_sinks))
+        logger.info("Pipeline run %s in %.1f s", 'succeeded' if success else 'failed', duration)
+        return success
+
+    def serve_forever(self, max_runs=None):
+        """Loop schedule sampai stop() dipanggil (atau max_runs tercapai)"""
+        next_run = self._clock() if self.run_immediately else self.schedule.next_after(self._clock())
+        runs = 0
+        while not self._stop.is_set():
+            self._update(state='idle', next_run_at=next_run.isoformat())
+            wait_seconds = (next_run - self._clock()).total_seconds()
+            if wait_seconds > 0:
+                logger.info("Next pipeline run at %s (%s)", next_run.isoformat(), self.schedule)
+                self._sleep(wait_seconds)
+                if self._stop.is_set():
+                    break
+            started_at = self._clock()
+            self.run_once()
+            runs += 1
+            if max_runs is not None and runs >= max_runs:
+                break
+            next_run = self.schedule.next_after(started_at)
+            # Run yang terlambat (lebih lama dari interval) tidak di-antrikan beruntun
+            if next_run <= self._clock():
+                next_run = self.schedule.next_after(self._clock())
+        self._update(state='stopped', next_run_at=None)
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+
+def start_health_server(daemon, host='127.0.0.1', port=8080):
+    """
+    Endpoint health/status di thread terpisah
+
+    GET /health -> 200 jika run terakhir sukses (atau belum ada run), 503 jika gagal
+                   (termasuk sink yang gagal, dicantumkan di 'failed_sinks')
+    GET /status -> JSON status lengkap (timing run terakhir, jadwal berikutnya)
+    """
+
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status = daemon.status()
+            if self.path == '/health':
+                last_run = status['last_run']
+                healthy = last_run is None or last_run['success']
+                code, body = (200 if healthy else 503), {'status': 'ok' if healthy else 'failing'}
+                if last_run and last_run['failed_sinks']:
+                    body['failed_sinks'] = last_run['failed_sinks']
+            elif self.path == '/status':
+                code, body = 200, status
+            else:
+                code, body = 404, {'error': 'not found'}
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            # Health check dipanggil terus-menerus, jangan penuhi output
+            pass
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, name='health-server', daemon=True)
+    thread.start()
+    logger.info("Health endpoint listening on http://%s:%d/health", host, server.server_address[1])
+    return server
@@ -0,0 +1,164 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Kolom yang mendefinisikan isi produk (timestamp sengaja tidak ikut)
+BUSINESS_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']
+
+# Natural key produk: varian dibedakan berdasarkan ukuran dan gender
+KEY_COLUMNS = ['Title', 'Size', 'Gender']
+
+
+def compute_row_hash(df, columns=None):
+    """
+    Hitung hash stabil (sha1) per baris dari kolom bisnis
+
+    Hash hanya bergantung pada nilai kolom, sehingga produk identik yang di-scrape
+    di waktu berbeda menghasilkan hash yang sama di setiap run.
+    """
+    columns = columns or BUSINESS_COLUMNS
+    if df.empty:
+        return pd.Series([], index=df.index, dtype='object')
+
+    joined = df[columns[0]].astype(str)
+    for col in columns[1:]:
+        joined = joined + '\x1f' + df[col].astype(str)
+
+    hashes = [hashlib.sha1(value.encode('utf-8')).hexdigest() for value in joined]
+    return pd.Series(hashes, index=df.index, dtype='object')
+
+
+class DedupIndex:
+    """
+    Index deduplikasi persisten (SQLite) berbasis content hash
+
+    Dipakai dua tahap supaya aman jika load gagal:
+        new_df, hashes = index.filter_new(df_clean)
+        ... load new_df ke sink ...
+        index.commit(hashes)
+    """
+
+    def __init__(self, path='dedup_index.sqlite', columns=None):
+        self.path = path
+        self.columns = columns or BUSINESS_COLUMNS
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen ('
+            ' hash TEXT PRIMARY KEY,'
+            ' first_seen TEXT NOT NULL,'
+            ' last_seen TEXT NOT NULL)'
+        )
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+
+    def filter_new(self, df):
+        """
+        Ambil hanya baris yang content hash-nya belum pernah tercatat
+
+        Return (DataFrame baru/berubah, Series hash untuk baris tersebut)
+        """
+        hashes = compute_row_hash(df, self.columns)
+        # Duplikat dalam run yang sama cukup dikirim sekali
+        first_occurrence = ~hashes.duplicated()
+
+        unseen = self._unseen(hashes[first_occurrence].tolist())
+        mask = first_occurrence & hashes.isin(unseen)
+        return df[mask], hashes[mask]
+
+    def _unseen(self, hashes):
+        # Anti-join lewat temp table supaya tetap cepat untuk jutaan hash
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS batch (hash TEXT PRIMARY KEY)')
+        self.conn.execute('DELETE FROM batch')
+        self.conn.executemany('INSERT OR IGNORE INTO batch (hash) VALUES (?)', ((h,) for h in hashes))
+        rows = self.conn.execute(
+            'SELECT b.hash FROM batch b LEFT JOIN seen s ON s.hash = b.hash WHERE s.hash IS NULL'
+        ).fetchall()
+        self.conn.execute('DELETE FROM batch')
+        return {row[0] for row in rows}
+
+    def commit(self, hashes, seen_at=None):
+        """Catat hash sebagai sudah dikirim ke sink"""
+        seen_at = seen_at or datetime.now().isoformat()
+        self.conn.executemany(
+            'INSERT INTO seen (hash, first_seen, last_seen) VALUES (?, ?, ?) '
+            'ON CONFLICT(hash) DO UPDATE SET last_seen = excluded.last_seen',
+            ((h, seen_at, seen_at) for h in hashes)
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class DiskHashSet:
+    """
+    Hash set yang disimpan di disk (SQLite) untuk deduplikasi global
+
+    Memori tetap kecil walaupun jumlah hash mencapai puluhan juta, karena
+    yang ada di RAM hanya page cache SQLite. Aman dipakai dari beberapa
+    thread (mis. stage transform pipeline staged): akses dijaga lock.
+    """
+
+    def __init__(self, path=None, cache_mb=64):
+        if path is None:
+            handle, path = tempfile.mkstemp(prefix='hashset_', suffix='.sqlite')
+            os.close(handle)
+            self._owns_file = True
+        else:
+            self._owns_file = False
+        self.path = path
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=OFF')
+        self.conn.execute('PRAGMA synchronous=OFF')
+        self.conn.execute(f'PRAGMA cache_size=-{cache_mb * 1024}')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS hashes (hash TEXT PRIMARY KEY) WITHOUT ROWID')
+        self.conn.execute('CREATE TEMP TABLE batch (pos INTEGER PRIMARY KEY, hash TEXT)')
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM hashes').fetchone()[0]
+
+    def add(self, hashes):
+        """
+        Tambahkan hash ke set
+
+        Return numpy bool array: True untuk hash yang baru pertama kali terlihat
+        (kemunculan pertama di dalam batch ini juga dihitung sebagai baru)
+        """
+        hashes = list(hashes)
+        is_new = np.zeros(len(hashes), dtype=bool)
+        if not hashes:
+            return is_new
+
+        with self._lock:
+            self.conn.execute('DELETE FROM batch')
+            self.conn.executemany('INSERT INTO batch (pos, hash) VALUES (?, ?)', enumerate(hashes))
+            rows = self.conn.execute(
+                'SELECT MIN(b.pos) FROM batch b '
+                'WHERE NOT EXISTS (SELECT 1 FROM hashes h WHERE h.hash = b.hash) '
+                'GROUP BY b.hash'
+            ).fetchall()
+            self.conn.execute('INSERT OR IGNORE INTO hashes (hash) SELECT hash FROM batch')
+            self.conn.commit()
+
+        is_new[[row[0] for row in rows]] = True
+        return is_new
+
+    def close(self):
+        self.conn.close()
+        if self._owns_file and os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,80 +1,236 @@
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime
 import time
 import re
 
-def scrape_main(base_url, start_page=1, end_page=50):
+from typing import NamedTuple
+
+from utils.logger import ErrorAggregator, get_logger
+from utils.scheduler import AdaptiveScheduler, RETRYABLE_STATUS, is_retryable_error, parse_retry_after
+
+logger = get_logger(__name__)
+
+PRODUCT_FIELDS = ('Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp')
+
+
+class ProductRecord(NamedTuple):
+    """Data mentah satu product card (tuple ringan, tanpa dict per baris)"""
+    Title: str
+    Price: str
+    Rating: str
+    Colors: str
+    Size: str
+    Gender: str
+
+
+class ProductColumns:
+    """
+    Accumulator kolom untuk hasil scrape
+
+    Setiap field langsung di-append ke list per kolom, sehingga DataFrame
+    dibangun dari kolom tanpa overhead dict per baris.
+    """
+
+    __slots__ = ('_columns',)
+
+    def __init__(self):
+        self._columns = {field: [] for field in PRODUCT_FIELDS}
+
+    def __len__(self):
+        return len(self._columns['Title'])
+
+    def append(self, record, timestamp):
+        """Tambahkan satu ProductRecord beserta timestamp scrape"""
+        columns = self._columns
+        for field, value in zip(PRODUCT_FIELDS, record):
+            columns[field].append(value)
+        columns['timestamp'].append(timestamp)
+
+    def extend(self, other):
+        """Gabungkan ProductColumns lain ke accumulator ini"""
+        for field in PRODUCT_FIELDS:
+            self._columns[field].extend(other._columns[field])
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Bangun accumulator dari DataFrame mentah (mis. hasil merge shard)"""
+        products = cls()
+        for field in PRODUCT_FIELDS:
+            products._columns[field].extend(df[field].tolist())
+        return products
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame(self._columns, columns=list(PRODUCT_FIELDS))
+
+    def to_arrow(self):
+        """Table Arrow dari buffer kolom (butuh pyarrow)"""
+        import pyarrow as pa
+        from utils.arrow_io import columns_to_batch
+
+        return pa.Table.from_batches([columns_to_batch(self._columns)])
+
+    def to_records(self):
+        """List of dict, format lama hasil scrape_main"""
+        return [dict(zip(PRODUCT_FIELDS, row)) for row in zip(*self._columns.values())]
+
+
+def page_url(base_url, page):
+    """URL halaman katalog: halaman 1 di base_url, halaman n di /page{n}"""
+    # PERBAIKAN: Format URL yang benar sesuai petunjuk
+    if page == 1:
+        return base_url  # https://fashion-studio.dicoding.dev/
+    return f"{base_url}/page{page}"  # https://fashion-studio.dicoding.dev/page2
+
+
+def scrape_main(base_url, start_page=1, end_page=50, scheduler=None, collector=None,
+                archive=None, run_id=None, session=None):
     """
     Scrape data dari website Fashion Studio - FIXED URL VERSION
+
+    Tanpa collector hasilnya list of dict. Berikan collector=ProductColumns()
+    untuk mengumpulkan data langsung per kolom (hemat memori untuk scrape besar).
+    Jika archive (HtmlArchive) diberikan, setiap body halaman disimpan di bawah
+    run_id supaya bisa di-extract ulang tanpa network (REEXTRACT_RUN_ID);
+    berikan run_id sendiri untuk mencatatnya di ringkasan run, tanpa itu
+    run_id baru dibuat dan di-log.
+
+    Rate request diatur oleh AdaptiveScheduler: halaman yang gagal karena
+    error jaringan atau 429/5xx dijadwalkan ulang dengan exponential backoff;
+    4xx lain (mis. 404) langsung dicatat gagal tanpa retry.
+    Berikan session (requests.Session) untuk memakai ulang koneksi keep-alive.
     """
-    products = []
+    products = collector if collector is not None else []
     successful_pages = 0
     total_pages = end_page - start_page + 1
+
+    http = session or requests
+    if scheduler is None:
+        scheduler = AdaptiveScheduler()
+    if archive is not None:
+        run_id = run_id or archive.new_run_id()
+        logger.info("Archiving HTML pages under run_id %s in %s", run_id, archive.root)
+    scheduler.add_pages(range(start_page, end_page + 1))
     
     try:
-        for page in range(start_page, end_page + 1):
-            # PERBAIKAN: Format URL yang benar sesuai petunjuk
-            if page == 1:
-                url = base_url  # https://fashion-studio.dicoding.dev/
-            else:
-                url = f"{base_url}/page{page}"  # https://fashion-studio.dicoding.dev/page2
+        for page, attempt in scheduler:
+            url = page_url(base_url, page)
             
-            print(f"Scraping page {page}: {url}")
+            if attempt:
+                logger.info("Retrying page %d (attempt %d): %s", page, attempt + 1, url)
+            else:
+                logger.debug("Scraping page %d: %s", page, url)
             
             try:
-                response = requests.get(url, timeout=10)
+                scheduler.wait()
+                request_started = time.monotonic()
+                response = http.get(url, timeout=10)
+                latency = time.monotonic() - request_started
+
+                if response.status_code in RETRYABLE_STATUS:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    logger.warning("Server returned %d for page %d", response.status_code, page)
+                    if not scheduler.record_failure(page, attempt, retry_after):
+                        logger.error("Giving up on page %d after %d attempts", page, attempt + 1)
+                    continue
+
                 response.raise_for_status()
+                scheduler.record_success(latency)
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                product_cards = soup.find_all('div', class_='collection-card')
+                if archive is not None:
+                    archive.store(run_id, page, url, response.content)
                 
-                if not product_cards:
-                    print(f"No products found on page {page}")
-                    continue
+                card_count, page_products = parse_page(response.content, products, page=page)
                 
-                page_products = 0
-                for card in product_cards:
-                    product_data = extract_product_data(card)
-                    if product_data:
-                        product_data['timestamp'] = datetime.now().isoformat()
-                        products.append(product_data)
-                        page_products += 1
+                if not card_count:
+                    logger.warning("No products found on page %d", page)
+                    continue
                 
                 if page_products > 0:
                     successful_pages += 1
-                    print(f"Successfully scraped {page_products} products from page {page}")
+                    logger.debug("Successfully scraped %d products from page %d", page_products, page)
                 else:
-                    print(f"No valid products found on page {page}")
-                
-                # Delay untuk menghindari request berlebihan
-                time.sleep(1)
+                    logger.warning("No valid products found on page %d", page)
                 
             except requests.exceptions.RequestException as e:
-                print(f"Error fetching page {page}: {e}")
+                if not is_retryable_error(e):
+                    logger.error("Page %d failed, not retrying: %s", page, e)
+                    scheduler.record_fatal(page)
+                    continue
+                logger.warning("Error fetching page %d: %s", page, e)
+                if not scheduler.record_failure(page, attempt):
+                    logger.error("Giving up on page %d after %d attempts", page, attempt + 1)
                 continue
-            except Exception as e:
-                print(f"Unexpected error on page {page}: {e}")
+            except Exception:
+                logger.exception("Unexpected error on page %d", page)
                 continue
                 
-    except Exception as e:
-        print(f"An error occurred during scraping: {e}")
+    except Exception:
+        logger.exception("An error occurred during scraping")
         return None
     
-    print(f"Scraping completed: {successful_pages}/{total_pages} pages successful, {len(products)} total products")
+    stats = scheduler.summary()
+    logger.info("Scraping completed: %d/%d pages successful, %d total products",
+                successful_pages, total_pages, len(products))
+    logger.info("Effective rate: %s req/s, retried pages: %s, failed pages: %s",
+                stats['requests_per_sec'], stats['retried_pages'], stats['failed_pages'])
     
     # Jika tidak ada halaman yang berhasil atau tidak ada produk, return None
     if successful_pages == 0 or len(products) == 0:
-        print("Scraping failed: no successful pages or no products found")
+        logger.error("Scraping failed: no successful pages or no products found")
         return None
     
     return products
 
+def parse_page(content, products, timestamp=None, page=None, profile=None):
+    """
+    Parse satu halaman HTML dan tambahkan produknya ke products
+    (list of dict atau ProductColumns)
+
+    Tanpa profile dipakai markup Fashion Studio; profile (utils.sites.SiteProfile)
+    memakai selector card dan field milik storefront lain.
+    Error per card dikumpulkan dan di-log sekali per halaman.
+    Return (jumlah product card, jumlah produk valid yang ditambahkan)
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    if profile is None:
+        product_cards = soup.find_all('div', class_='collection-card')
+        extract_record = extract_product_record
+    else:
+        product_cards = profile.select_cards(soup)
+        extract_record = profile.extract_record
+    
+    errors = ErrorAggregator(logger, {'page': page, 'site': profile.name} if profile else {'page': page})
+    added = 0
+    for card in product_cards:
+        record = extract_record(card, errors)
+        if record:
+            card_timestamp = timestamp or datetime.now().isoformat()
+            if isinstance(products, ProductColumns):
+                products.append(record, card_timestamp)
+            else:
+                products.append({**record._asdict(), 'timestamp': card_timestamp})
+            added += 1
+    
+    errors.flush('cards could not be extracted')
+    return len(product_cards), added
+
 def extract_product_data(card):
     """
     Extract data dari setiap product card
     """
+    record = extract_product_record(card)
+    return record._asdict() if record else None
+
+def extract_product_record(card, errors=None):
+    """
+    Extract data dari product card sebagai ProductRecord
+
+    Jika errors (ErrorAggregator) diberikan, error dicatat di sana alih-alih
+    di-log per card.
+    """
     try:
         # Extract title
         title_elem = card.find('h3', class_='product-title')
@@ -116,17 +272,13 @@ def extract_product_data(card):
                 break
         gender = gender_text if gender_text else "Gender: Unknown"
         
-        return {
-            'Title': title,
-            'Price': price,
-            'Rating': rating,
-            'Colors': colors,
-            'Size': size,
-            'Gender': gender
-        }
+        return ProductRecord(title, price, rating, colors, size, gender)
         
     except Exception as e:
-        print(f"Error extracting product data: {e}")
+        if errors is not None:
+            errors.add(e)
+        else:
+            logger.warning("Error extracting product data: %s", e)
         return None
 
 def save_raw_data(products, filename='raw_products.csv'):
@@ -135,13 +287,18 @@ def save_raw_data(products, filename='raw_products.csv'):
     """
     try:
         if not products:
-            print("No products to save")
+            logger.warning("No products to save")
             return False
             
-        df = pd.DataFrame(products)
+        import pandas as pd
+
+        if isinstance(products, ProductColumns):
+            df = products.to_dataframe()
+        else:
+            df = pd.DataFrame(products)
         df.to_csv(filename, index=False)
-        print(f"Raw data saved to {filename}")
+        logger.info("Raw data saved to %s", filename)
         return True
     except Exception as e:
-        print(f"Error saving raw data: {e}")
+        logger.error("Error saving raw data: %s", e)
         return False
\ No newline at end of file
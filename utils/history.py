@@ -0,0 +1,344 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.dedup import KEY_COLUMNS, compute_row_hash
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Kolom per segment; baris selalu terurut (key, ts) supaya lookup cukup binary search
+HISTORY_COLUMNS = ['key', 'ts', 'Price', 'Rating']
+MANIFEST_NAME = 'manifest.json'
+BLOOM_NAME = 'bloom.npy'
+
+# Bloom filter key per segment: ~1% false positive dengan 10 bit per key dan 7 hash
+BLOOM_BITS_PER_KEY = 10
+BLOOM_HASHES = 7
+
+
+def product_key(title, size, gender):
+    """Key uint64 stabil untuk satu produk (sama dengan key yang dipakai saat append)"""
+    df = pd.DataFrame({'Title': [title], 'Size': [size], 'Gender': [gender]})
+    return int(_keys_for(df)[0])
+
+
+def _keys_for(df):
+    hashes = compute_row_hash(df, KEY_COLUMNS)
+    return np.array([int(value[:16], 16) for value in hashes], dtype=np.uint64)
+
+
+def _to_epoch(value):
+    """datetime/str/Timestamp -> epoch detik (int)"""
+    return int(pd.Timestamp(value).timestamp())
+
+
+def _bloom_positions(keys, bits):
+    """Posisi bit (n, BLOOM_HASHES) per key; key sudah berupa hash jadi cukup double hashing"""
+    keys = np.asarray(keys, dtype=np.uint64)
+    h1 = keys & np.uint64(0xFFFFFFFF)
+    h2 = (keys >> np.uint64(32)) | np.uint64(1)
+    rounds = np.arange(BLOOM_HASHES, dtype=np.uint64)
+    return (h1[:, None] + rounds * h2[:, None]) % np.uint64(bits)
+
+
+def build_bloom(keys):
+    """Bloom filter (bit array ter-pack uint8) untuk himpunan key"""
+    unique = np.unique(keys)
+    bits = max(64, len(unique) * BLOOM_BITS_PER_KEY)
+    bits += -bits % 8
+    bitset = np.zeros(bits, dtype=bool)
+    bitset[_bloom_positions(unique, bits).ravel()] = True
+    return np.packbits(bitset)
+
+
+def bloom_contains(bitset, keys):
+    """Mask per key: False = pasti tidak ada, True = mungkin ada (bitset hasil np.unpackbits)"""
+    return bitset[_bloom_positions(keys, len(bitset))].all(axis=1)
+
+
+def _latest_per_key(key, ts, price, rating):
+    """Observasi terbaru per key (terurut key), semua array sejajar"""
+    order = np.lexsort((ts, key))
+    key = key[order]
+    last = np.r_[key[1:] != key[:-1], True] if len(key) else np.zeros(0, dtype=bool)
+    return key[last], ts[order][last], price[order][last], rating[order][last]
+
+
+def _key_rows(sorted_keys, wanted):
+    """Index baris array key terurut yang key-nya ada di wanted (tanpa loop per key)"""
+    lo = np.searchsorted(sorted_keys, wanted, side='left')
+    hi = np.searchsorted(sorted_keys, wanted, side='right')
+    counts = hi - lo
+    if not counts.any():
+        return np.zeros(0, dtype=np.int64)
+    # Setiap rentang [lo, hi) dijadikan index berurutan: awal rentang diulang lalu ditambah offset
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(lo, counts) + offsets
+
+
+class PriceHistory:
+    """
+    Store histori Price/Rating per produk: kolumnar, dipartisi per bulan
+
+    Setiap append menulis satu segment di <root>/<YYYY-MM>/<segment>/: satu
+    file .npy per kolom (key, ts, Price, Rating) terurut (key, ts) plus
+    bloom filter key. manifest.json mencatat min/max ts setiap segment.
+    Query melewati segment di luar rentang waktu tanpa membukanya, lalu
+    segment yang bloom filter-nya tidak memuat key yang dicari; kolom
+    dibuka dengan mmap sehingga binary search key hanya membaca halaman
+    yang disentuh dan baris produk lain tidak ikut dibaca.
+
+    Setelah append, partisi bulan yang sudah lewat otomatis dikompaksi
+    menjadi satu segment (auto_compact=False untuk mematikannya), jadi
+    jumlah segment dan ukuran manifest tidak tumbuh per run.
+    """
+
+    def __init__(self, root='price_history', auto_compact=True):
+        self.root = root
+        self.auto_compact = auto_compact
+        os.makedirs(root, exist_ok=True)
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {'segments': []}
+        self._blooms = {}
+
+    def _save_manifest(self):
+        # Tulis ke file sementara lalu rename supaya manifest tidak pernah setengah jadi
+        handle, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        with os.fdopen(handle, 'w') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _write_segment(self, partition, name, key, ts, price, rating):
+        order = np.lexsort((ts, key))
+        path = os.path.join(partition, name)
+        directory = os.path.join(self.root, path)
+        os.makedirs(directory, exist_ok=True)
+        for column, values in zip(HISTORY_COLUMNS, (key, ts, price, rating)):
+            np.save(os.path.join(directory, f'{column}.npy'), values[order])
+        np.save(os.path.join(directory, BLOOM_NAME), build_bloom(key))
+        return {
+            'partition': partition,
+            'path': path,
+            'rows': int(len(key)),
+            'min_ts': int(ts.min()),
+            'max_ts': int(ts.max()),
+        }
+
+    def _load_segment(self, segment):
+        """Kolom segment; format direktori dibuka mmap, segment .npz lama dibaca penuh"""
+        path = os.path.join(self.root, segment['path'])
+        if path.endswith('.npz'):
+            with np.load(path) as data:
+                return {column: data[column] for column in HISTORY_COLUMNS}
+        return {column: np.load(os.path.join(path, f'{column}.npy'), mmap_mode='r')
+                for column in HISTORY_COLUMNS}
+
+    def _may_contain(self, segment, keys):
+        """Mask bloom filter per key (semua True untuk segment .npz lama tanpa bloom)"""
+        path = segment['path']
+        if path not in self._blooms:
+            bloom_path = os.path.join(self.root, path, BLOOM_NAME)
+            self._blooms[path] = np.unpackbits(np.load(bloom_path)).astype(bool) \
+                if not path.endswith('.npz') else None
+        bitset = self._blooms[path]
+        if bitset is None:
+            return np.ones(len(keys), dtype=bool)
+        return bloom_contains(bitset, keys)
+
+    def _remove_segment(self, segment):
+        path = os.path.join(self.root, segment['path'])
+        if path.endswith('.npz'):
+            os.remove(path)
+        else:
+            shutil.rmtree(path)
+        self._blooms.pop(segment['path'], None)
+
+    def append(self, df, observed_at=None):
+        """
+        Append Price/Rating satu run
+
+        Waktu observasi diambil dari kolom timestamp per baris; baris tanpa
+        timestamp valid memakai observed_at (default: sekarang). Dengan
+        auto_compact, partisi bulan lalu yang ditulis langsung dikompaksi.
+        Return jumlah baris yang ditulis.
+        """
+        if df.empty:
+            return 0
+        fallback = _to_epoch(observed_at or datetime.now())
+        parsed = pd.to_datetime(df['timestamp'], errors='coerce') if 'timestamp' in df.columns \
+            else pd.Series(pd.NaT, index=df.index)
+        ts = np.where(parsed.notna(), parsed.astype('int64') // 10**9, fallback).astype(np.int64)
+
+        key = _keys_for(df)
+        price = df['Price'].to_numpy(dtype=np.float64)
+        rating = df['Rating'].to_numpy(dtype=np.float64)
+
+        # Satu run bisa melewati batas bulan, jadi dipecah per partisi
+        months = pd.to_datetime(ts, unit='s').strftime('%Y-%m').to_numpy()
+        run_tag = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        for partition in np.unique(months):
+            mask = months == partition
+            segment = self._write_segment(partition, f'seg-{run_tag}',
+                                          key[mask], ts[mask], price[mask], rating[mask])
+            self.manifest['segments'].append(segment)
+        self._save_manifest()
+        if self.auto_compact:
+            self.compact()
+        return int(len(df))
+
+    def partitions(self):
+        return sorted({segment['partition'] for segment in self.manifest['segments']})
+
+    def compact(self, partition=None):
+        """
+        Gabungkan semua segment dalam partisi menjadi satu segment
+
+        Tanpa argumen, semua partisi kecuali bulan berjalan dikompaksi.
+        """
+        if partition is None:
+            current = datetime.now().strftime('%Y-%m')
+            targets = [p for p in self.partitions() if p != current]
+        else:
+            targets = [partition]
+
+        for target in targets:
+            segments = [s for s in self.manifest['segments'] if s['partition'] == target]
+            if len(segments) < 2:
+                continue
+            loaded = [self._load_segment(s) for s in segments]
+            merged = {column: np.concatenate([data[column] for data in loaded]) for column in HISTORY_COLUMNS}
+            del loaded
+            name = f"compact-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+            compacted = self._write_segment(target, name, merged['key'], merged['ts'],
+                                            merged['Price'], merged['Rating'])
+            self.manifest['segments'] = [s for s in self.manifest['segments'] if s['partition'] != target]
+            self.manifest['segments'].append(compacted)
+            self._save_manifest()
+            for segment in segments:
+                self._remove_segment(segment)
+
+    def series(self, key, start=None, end=None):
+        """
+        Deret waktu Price/Rating untuk satu produk
+
+        Segment di luar [start, end] atau yang bloom filter-nya tidak memuat
+        key dilewati tanpa dibaca; di segment lain hanya baris key itu yang
+        dibaca. Return DataFrame (timestamp, Price, Rating).
+        """
+        key = np.uint64(key)
+        probe = np.array([key], dtype=np.uint64)
+        start_ts = _to_epoch(start) if start is not None else None
+        end_ts = _to_epoch(end) if end is not None else None
+
+        parts = []
+        for segment in self.manifest['segments']:
+            if start_ts is not None and segment['max_ts'] < start_ts:
+                continue
+            if end_ts is not None and segment['min_ts'] > end_ts:
+                continue
+            if not self._may_contain(segment, probe)[0]:
+                continue
+            data = self._load_segment(segment)
+            lo = np.searchsorted(data['key'], key, side='left')
+            hi = np.searchsorted(data['key'], key, side='right')
+            if lo == hi:
+                continue
+            rows = slice(lo, hi)
+            parts.append((np.array(data['ts'][rows]), np.array(data['Price'][rows]),
+                          np.array(data['Rating'][rows])))
+
+        if not parts:
+            return pd.DataFrame({'timestamp': pd.Series(dtype='datetime64[ns]'),
+                                 'Price': pd.Series(dtype='float64'), 'Rating': pd.Series(dtype='float64')})
+        ts = np.concatenate([p[0] for p in parts])
+        price = np.concatenate([p[1] for p in parts])
+        rating = np.concatenate([p[2] for p in parts])
+        keep = np.ones(len(ts), dtype=bool)
+        if start_ts is not None:
+            keep &= ts >= start_ts
+        if end_ts is not None:
+            keep &= ts <= end_ts
+        order = np.argsort(ts[keep], kind='stable')
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(ts[keep][order], unit='s'),
+            'Price': price[keep][order],
+            'Rating': rating[keep][order],
+        })
+
+    def as_of(self, when, keys=None, window=None):
+        """
+        Nilai Price/Rating terakhir per produk pada waktu <= when
+
+        keys membatasi produk yang dicari: segment yang bloom filter-nya tidak
+        memuat satu pun key dilewati, dan dari segment lain hanya baris key
+        itu yang dibaca. Segment dibaca dari yang terbaru dan pencarian
+        berhenti begitu semua key sudah punya nilai yang tidak mungkin
+        dikalahkan segment yang lebih lama. window (detik) membatasi seberapa
+        jauh ke belakang observasi masih dianggap valid; tanpa keys dan window,
+        semua segment sampai when dibaca.
+        Return DataFrame (key, timestamp, Price, Rating).
+        """
+        when_ts = _to_epoch(when)
+        floor_ts = when_ts - int(window) if window is not None else None
+        wanted = np.unique(np.asarray(keys, dtype=np.uint64)) if keys is not None else None
+
+        candidates = [s for s in self.manifest['segments']
+                      if s['min_ts'] <= when_ts and (floor_ts is None or s['max_ts'] >= floor_ts)]
+        candidates.sort(key=lambda s: min(s['max_ts'], when_ts), reverse=True)
+
+        best = (np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64),
+                np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.float64))
+        for segment in candidates:
+            if wanted is not None and len(best[0]) == len(wanted) \
+                    and best[1].min() >= min(segment['max_ts'], when_ts):
+                break
+            if wanted is not None:
+                probe = wanted[self._may_contain(segment, wanted)]
+                if not len(probe):
+                    continue
+            data = self._load_segment(segment)
+            if wanted is not None:
+                rows = _key_rows(data['key'], probe)
+                columns = [np.asarray(data[column][rows]) for column in HISTORY_COLUMNS]
+            else:
+                columns = [np.asarray(data[column]) for column in HISTORY_COLUMNS]
+            key, ts, price, rating = columns
+            mask = ts <= when_ts
+            if floor_ts is not None:
+                mask &= ts >= floor_ts
+            if not mask.any():
+                continue
+            latest = _latest_per_key(key[mask], ts[mask], price[mask], rating[mask])
+            # Gabung dengan hasil segment sebelumnya: tetap observasi terbaru per key
+            best = _latest_per_key(*(np.concatenate(pair) for pair in zip(best, latest)))
+
+        keys_out, ts_out, price_out, rating_out = best
+        return pd.DataFrame({
+            'key': keys_out,
+            'timestamp': pd.to_datetime(ts_out, unit='s'),
+            'Price': price_out,
+            'Rating': rating_out,
+        })
+
+
+def append_history(df, root='price_history'):
+    """
+    Append Price/Rating run ini ke history store
+    """
+    try:
+        rows = PriceHistory(root).append(df)
+        logger.info("Price history updated in %s: %d observations", root, rows)
+        return True
+    except Exception as e:
+        logger.error("Error updating price history: %s", e)
+        return False
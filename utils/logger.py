@@ -0,0 +1,122 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from collections import Counter
+
+# Atribut bawaan LogRecord; atribut lain (dari extra=...) ikut ditulis sebagai field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+TEXT_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+_listener = None
+
+
+def get_logger(name):
+    """Logger untuk satu modul (pakai __name__)"""
+    return logging.getLogger(name)
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu baris JSON per log record; field dari extra=... ikut disertakan"""
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(level=None, fmt=None, log_file=None):
+    """
+    Konfigurasi logging pipeline: root logger -> QueueHandler -> QueueListener
+
+    Record hanya dimasukkan ke queue di thread pipeline; format dan I/O ke
+    stdout/file dikerjakan thread listener, sehingga logging tidak pernah
+    memblok pipeline. level/fmt default dari env ETL_LOG_LEVEL (INFO) dan
+    ETL_LOG_FORMAT ("text" atau "json"). Aman dipanggil berulang kali.
+    """
+    global _listener
+
+    level = (level or os.environ.get('ETL_LOG_LEVEL', 'INFO')).upper()
+    fmt = (fmt or os.environ.get('ETL_LOG_FORMAT', 'text')).lower()
+    formatter = JsonFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT)
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    shutdown_logging()
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush record yang tersisa di queue lalu hentikan listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+class ErrorAggregator:
+    """
+    Kumpulkan error berulang (mis. per product card) lalu log sekali
+
+    Daripada satu baris log per card yang rusak, error dihitung per jenis
+    dan dilaporkan dalam satu record saat flush() (per halaman).
+    """
+
+    def __init__(self, logger, context=None, level=logging.WARNING, max_kinds=5):
+        self.logger = logger
+        self.context = context or {}
+        self.level = level
+        self.max_kinds = max_kinds
+        self.counts = Counter()
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def add(self, error):
+        self.counts[f"{type(error).__name__}: {error}"] += 1
+
+    def flush(self, message='errors'):
+        """Log ringkasan error (jika ada) lalu reset counter, return jumlah error"""
+        total = len(self)
+        if total:
+            kinds = ', '.join(f"{kind} x{count}" for kind, count in self.counts.most_common(self.max_kinds))
+            extra = len(self.counts) - self.max_kinds
+            if extra > 0:
+                kinds += f", +{extra} more"
+            context = ' '.join(f"{key}={value}" for key, value in self.context.items())
+            self.logger.log(self.level, "%s %d %s (%s)", context, total, message, kinds,
+                            extra={**self.context, 'error_count': total})
+            self.counts.clear()
+        return total
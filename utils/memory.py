@@ -0,0 +1,213 @@
+import functools
+import os
+import re
+import sys
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Batas parameter bind PostgreSQL per statement; to_sql(method='multi') memakai
+# satu parameter per sel sehingga chunksize * jumlah kolom tidak boleh melebihinya
+POSTGRES_MAX_PARAMS = 65535
+
+# Ukuran minimum per stage (dibatasi ukuran default stage): di bawah ini
+# overhead per batch lebih mahal daripada memori yang dihemat
+STAGE_MINIMUMS = {'extract': 1, 'transform': 1000, 'load': 100}
+
+_SIZE_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3, 't': 1024 ** 4}
+
+
+def parse_size(spec):
+    """'512M', '1.5G', '2GB', 1048576 -> byte (None tetap None)"""
+    if spec is None:
+        return spec
+    if isinstance(spec, int):
+        size = spec
+    else:
+        match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*', str(spec).lower())
+        if not match:
+            raise ValueError(f"Invalid memory size: {spec!r}")
+        size = int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+    if size <= 0:
+        raise ValueError(f"Memory size must be positive: {spec!r}")
+    return size
+
+
+@functools.lru_cache(maxsize=None)
+def _rss_reader():
+    """Pilih sumber RSS sekali: psutil -> /proc/self/statm -> resource (peak)"""
+    try:
+        import psutil
+
+        process = psutil.Process()
+        return lambda: process.memory_info().rss
+    except ImportError:
+        pass
+
+    if os.path.exists('/proc/self/statm'):
+        page_size = os.sysconf('SC_PAGE_SIZE')
+
+        def read_statm():
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * page_size
+        return read_statm
+
+    import resource
+
+    # ru_maxrss adalah peak (bukan RSS saat ini): KB di Linux, byte di macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def current_rss():
+    """Resident set size proses saat ini dalam byte"""
+    return _rss_reader()()
+
+
+def estimate_row_bytes(df, sample=1000):
+    """Perkiraan memori per baris DataFrame (deep, dari sampel baris pertama)"""
+    if len(df) == 0:
+        return 0
+    head = df.head(sample)
+    return int(head.memory_usage(index=False, deep=True).sum() / len(head)) or 1
+
+
+class MemoryGovernor:
+    """
+    Atur ukuran batch/chunk per stage supaya RSS tetap di bawah budget
+
+    Ukuran awal dihitung dari headroom (budget - RSS) dibagi perkiraan memori
+    per item; setelah tiap batch, adapt() mengecilkan ukuran jika RSS melewati
+    high_water * budget dan membesarkannya (maksimal growth kali, dibatasi
+    headroom) selama masih di bawah. Tanpa budget governor hanya mencatat
+    ukuran default sehingga perilaku pipeline tidak berubah.
+    """
+
+    def __init__(self, budget=None, high_water=0.85, growth=1.5, overhead=4.0, rss_reader=None):
+        self.budget = parse_size(budget)
+        self.high_water = high_water
+        self.growth = growth
+        # Faktor memori sementara (copy, encoding, parameter bind) per byte data
+        self.overhead = overhead
+        self._rss = rss_reader or current_rss
+        self.peak_rss = 0
+        self.stages = {}
+        self._warned = False
+        if self.budget:
+            self._check_baseline(self.rss())
+
+    def rss(self):
+        rss = self._rss()
+        self.peak_rss = max(self.peak_rss, rss)
+        return rss
+
+    def _limit(self):
+        return int(self.budget * self.high_water)
+
+    def _check_baseline(self, rss):
+        """Peringatan sekali jika RSS sudah di atas budget: stage berjalan di ukuran minimumnya"""
+        if rss > self._limit() and not self._warned:
+            self._warned = True
+            logger.warning("Memory budget %.0f MB (high water %.0f MB) is below current RSS %.0f MB; "
+                           "stages will run at their minimum sizes", self.budget / 1024 ** 2,
+                           self._limit() / 1024 ** 2, rss / 1024 ** 2)
+
+    def _headroom_items(self, item_bytes):
+        headroom = max(0, self._limit() - self.rss())
+        return headroom // max(1, int(item_bytes * self.overhead))
+
+    def initial_size(self, stage, default, item_bytes=None, minimum=None, maximum=None):
+        """
+        Ukuran awal untuk stage (mis. 'extract', 'transform', 'load')
+
+        minimum default STAGE_MINIMUMS (tidak lebih dari default), jadi RSS
+        di atas budget tidak membuat batch menyusut sampai 1 baris.
+        """
+        if minimum is None:
+            minimum = max(1, min(STAGE_MINIMUMS.get(stage, 1), default))
+        size = default
+        if self.budget:
+            self._check_baseline(self.rss())
+        if self.budget and item_bytes:
+            size = self._headroom_items(item_bytes)
+        size = self._clamp(size, minimum, maximum)
+        self.stages[stage] = {
+            'size': size, 'initial': size, 'min': minimum, 'max': maximum,
+            'item_bytes': item_bytes, 'adjustments': 0,
+        }
+        logger.debug("Memory governor: %s size %d", stage, size)
+        return size
+
+    def adapt(self, stage, item_bytes=None):
+        """Sesuaikan ukuran stage setelah satu batch selesai, return ukuran baru"""
+        state = self.stages[stage]
+        size = state['size']
+        if not self.budget:
+            return size
+
+        if item_bytes:
+            state['item_bytes'] = item_bytes
+        rss = self.rss()
+        if rss > self._limit():
+            new_size = size // 2
+        else:
+            new_size = int(size * self.growth) + 1
+            if state['item_bytes']:
+                new_size = min(new_size, self._headroom_items(state['item_bytes']))
+        new_size = self._clamp(new_size, state['min'], state['max'])
+        if new_size != size:
+            state['size'] = new_size
+            state['adjustments'] += 1
+            logger.debug("Memory governor: %s size %d -> %d (RSS %.0f MB)", stage, size, new_size,
+                         rss / 1024 ** 2)
+        return new_size
+
+    def size(self, stage):
+        return self.stages[stage]['size']
+
+    @staticmethod
+    def _clamp(size, minimum, maximum):
+        size = max(minimum, int(size))
+        return min(size, maximum) if maximum else size
+
+    def report(self):
+        """Ringkasan untuk run report: budget, peak RSS dan ukuran per stage"""
+        self.rss()
+        return {
+            'budget_mb': round(self.budget / 1024 ** 2, 1) if self.budget else None,
+            'peak_rss_mb': round(self.peak_rss / 1024 ** 2, 1),
+            'sizes': {stage: {key: state[key] for key in ('initial', 'size', 'adjustments')}
+                      for stage, state in self.stages.items()},
+        }
+
+
+def load_chunksize(df, governor=None, default=1000):
+    """
+    Chunksize to_sql(method='multi') untuk df
+
+    Dibatasi batas parameter PostgreSQL; dengan governor ukurannya mengikuti
+    budget memori (stage 'load').
+    """
+    maximum = max(1, POSTGRES_MAX_PARAMS // max(1, len(df.columns)))
+    if governor is None:
+        return min(default, maximum)
+    return governor.initial_size('load', default, item_bytes=estimate_row_bytes(df), maximum=maximum)
+
+
+def load_slices(total, chunksize, governor=None):
+    """
+    slice baris per chunk load untuk total baris
+
+    Dengan governor (stage 'load' dari load_chunksize) ukuran chunk berikutnya
+    di-adapt setelah setiap chunk selesai diproses, jadi RSS diukur selama
+    load berjalan, bukan hanya sekali sebelum load.
+    """
+    adaptive = governor is not None and 'load' in governor.stages
+    size = governor.size('load') if adaptive else chunksize
+    start = 0
+    while start < total:
+        yield slice(start, start + size)
+        start += size
+        if adaptive:
+            size = governor.adapt('load')
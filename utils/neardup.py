@@ -0,0 +1,223 @@
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Judul dibandingkan secara fuzzy (MinHash); atribut harus sama persis
+NEAR_DUP_TEXT_COLUMN = 'Title'
+NEAR_DUP_EXACT_COLUMNS = ['Size', 'Gender']
+
+# Bilangan prima Mersenne 2^61 - 1 untuk universal hashing (a*x + b) mod p
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_NON_WORD = re.compile(r'[^0-9a-z]+')
+_DIGITS = re.compile(r'\d+')
+
+
+def normalize_text(value):
+    """Lowercase, buang tanda baca, rapikan spasi: 'T-Shirt 2 ' -> 't shirt 2'"""
+    return _NON_WORD.sub(' ', str(value).lower()).strip()
+
+
+def shingle_hashes(text, ngram=3):
+    """Hash crc32 dari character n-gram (set, tanpa duplikat)"""
+    if len(text) <= ngram:
+        grams = {text}
+    else:
+        grams = {text[i:i + ngram] for i in range(len(text) - ngram + 1)}
+    return [zlib.crc32(gram.encode('utf-8')) for gram in grams]
+
+
+def choose_bands(num_perm, threshold):
+    """
+    Pilih (bands, rows) dengan bands * rows == num_perm
+
+    Titik belok kurva LSH ada di (1 / bands) ** (1 / rows); dipilih yang
+    paling dekat dengan threshold, sedikit di bawahnya (recall lebih penting,
+    false positive disaring ulang dengan estimasi Jaccard).
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        knee = (1.0 / bands) ** (1.0 / rows)
+        score = abs(knee - (threshold - 0.05))
+        if best is None or score < best[0]:
+            best = (score, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    """
+    MinHash signature tervektorisasi (numpy) untuk banyak dokumen sekaligus
+
+    Semua shingle hash digabung dalam satu array dengan offset per dokumen,
+    lalu minimum per dokumen dihitung dengan np.minimum.reduceat per blok.
+    """
+
+    def __init__(self, num_perm=64, ngram=3, seed=1):
+        self.num_perm = num_perm
+        self.ngram = ngram
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, int(_MERSENNE_PRIME), num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(_MERSENNE_PRIME), num_perm, dtype=np.uint64)
+
+    def signatures(self, texts, block_shingles=100_000):
+        """Return array uint32 (n_docs, num_perm)"""
+        hashes = []
+        lengths = np.empty(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            row = shingle_hashes(text, self.ngram)
+            hashes.extend(row)
+            lengths[i] = len(row)
+        values = np.asarray(hashes, dtype=np.uint64)
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+        result = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        start_doc = 0
+        while start_doc < len(texts):
+            # Blok dokumen dibatasi jumlah shingle supaya memori matriks hash terkendali
+            end_doc = int(np.searchsorted(offsets, offsets[start_doc] + block_shingles, side='right')) - 1
+            end_doc = min(max(end_doc, start_doc + 1), len(texts))
+            lo, hi = offsets[start_doc], offsets[end_doc]
+            block = values[lo:hi]
+            # (a*x + b) mod p, dipotong ke 32 bit; overflow uint64 dibiarkan (wrap-around)
+            # karena hanya butuh keluarga hash acak yang deterministik
+            permuted = ((self.a[:, None] * block[None, :] + self.b[:, None]) % _MERSENNE_PRIME) & _MAX_HASH
+            local_offsets = (offsets[start_doc:end_doc] - lo).astype(np.int64)
+            result[start_doc:end_doc] = np.minimum.reduceat(permuted, local_offsets, axis=1).T
+            start_doc = end_doc
+        return result
+
+
+class UnionFind:
+    """Disjoint set di atas array numpy (path halving + union by size)"""
+
+    def __init__(self, n):
+        self.parent = np.arange(n, dtype=np.int64)
+        self.size = np.ones(n, dtype=np.int64)
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x, y):
+        root_x, root_y = self.find(x), self.find(y)
+        if root_x == root_y:
+            return False
+        if self.size[root_x] < self.size[root_y]:
+            root_x, root_y = root_y, root_x
+        self.parent[root_y] = root_x
+        self.size[root_x] += self.size[root_y]
+        return True
+
+    def labels(self):
+        return np.array([self.find(i) for i in range(len(self.parent))], dtype=np.int64)
+
+
+def find_near_duplicates(df, text_column=None, exact_columns=None, threshold=0.8, num_perm=64, ngram=3,
+                         seed=1, max_bucket=50):
+    """
+    Cari cluster near-duplicate dengan MinHash + LSH banding
+
+    Judul dinormalisasi lalu di-MinHash; atribut (exact_columns) dan angka di
+    judul ("T-shirt 2" vs "T-shirt 3") ikut menjadi bagian key bucket, jadi
+    hanya baris dengan atribut dan angka yang sama yang bisa digabung.
+    Kandidat dalam bucket diverifikasi dengan estimasi Jaccard (fraksi
+    signature yang sama) >= threshold lalu digabung lewat union-find. Bucket
+    besar (> max_bucket) hanya dibandingkan ke anggota pertamanya sehingga
+    tidak pernah ada perbandingan all-pairs.
+    Return array label cluster per baris (label = posisi baris pertama di cluster).
+    """
+    text_column = text_column or NEAR_DUP_TEXT_COLUMN
+    exact_columns = NEAR_DUP_EXACT_COLUMNS if exact_columns is None else exact_columns
+    n = len(df)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    titles = df[text_column].map(normalize_text)
+    group = titles.map(lambda text: ' '.join(_DIGITS.findall(text)))
+    for col in exact_columns:
+        group = group + '\x1f' + df[col].map(normalize_text)
+    # Kombinasi (judul, grup) identik cukup di-hash sekali
+    codes, uniques = pd.factorize(titles + '\x1e' + group)
+    unique_titles = [value.split('\x1e', 1)[0] for value in uniques]
+    group_codes = pd.factorize(pd.Index(uniques).str.split('\x1e').str[1])[0].astype(np.uint32)
+    signatures = MinHasher(num_perm, ngram, seed).signatures(unique_titles)
+
+    bands, rows = choose_bands(num_perm, threshold)
+    union_find = UnionFind(len(uniques))
+    min_agree = int(np.ceil(threshold * num_perm))
+    compared = 0
+    for band in range(bands):
+        band_values = np.column_stack([signatures[:, band * rows:(band + 1) * rows], group_codes])
+        keys = band_values.view(np.dtype((np.void, band_values.dtype.itemsize * (rows + 1)))).ravel()
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        for bucket in np.split(order, boundaries):
+            if len(bucket) < 2:
+                continue
+            if len(bucket) <= max_bucket:
+                pairs = [(bucket[i], bucket[j]) for i in range(len(bucket)) for j in range(i + 1, len(bucket))]
+            else:
+                pairs = [(bucket[0], other) for other in bucket[1:]]
+            for left, right in pairs:
+                if union_find.find(left) == union_find.find(right):
+                    continue
+                compared += 1
+                if np.count_nonzero(signatures[left] == signatures[right]) >= min_agree:
+                    union_find.union(left, right)
+
+    logger.debug("Near-duplicate LSH: %d unique titles, %d bands x %d rows, %d candidate pairs verified",
+                 len(uniques), bands, rows, compared)
+
+    # Label per teks unik -> label per baris; label = baris pertama di cluster
+    row_labels = union_find.labels()[codes]
+    return pd.Series(np.arange(n)).groupby(row_labels).transform('min').to_numpy()
+
+
+def near_duplicate_report(df, labels, text_column=None):
+    """Ringkasan cluster berukuran > 1: judul yang disimpan, jumlah anggota, judul yang digabung"""
+    text_column = text_column or NEAR_DUP_TEXT_COLUMN
+    counts = np.bincount(labels, minlength=len(df))
+    mask = counts[labels] > 1
+    if not mask.any():
+        return pd.DataFrame(columns=['cluster', 'size', 'kept_title', 'merged_titles'])
+
+    members = df[text_column].iloc[mask].astype(str).groupby(labels[mask])
+    report = pd.DataFrame({
+        'cluster': list(members.groups.keys()),
+        'size': members.size().to_numpy(),
+        'kept_title': members.first().to_numpy(),
+        'merged_titles': members.agg(lambda titles: ' | '.join(titles.iloc[1:])).to_numpy(),
+    })
+    return report.sort_values('size', ascending=False, kind='stable', ignore_index=True)
+
+
+def drop_near_duplicates(df, threshold=0.8, report_path=None, **kwargs):
+    """
+    Buang near-duplicate, simpan baris pertama dari setiap cluster
+
+    kwargs diteruskan ke find_near_duplicates (text_column, exact_columns,
+    num_perm, ...). Return (df tanpa near-duplicate, report cluster); report
+    ditulis ke report_path (CSV) jika diberikan.
+    """
+    labels = find_near_duplicates(df, threshold=threshold, **kwargs)
+    keep = labels == np.arange(len(df))
+    report = near_duplicate_report(df, labels, kwargs.get('text_column'))
+    if report_path:
+        report.to_csv(report_path, index=False, encoding='utf-8')
+    logger.info("Near-duplicate dedup: %d rows merged into %d clusters (threshold=%.2f)",
+                int((~keep).sum()), len(report), threshold)
+    return df[keep].reset_index(drop=True), report
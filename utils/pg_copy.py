@@ -0,0 +1,250 @@
+import io
+import re
+import struct
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_logger
+from utils.memory import load_slices
+from utils.pg_schema import PG_COLUMNS, column_list, quote_ident
+
+logger = get_logger(__name__)
+
+# Format COPY binary PostgreSQL: signature, flags, panjang header extension
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+PGCOPY_TRAILER = struct.pack('!h', -1)
+# Epoch tipe date/timestamp PostgreSQL
+PG_EPOCH_DAY = np.datetime64('2000-01-01', 'D')
+PG_EPOCH_US = np.datetime64('2000-01-01T00:00:00', 'us')
+
+COPY_BATCH_ROWS = 50000
+COPY_READ_SIZE = 1 << 20
+
+# Tipe SQL -> (kind, dtype big-endian untuk tipe fixed-width)
+_FIXED_TYPES = {
+    'DOUBLE PRECISION': ('float', '>f8'),
+    'FLOAT8': ('float', '>f8'),
+    'REAL': ('float', '>f4'),
+    'FLOAT4': ('float', '>f4'),
+    'BIGINT': ('int', '>i8'),
+    'INT8': ('int', '>i8'),
+    'INTEGER': ('int', '>i4'),
+    'INT': ('int', '>i4'),
+    'INT4': ('int', '>i4'),
+    'SMALLINT': ('int', '>i2'),
+    'DATE': ('date', '>i4'),
+    'TIMESTAMP': ('timestamp', '>i8'),
+}
+_TEXT_TYPE = re.compile(r'^(TEXT|(VAR)?CHAR(ACTER)?( VARYING)?(\(\d+\))?)$')
+
+
+class UnsupportedCopyType(TypeError):
+    """Kolom/nilai tidak bisa di-encode binary; pemanggil fallback ke COPY text"""
+
+
+def column_codec(sql_type):
+    """Tipe kolom PG_COLUMNS -> (kind, dtype), None jika tidak didukung encoder binary"""
+    sql_type = sql_type.upper().replace('NOT NULL', '').strip()
+    if sql_type in _FIXED_TYPES:
+        return _FIXED_TYPES[sql_type]
+    if _TEXT_TYPE.match(sql_type):
+        return ('text', None)
+    return None
+
+
+def _encode_fixed(series, kind, dtype):
+    """Series -> (bytes per baris (n, width) uint8, mask NULL)"""
+    if kind == 'float':
+        try:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        except (TypeError, ValueError) as e:
+            raise UnsupportedCopyType(f"{series.name}: {e}")
+        nulls = np.isnan(values)
+    elif kind == 'int':
+        nulls = series.isna().to_numpy()
+        try:
+            if series.dtype.kind in 'iu':
+                values = series.to_numpy(dtype=np.int64, na_value=0)
+            else:
+                floats = series.to_numpy(dtype=np.float64, na_value=0)
+                if (floats != np.round(floats)).any():
+                    raise ValueError("non-integer values")
+                values = floats.astype(np.int64)
+        except (TypeError, ValueError) as e:
+            raise UnsupportedCopyType(f"{series.name}: {e}")
+        info = np.iinfo(np.dtype(dtype))
+        if values.min(initial=0) < info.min or values.max(initial=0) > info.max:
+            raise UnsupportedCopyType(f"{series.name}: values do not fit {dtype}")
+    else:
+        stamps = pd.to_datetime(series, errors='coerce', format='mixed')
+        if getattr(stamps.dt, 'tz', None) is not None:
+            raise UnsupportedCopyType(f"{series.name}: timezone-aware values need TIMESTAMPTZ")
+        nulls = stamps.isna().to_numpy()
+        # Nilai yang gagal di-parse jangan diam-diam jadi NULL: biar PostgreSQL yang menolak lewat COPY text
+        if (nulls & series.notna().to_numpy()).any():
+            raise UnsupportedCopyType(f"{series.name}: values that are not valid dates/timestamps")
+        if kind == 'date':
+            values = (stamps.to_numpy('datetime64[D]') - PG_EPOCH_DAY).astype(np.int64)
+        else:
+            values = (stamps.to_numpy('datetime64[us]') - PG_EPOCH_US).astype(np.int64)
+        values[nulls] = 0
+    packed = np.ascontiguousarray(values.astype(dtype))
+    return packed.view(np.uint8).reshape(len(series), packed.itemsize), nulls
+
+
+def _encode_text(series):
+    """Series -> (blob uint8 semua nilai non-NULL, panjang per baris, mask NULL)"""
+    nulls = series.isna().to_numpy()
+    encoded = [str(value).encode('utf-8') for value in series.to_numpy()[~nulls]]
+    lengths = np.zeros(len(series), dtype=np.int64)
+    lengths[~nulls] = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), lengths, nulls
+
+
+class BinaryCopyEncoder:
+    """
+    Encoder COPY ... (FORMAT binary) per batch DataFrame
+
+    Ukuran setiap field dihitung dulu sebagai array, offset baris/field dari
+    cumsum, lalu header panjang dan data setiap kolom ditulis ke buffer
+    dengan scatter numpy (big-endian via astype). Buffer bytearray dipakai
+    ulang antar batch (hanya diganti jika perlu lebih besar), hasil encode
+    berupa memoryview ke buffer itu.
+    """
+
+    def __init__(self, columns=PG_COLUMNS):
+        self.columns = dict(columns)
+        self.codecs = {}
+        for name, sql_type in self.columns.items():
+            codec = column_codec(sql_type)
+            if codec is None:
+                raise UnsupportedCopyType(f"{name}: no binary encoder for {sql_type}")
+            self.codecs[name] = codec
+        self._buffer = bytearray()
+
+    def _reserve(self, size):
+        if len(self._buffer) < size:
+            # Buffer baru (bukan resize): memoryview batch sebelumnya tetap valid
+            self._buffer = bytearray(max(size, len(self._buffer) * 2))
+        return np.frombuffer(self._buffer, dtype=np.uint8, count=size)
+
+    def encode_fixed(self, df):
+        """Encode semua kolom fixed-width sekaligus: {kolom: (bytes, mask NULL)}; raise UnsupportedCopyType"""
+        return {name: _encode_fixed(df[name], kind, dtype)
+                for name, (kind, dtype) in self.codecs.items() if kind != 'text'}
+
+    def encode(self, df, fixed=None):
+        """
+        Encode baris DataFrame (tanpa header/trailer), return memoryview
+
+        fixed: hasil encode_fixed untuk baris yang sama (None = di-encode di sini)
+        """
+        n = len(df)
+        fixed = self.encode_fixed(df) if fixed is None else fixed
+        fields = []
+        sizes = np.full(n, 2, dtype=np.int64)
+        for name, (kind, dtype) in self.codecs.items():
+            if kind == 'text':
+                blob, lengths, nulls = _encode_text(df[name])
+                fields.append((blob, lengths, nulls, None))
+            else:
+                data, nulls = fixed[name]
+                lengths = np.where(nulls, 0, data.shape[1])
+                fields.append((data, lengths, nulls, data.shape[1]))
+            sizes += 4 + lengths
+
+        ends = np.cumsum(sizes)
+        total = int(ends[-1]) if n else 0
+        buffer = self._reserve(total)
+        cursor = ends - sizes
+        buffer[cursor[:, None] + np.arange(2)] = np.frombuffer(struct.pack('!h', len(fields)), dtype=np.uint8)
+        cursor += 2
+
+        for data, lengths, nulls, width in fields:
+            headers = np.where(nulls, -1, lengths).astype('>i4').view(np.uint8).reshape(n, 4)
+            buffer[cursor[:, None] + np.arange(4)] = headers
+            cursor += 4
+            present = ~nulls
+            if width is not None:
+                buffer[cursor[present][:, None] + np.arange(width)] = data[present]
+            elif len(data):
+                # Posisi tujuan setiap byte teks: awal field baris + offset dalam nilai
+                starts = np.cumsum(lengths) - lengths
+                buffer[np.repeat(cursor - starts, lengths) + np.arange(len(data))] = data
+            cursor += lengths
+        return memoryview(self._buffer)[:total]
+
+    def iter_chunks(self, df, batch_rows=COPY_BATCH_ROWS, governor=None):
+        """
+        Header, memoryview per batch baris, trailer
+
+        Kolom fixed-width seluruh frame di-encode saat dipanggil (bukan saat
+        iterasi), jadi nilai yang tidak didukung di batch mana pun sudah
+        raise UnsupportedCopyType sebelum byte pertama dikirim ke COPY.
+        Dengan governor ukuran batch mengikuti stage 'load' (lihat load_slices).
+        """
+        fixed = self.encode_fixed(df)
+        return self._chunks(df, fixed, batch_rows, governor)
+
+    def _chunks(self, df, fixed, batch_rows, governor):
+        yield memoryview(PGCOPY_HEADER)
+        for rows in load_slices(len(df), batch_rows, governor):
+            yield self.encode(df.iloc[rows], {name: (data[rows], nulls[rows])
+                                              for name, (data, nulls) in fixed.items()})
+        yield memoryview(PGCOPY_TRAILER)
+
+
+class _ChunkReader:
+    """File-like read() di atas iterator memoryview untuk cursor.copy_expert"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._current = memoryview(b'')
+
+    def read(self, size=-1):
+        while not len(self._current):
+            try:
+                self._current = next(self._chunks)
+            except StopIteration:
+                return b''
+        if size is None or size < 0:
+            size = len(self._current)
+        piece, self._current = self._current[:size], self._current[size:]
+        return bytes(piece)
+
+
+def copy_sql(table, columns, binary=True):
+    target = f'{quote_ident(table)} ({column_list(columns)})'
+    return f'COPY {target} FROM STDIN WITH (FORMAT {"binary" if binary else "csv"})'
+
+
+def copy_frame(connection, df, table, columns=PG_COLUMNS, batch_rows=None, governor=None):
+    """
+    COPY DataFrame ke tabel lewat koneksi DBAPI psycopg2
+
+    Memakai format binary; jika ada kolom/nilai yang tidak didukung encoder
+    (tipe di luar _FIXED_TYPES/teks, angka di luar range, timestamp ber-tz
+    atau tidak valid) di baris mana pun, seluruh frame dikirim sebagai COPY
+    text (CSV). Validasi selesai sebelum COPY dimulai, jadi stream binary
+    tidak pernah gagal di tengah. Return 'binary' atau 'text'.
+    """
+    columns = dict(columns)
+    df = df[list(columns)]
+    cursor = connection.cursor()
+    try:
+        try:
+            encoder = BinaryCopyEncoder(columns)
+            chunks = encoder.iter_chunks(df, batch_rows or COPY_BATCH_ROWS, governor)
+        except UnsupportedCopyType as e:
+            logger.warning("Binary COPY not possible (%s), falling back to text COPY", e)
+            text_buffer = io.StringIO()
+            df.to_csv(text_buffer, index=False, header=False)
+            text_buffer.seek(0)
+            cursor.copy_expert(copy_sql(table, columns, binary=False), text_buffer)
+            return 'text'
+        reader = _ChunkReader(chunks)
+        cursor.copy_expert(copy_sql(table, columns), reader, size=COPY_READ_SIZE)
+        return 'binary'
+    finally:
+        cursor.close()
@@ -0,0 +1,284 @@
+from datetime import date
+
+import pandas as pd
+
+from utils.dedup import KEY_COLUMNS, compute_row_hash
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Kolom tabel target beserta tipe PostgreSQL; product_hash = sha1 dari KEY_COLUMNS
+PG_COLUMNS = {
+    'product_hash': 'CHAR(40) NOT NULL',
+    'scrape_date': 'DATE NOT NULL',
+    'Title': 'TEXT NOT NULL',
+    'Price': 'DOUBLE PRECISION',
+    'Rating': 'REAL',
+    'Colors': 'INTEGER',
+    'Size': 'TEXT',
+    'Gender': 'TEXT',
+    'timestamp': 'TIMESTAMP',
+}
+PG_PRIMARY_KEY = ['product_hash', 'scrape_date']
+
+# Index sekunder (di tabel induk, otomatis ada di setiap partisi); index lokal
+# partisi yang di-load dibuang selama bulk load besar lalu dibangun ulang sekali
+PG_INDEXES = {
+    'gender_price': ['Gender', 'Price'],
+    'size': ['Size'],
+    'price': ['Price'],
+    'rating': ['Rating'],
+    'title': ['Title'],
+}
+
+# Di bawah jumlah baris ini index tetap dipelihara selama load (incremental kecil)
+DEFER_INDEXES_MIN_ROWS = 10000
+
+
+def quote_ident(name):
+    """Identifier PostgreSQL ber-quote (kolom seperti "Price" peka huruf besar)"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def column_list(columns):
+    """Daftar kolom ber-quote dipisah koma untuk INSERT/COPY/index"""
+    return ', '.join(quote_ident(col) for col in columns)
+
+
+def table_ddl(table):
+    """CREATE TABLE induk, dipartisi RANGE per scrape_date"""
+    columns = ',\n    '.join(f'{quote_ident(name)} {sql_type}' for name, sql_type in PG_COLUMNS.items())
+    return (
+        f'CREATE TABLE IF NOT EXISTS {quote_ident(table)} (\n'
+        f'    {columns},\n'
+        f'    PRIMARY KEY ({column_list(PG_PRIMARY_KEY)})\n'
+        f') PARTITION BY RANGE ("scrape_date")'
+    )
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_{month.year:04d}_{month.month:02d}'
+
+
+def partition_bounds(month):
+    """Rentang partisi [awal bulan, awal bulan berikutnya)"""
+    month = month_start(month)
+    return month, date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _bounds_sql(month):
+    start, end = partition_bounds(month)
+    return f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+
+
+def partition_ddl(table, month):
+    """Partisi bulanan [awal bulan, awal bulan berikutnya)"""
+    return (
+        f'CREATE TABLE IF NOT EXISTS {quote_ident(partition_name(table, month_start(month)))} '
+        f'PARTITION OF {quote_ident(table)} {_bounds_sql(month)}'
+    )
+
+
+def detach_partition_ddl(table, month):
+    return f'ALTER TABLE {quote_ident(table)} DETACH PARTITION {quote_ident(partition_name(table, month_start(month)))}'
+
+
+def attach_partition_ddl(table, month):
+    """Attach ulang partisi; index partisi yang definisinya sama otomatis di-attach ke index induk"""
+    return (
+        f'ALTER TABLE {quote_ident(table)} ATTACH PARTITION {quote_ident(partition_name(table, month_start(month)))} '
+        f'{_bounds_sql(month)}'
+    )
+
+
+def index_name(table, suffix):
+    return f'idx_{table}_{suffix}'
+
+
+def create_index_ddl(table):
+    """Index sekunder; di tabel induk otomatis dibuat juga di setiap partisi baru"""
+    return [f'CREATE INDEX IF NOT EXISTS {quote_ident(index_name(table, suffix))} '
+            f'ON {quote_ident(table)} ({column_list(columns)})'
+            for suffix, columns in PG_INDEXES.items()]
+
+
+def partition_index_ddl(table, month):
+    """Index sekunder lokal satu partisi (dibangun ulang setelah load besar ke partisi itu)"""
+    return create_index_ddl(partition_name(table, month_start(month)))
+
+
+def secondary_indexes(conn, relation):
+    """Nama index selain primary key milik satu tabel/partisi"""
+    from sqlalchemy import text
+
+    return conn.execute(text(
+        'SELECT i.relname FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid '
+        'JOIN pg_class t ON t.oid = x.indrelid '
+        'WHERE t.relname = :name AND pg_table_is_visible(t.oid) AND NOT x.indisprimary'
+    ), {'name': relation}).scalars().all()
+
+
+def upsert_sql(table, staging_table, where=None):
+    """INSERT dari tabel staging (opsional difilter where); baris dengan primary key yang sama ditimpa"""
+    columns = column_list(PG_COLUMNS)
+    updates = ', '.join(f'{quote_ident(col)} = EXCLUDED.{quote_ident(col)}'
+                        for col in PG_COLUMNS if col not in PG_PRIMARY_KEY)
+    casts = ', '.join(f'{quote_ident(col)}::{sql_type.replace(" NOT NULL", "")}'
+                      for col, sql_type in PG_COLUMNS.items())
+    return (
+        f'INSERT INTO {quote_ident(table)} ({columns}) '
+        f'SELECT {casts} FROM {quote_ident(staging_table)} '
+        f'{"WHERE " + where + " " if where else ""}'
+        f'ON CONFLICT ({column_list(PG_PRIMARY_KEY)}) DO UPDATE SET {updates}'
+    )
+
+
+def staging_ddl(staging_table):
+    """Tabel staging UNLOGGED bertipe sama dengan PG_COLUMNS (target COPY binary)"""
+    columns = ',\n    '.join(f'{quote_ident(name)} {sql_type.replace(" NOT NULL", "")}'
+                            for name, sql_type in PG_COLUMNS.items())
+    return [f'DROP TABLE IF EXISTS {quote_ident(staging_table)}',
+            f'CREATE UNLOGGED TABLE {quote_ident(staging_table)} (\n    {columns}\n)']
+
+
+def copy_supported(bind):
+    """COPY lewat cursor.copy_expert hanya tersedia di driver psycopg2"""
+    return getattr(bind.dialect, 'driver', None) == 'psycopg2'
+
+
+def copy_to_staging(conn, prepared, staging_table, chunksize=None, governor=None):
+    """Buat tabel staging lalu isi dengan COPY (binary, fallback text), return format"""
+    from sqlalchemy import text
+    from utils.pg_copy import copy_frame
+
+    for statement in staging_ddl(staging_table):
+        conn.execute(text(statement))
+    return copy_frame(conn.connection, prepared, staging_table, batch_rows=chunksize, governor=governor)
+
+
+def to_sql_chunked(df, table, con, if_exists='replace', chunksize=None, governor=None):
+    """
+    to_sql multi-row INSERT per chunk
+
+    Dengan governor ukuran chunk berikutnya di-adapt setelah setiap chunk
+    ditulis (lihat utils.memory.load_slices).
+    """
+    from utils.memory import load_chunksize, load_slices
+
+    if df.empty:
+        df.to_sql(table, con, if_exists=if_exists, index=False)
+        return
+    chunksize = chunksize or load_chunksize(df)
+    for number, rows in enumerate(load_slices(len(df), chunksize, governor)):
+        df.iloc[rows].to_sql(table, con, if_exists=if_exists if number == 0 else 'append', index=False,
+                             method='multi')
+
+
+def prepare_frame(df):
+    """
+    Tambahkan product_hash dan scrape_date, urutkan kolom sesuai PG_COLUMNS
+
+    scrape_date diambil dari timestamp (hari ini jika kosong/tidak valid).
+    Baris dengan primary key yang sama dalam satu batch: yang terakhir dipakai.
+    """
+    timestamps = pd.to_datetime(df['timestamp'], errors='coerce', format='mixed')
+    scrape_date = timestamps.dt.date.where(timestamps.notna(), date.today())
+    prepared = df.assign(product_hash=compute_row_hash(df, KEY_COLUMNS), scrape_date=scrape_date,
+                         timestamp=timestamps)
+    prepared = prepared[list(PG_COLUMNS)]
+    return prepared.drop_duplicates(PG_PRIMARY_KEY, keep='last').reset_index(drop=True)
+
+
+def ensure_schema(conn, table, months=()):
+    """
+    Buat tabel induk dan partisi bulanan yang dibutuhkan
+
+    Tabel lama hasil to_sql (tanpa partisi) di-rename ke {table}_legacy
+    supaya datanya tidak hilang.
+    """
+    from sqlalchemy import text
+
+    relkind = conn.execute(
+        text('SELECT c.relkind FROM pg_class c WHERE c.relname = :name AND pg_table_is_visible(c.oid)'),
+        {'name': table}
+    ).scalar()
+    if relkind == 'r':
+        legacy = f'{table}_legacy'
+        logger.warning("Table %s is not partitioned, renaming it to %s", table, legacy)
+        conn.execute(text(f'ALTER TABLE {quote_ident(table)} RENAME TO {quote_ident(legacy)}'))
+
+    conn.execute(text(table_ddl(table)))
+    # Index induk dibuat sebelum partisi supaya partisi baru langsung mendapat index lokalnya
+    for statement in create_index_ddl(table):
+        conn.execute(text(statement))
+    for month in sorted({month_start(day) for day in months}):
+        conn.execute(text(partition_ddl(table, month)))
+
+
+def bulk_load(engine, df, table='products', mode='replace', chunksize=None,
+              defer_indexes_min_rows=DEFER_INDEXES_MIN_ROWS, governor=None):
+    """
+    Load DataFrame bersih ke tabel berpartisi
+
+    Data ditulis dulu ke tabel staging (COPY binary lewat psycopg2, selain
+    itu to_sql multi-row INSERT), lalu dalam satu transaksi per partisi
+    bulan yang ada di batch: untuk load besar partisi di-detach dan index
+    lokalnya dibuang, INSERT ... ON CONFLICT dari staging langsung ke
+    partisi, index lokal dibangun ulang lalu partisi di-attach kembali
+    (index-nya otomatis terpasang ke index induk); terakhir ANALYZE
+    partisi. Partisi lain tidak disentuh. mode='replace' juga menghapus
+    baris pada scrape_date yang sama yang tidak ada di batch (snapshot hari
+    itu diganti); mode='append' hanya upsert.
+    Dengan governor (MemoryGovernor) ukuran batch staging di-adapt selama
+    load berjalan.
+    Return dict jumlah baris yang ditulis, format load staging
+    ('binary', 'text' atau 'multi') dan apakah index ditunda.
+    """
+    from sqlalchemy import text
+
+    if mode not in ('replace', 'append'):
+        raise ValueError(f"Unknown load mode: {mode!r}")
+
+    prepared = prepare_frame(df)
+    staging_table = f'{table}_staging'
+    load_format = 'multi'
+    use_copy = copy_supported(engine)
+    if not use_copy:
+        to_sql_chunked(prepared, staging_table, engine, chunksize=chunksize, governor=governor)
+
+    defer_indexes = len(prepared) >= defer_indexes_min_rows
+    with engine.begin() as conn:
+        if use_copy:
+            load_format = copy_to_staging(conn, prepared, staging_table, chunksize, governor)
+        months = sorted({month_start(day) for day in prepared['scrape_date'].unique()})
+        ensure_schema(conn, table, months)
+        for month in months:
+            partition = partition_name(table, month)
+            start, end = partition_bounds(month)
+            in_month = (f'"scrape_date"::DATE >= \'{start.isoformat()}\' '
+                        f'AND "scrape_date"::DATE < \'{end.isoformat()}\'')
+            if defer_indexes:
+                # Hanya partisi yang di-load: lepas dari induk supaya index lokalnya bisa dibuang
+                conn.execute(text(detach_partition_ddl(table, month)))
+                for index in secondary_indexes(conn, partition):
+                    conn.execute(text(f'DROP INDEX {quote_ident(index)}'))
+            if mode == 'replace':
+                conn.execute(text(
+                    f'DELETE FROM {quote_ident(partition)} AS t WHERE t."scrape_date" IN '
+                    f'(SELECT DISTINCT "scrape_date"::DATE FROM {quote_ident(staging_table)} WHERE {in_month}) '
+                    f'AND NOT EXISTS (SELECT 1 FROM {quote_ident(staging_table)} AS s '
+                    f'WHERE s."product_hash" = t."product_hash" AND s."scrape_date"::DATE = t."scrape_date")'
+                ))
+            conn.execute(text(upsert_sql(partition, staging_table, where=in_month)))
+            if defer_indexes:
+                for statement in partition_index_ddl(table, month):
+                    conn.execute(text(statement))
+                conn.execute(text(attach_partition_ddl(table, month)))
+            conn.execute(text(f'ANALYZE {quote_ident(partition)}'))
+        conn.execute(text(f'DROP TABLE {quote_ident(staging_table)}'))
+
+    return {'written': len(prepared), 'format': load_format, 'deferred_indexes': defer_indexes}
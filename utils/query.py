@@ -0,0 +1,80 @@
+import sqlite3
+
+import pandas as pd
+
+# Kolom yang boleh dipakai untuk ORDER BY (nama kolom tidak bisa di-bind sebagai parameter)
+_ORDER_COLUMNS = {'Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp'}
+
+
+def build_product_query(gender=None, size=None, min_price=None, max_price=None,
+                        min_rating=None, run_id=None, order_by=None, limit=None):
+    """
+    Bangun SQL + parameter untuk filter produk di embedded store
+
+    Semua nilai di-bind sebagai parameter, tidak pernah di-format ke SQL.
+    """
+    clauses = []
+    params = []
+    if run_id is not None:
+        clauses.append('run_id = ?')
+        params.append(run_id)
+    if gender is not None:
+        clauses.append('"Gender" = ?')
+        params.append(gender)
+    if size is not None:
+        clauses.append('"Size" = ?')
+        params.append(size)
+    if min_price is not None:
+        clauses.append('"Price" >= ?')
+        params.append(float(min_price))
+    if max_price is not None:
+        clauses.append('"Price" <= ?')
+        params.append(float(max_price))
+    if min_rating is not None:
+        clauses.append('"Rating" >= ?')
+        params.append(float(min_rating))
+
+    sql = 'SELECT "Title", "Price", "Rating", "Colors", "Size", "Gender", "timestamp", run_id FROM products'
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    if order_by is not None:
+        descending = order_by.startswith('-')
+        column = order_by.lstrip('-')
+        if column not in _ORDER_COLUMNS:
+            raise ValueError(f"Cannot order by column: {column}")
+        sql += f' ORDER BY "{column}"' + (' DESC' if descending else '')
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(int(limit))
+    return sql, params
+
+
+def query_products(path='products.db', run_id='latest', **filters):
+    """
+    Query produk dari embedded store, return DataFrame
+
+    run_id='latest' (default) hanya membaca run terakhir, None membaca semua run.
+    Filter: gender, size, min_price, max_price, min_rating, order_by ('-Price'), limit.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        if run_id == 'latest':
+            row = conn.execute('SELECT run_id FROM runs ORDER BY loaded_at DESC LIMIT 1').fetchone()
+            if row is None:
+                return pd.DataFrame(columns=['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender',
+                                             'timestamp', 'run_id'])
+            run_id = row[0]
+        sql, params = build_product_query(run_id=run_id, **filters)
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def explain_query(path='products.db', **filters):
+    """Query plan SQLite untuk filter yang diberikan (cek index terpakai atau tidak)"""
+    conn = sqlite3.connect(path)
+    try:
+        sql, params = build_product_query(**filters)
+        return [row[-1] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+    finally:
+        conn.close()
@@ -0,0 +1,295 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+READ_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp']
+# Kolom numerik dengan sorted index (range filter dan ORDER BY tanpa sort per query)
+SORTED_COLUMNS = ('Price', 'Rating')
+# Kolom kategori dengan bitmap index per nilai
+BITMAP_COLUMNS = ('Gender', 'Size')
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+
+class ProductIndex:
+    """
+    Snapshot produk read-only: array kolom + index sekunder
+
+    - SORTED_COLUMNS: urutan baris (argsort) dan nilai terurut, range filter
+      cukup dua searchsorted
+    - BITMAP_COLUMNS: bitmap (bool array) dan daftar row id per nilai
+
+    Query memulai dari kandidat paling selektif (slice sorted index atau row
+    id bitmap), lalu predikat lain dicek dengan gather vektor pada kandidat
+    itu saja. Objek tidak pernah diubah setelah dibuat, jadi aman dibaca dari
+    banyak thread; dataset baru = ProductIndex baru (lihat ProductReadService).
+    """
+
+    def __init__(self, df, version=None):
+        self.size = len(df)
+        self.version = version or datetime.now().isoformat()
+        self.columns = {col: df[col].to_numpy() for col in READ_COLUMNS}
+        for col in SORTED_COLUMNS:
+            self.columns[col] = df[col].to_numpy(dtype=np.float64)
+        self.columns['Colors'] = df['Colors'].to_numpy(dtype=np.int64)
+
+        self.sorted_order = {}
+        self.sorted_values = {}
+        for col in SORTED_COLUMNS:
+            order = np.argsort(self.columns[col], kind='stable')
+            self.sorted_order[col] = order
+            self.sorted_values[col] = self.columns[col][order]
+
+        self.bitmaps = {}
+        self.row_ids = {}
+        for col in BITMAP_COLUMNS:
+            codes, uniques = pd.factorize(df[col])
+            self.bitmaps[col] = {value: codes == code for code, value in enumerate(uniques)}
+            self.row_ids[col] = {value: np.flatnonzero(bitmap) for value, bitmap in self.bitmaps[col].items()}
+
+    @classmethod
+    def from_file(cls, path):
+        """Bangun index dari output bersih (CSV, CSV terkompresi, atau Parquet)"""
+        if path.endswith('.parquet'):
+            df = pd.read_parquet(path, columns=READ_COLUMNS)
+        else:
+            df = pd.read_csv(path, usecols=READ_COLUMNS, float_precision='round_trip')
+        stat = os.stat(path)
+        return cls(df, version=datetime.fromtimestamp(stat.st_mtime).isoformat())
+
+    def _range(self, col, low, high):
+        """Row id (tidak terurut) dengan low <= col <= high dari sorted index"""
+        values = self.sorted_values[col]
+        start = 0 if low is None else np.searchsorted(values, low, side='left')
+        stop = len(values) if high is None else np.searchsorted(values, high, side='right')
+        return self.sorted_order[col][start:stop]
+
+    def match(self, gender=None, size=None, min_price=None, max_price=None, min_rating=None, max_rating=None):
+        """Row id (terurut naik) yang lolos semua filter"""
+        equals = {col: value for col, value in (('Gender', gender), ('Size', size)) if value is not None}
+        ranges = {col: bounds for col, bounds in (('Price', (min_price, max_price)),
+                                                  ('Rating', (min_rating, max_rating)))
+                  if bounds != (None, None)}
+
+        candidates = []
+        for col, value in equals.items():
+            ids = self.row_ids[col].get(value)
+            if ids is None:
+                return np.empty(0, dtype=np.int64)
+            candidates.append((len(ids), 'equal', col, ids))
+        for col, (low, high) in ranges.items():
+            ids = self._range(col, low, high)
+            candidates.append((len(ids), 'range', col, ids))
+        if not candidates:
+            return np.arange(self.size)
+
+        # Mulai dari kandidat terkecil, cek predikat lain hanya pada kandidat itu
+        _, kind, first_col, ids = min(candidates, key=lambda candidate: candidate[0])
+        if kind == 'range':
+            ids = np.sort(ids)
+        keep = np.ones(len(ids), dtype=bool)
+        for col, value in equals.items():
+            if not (kind == 'equal' and col == first_col):
+                keep &= self.bitmaps[col][value][ids]
+        for col, (low, high) in ranges.items():
+            if not (kind == 'range' and col == first_col):
+                values = self.columns[col][ids]
+                if low is not None:
+                    keep &= values >= low
+                if high is not None:
+                    keep &= values <= high
+        return ids[keep]
+
+    def order(self, ids, order_by):
+        """Urutkan row id menurut kolom sorted index ('Price', '-Rating', ...)"""
+        descending = order_by.startswith('-')
+        col = order_by.lstrip('-')
+        if col not in SORTED_COLUMNS:
+            raise ValueError(f"Cannot order by column: {col}")
+        if len(ids) * 16 < self.size:
+            # Hasil kecil: sort kandidat saja
+            ordered = ids[np.argsort(self.columns[col][ids], kind='stable')]
+        else:
+            # Hasil besar: saring sorted index yang sudah ada, O(n) tanpa sort
+            mask = np.zeros(self.size, dtype=bool)
+            mask[ids] = True
+            order = self.sorted_order[col]
+            ordered = order[mask[order]]
+        return ordered[::-1] if descending else ordered
+
+    def rows(self, ids):
+        return [
+            {col: _json_value(self.columns[col][row]) for col in READ_COLUMNS}
+            for row in ids
+        ]
+
+    def query(self, order_by=None, offset=0, limit=DEFAULT_LIMIT, **filters):
+        """Filter + urut + paginasi, return (total match, list of dict)"""
+        offset = max(0, int(offset))
+        limit = min(MAX_LIMIT, max(0, int(limit)))
+        ids = self.match(**filters)
+        if order_by:
+            ids = self.order(ids, order_by)
+        return len(ids), self.rows(ids[offset:offset + limit])
+
+    def facets(self):
+        """Jumlah baris per nilai kolom bitmap"""
+        return {col: {str(value): len(ids) for value, ids in self.row_ids[col].items()}
+                for col in BITMAP_COLUMNS}
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+_FLOAT_PARAMS = ('min_price', 'max_price', 'min_rating', 'max_rating')
+_TEXT_PARAMS = ('gender', 'size', 'order_by')
+
+
+def parse_query_params(query_string):
+    """Query string HTTP -> argumen ProductIndex.query, ValueError jika tidak valid"""
+    params = {key: values[-1] for key, values in parse_qs(query_string).items()}
+    unknown = set(params) - set(_FLOAT_PARAMS) - set(_TEXT_PARAMS) - {'offset', 'limit'}
+    if unknown:
+        raise ValueError(f"Unknown query parameter: {sorted(unknown)[0]}")
+    parsed = {key: params[key] for key in _TEXT_PARAMS if key in params}
+    for key in _FLOAT_PARAMS:
+        if key in params:
+            parsed[key] = float(params[key])
+    for key in ('offset', 'limit'):
+        if key in params:
+            parsed[key] = int(params[key])
+    return parsed
+
+
+class ProductReadService:
+    """
+    Pemegang snapshot aktif + reload dari output bersih
+
+    Snapshot baru dibangun penuh di samping yang lama, lalu referensinya
+    diganti dalam satu assignment: query yang sedang berjalan tetap memakai
+    snapshot lama, query berikutnya langsung melihat yang baru.
+    """
+
+    def __init__(self, source='products.csv'):
+        self.source = source
+        self.index = None
+        self.loaded_at = None
+        self._signature = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def swap(self, index):
+        """Ganti snapshot aktif secara atomik"""
+        self.index = index
+        self.loaded_at = datetime.now().isoformat()
+        logger.info("Read API serving %d products (version %s)", index.size, index.version)
+
+    def reload_if_changed(self):
+        """Bangun ulang index jika file sumber berubah (mtime/size), return True jika di-swap"""
+        with self._reload_lock:
+            try:
+                stat = os.stat(self.source)
+            except FileNotFoundError:
+                return False
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return False
+            try:
+                index = ProductIndex.from_file(self.source)
+            except Exception as e:
+                # File sedang ditulis atau rusak: tetap layani snapshot lama
+                logger.warning("Cannot reload %s, keeping current snapshot: %s", self.source, e)
+                return False
+            self._signature = signature
+            self.swap(index)
+            return True
+
+    def watch(self, interval=5.0):
+        """Thread yang mengecek file sumber setiap interval detik"""
+        def loop():
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        thread = threading.Thread(target=loop, name='read-api-watch', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        index = self.index
+        return {
+            'source': self.source,
+            'rows': index.size if index else 0,
+            'version': index.version if index else None,
+            'loaded_at': self.loaded_at,
+        }
+
+
+def start_read_api(service, host='127.0.0.1', port=8081):
+    """
+    HTTP read API di thread terpisah
+
+    GET /products?gender=Men&size=M&min_price=..&max_price=..&min_rating=..
+                 &max_rating=..&order_by=-Price&offset=0&limit=50
+    GET /facets  -> jumlah produk per Gender/Size
+    GET /status  -> versi snapshot yang sedang dilayani
+    """
+
+    class ReadHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            index = service.index
+            if url.path == '/status':
+                code, body = 200, service.status()
+            elif index is None:
+                code, body = 503, {'error': 'no dataset loaded yet'}
+            elif url.path == '/products':
+                try:
+                    started = time.perf_counter()
+                    params = parse_query_params(url.query)
+                    total, items = index.query(**params)
+                    code, body = 200, {
+                        'version': index.version,
+                        'total': total,
+                        'offset': params.get('offset', 0),
+                        'items': items,
+                        'took_us': round((time.perf_counter() - started) * 1e6),
+                    }
+                except ValueError as e:
+                    code, body = 400, {'error': str(e)}
+            elif url.path == '/facets':
+                code, body = 200, {'version': index.version, 'facets': index.facets()}
+            else:
+                code, body = 404, {'error': 'not found'}
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            logger.debug("Read API %s - %s", self.address_string(), format % args)
+
+    server = ThreadingHTTPServer((host, port), ReadHandler)
+    thread = threading.Thread(target=server.serve_forever, name='read-api', daemon=True)
+    thread.start()
+    logger.info("Read API listening on http://%s:%d/products", host, server.server_address[1])
+    return server
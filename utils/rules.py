@@ -0,0 +1,163 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnRule:
+    """
+    Rule cleaning deklaratif untuk satu kolom hasil scrape
+
+    column:       nama kolom
+    dtype:        tipe target ('float64', 'int64' atau 'object')
+    patterns:     list (regex, bounds) - regex dengan satu capture group, dicoba
+                  berurutan; bounds (min, max) opsional untuk nilai hasil parse
+    sentinels:    nilai mentah yang berarti "tidak ada data" (baris dibuang)
+    strip_prefix: prefix yang dihapus dari teks (untuk kolom teks)
+    drop_values:  nilai hasil cleaning yang membuat baris dibuang
+    thousands:    pemisah ribuan yang dihapus sebelum konversi angka
+    multiplier:   faktor pengali hasil parse (mis. kurs Rupiah)
+    """
+
+    def __init__(self, column, dtype='object', patterns=None, sentinels=None, strip_prefix=None,
+                 drop_values=None, thousands=None, multiplier=None):
+        self.column = column
+        self.dtype = dtype
+        self.patterns = [(re.compile(pattern), bounds) for pattern, bounds in (patterns or [])]
+        self.sentinels = list(sentinels or [])
+        self.strip_prefix = strip_prefix
+        self.drop_values = list(drop_values or [])
+        self.thousands = thousands
+        self.multiplier = multiplier
+
+    def __repr__(self):
+        return f"ColumnRule({self.column!r}, dtype={self.dtype!r})"
+
+
+# Rule bawaan - setara dengan clean_price_simple ... clean_gender_simple
+DEFAULT_SPEC = [
+    ColumnRule(
+        'Price', dtype='float64',
+        patterns=[(r'\$?([\d,]+\.?\d*)', None)],
+        sentinels=['Price Unavailable'],
+        thousands=',',
+        multiplier=16000,  # USD -> Rupiah
+    ),
+    ColumnRule(
+        'Rating', dtype='float64',
+        patterns=[
+            (r'(\d+\.?\d*)\s*\/\s*5', None),
+            # Fallback: angka polos, hanya valid jika di rentang 0-5
+            (r'^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*$', (0, 5)),
+        ],
+        sentinels=['Invalid Rating / 5', 'Not Rated'],
+    ),
+    ColumnRule(
+        'Colors', dtype='int64',
+        patterns=[(r'(\d+)', None)],
+    ),
+    ColumnRule('Size', strip_prefix='Size: ', drop_values=['Unknown']),
+    ColumnRule('Gender', strip_prefix='Gender: ', drop_values=['Unknown']),
+]
+
+
+class TransformPlan:
+    """
+    Rencana eksekusi hasil compile_spec
+
+    Setiap kolom diproses tepat sekali secara vektor (str.extract / str.replace)
+    atas nilai uniknya, mask valid semua kolom digabung, lalu baris difilter
+    satu kali di akhir.
+    Menambah kolom baru berarti menambah satu ekspresi kolom, bukan satu pass
+    (filter + copy) lagi atas seluruh DataFrame.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+
+    def execute(self, df):
+        keep = np.ones(len(df), dtype=bool)
+        cleaned = {}
+        for rule in self.rules:
+            # Rule dievaluasi pada nilai unik saja, lalu dipetakan balik via codes
+            codes, uniques = pd.factorize(df[rule.column], use_na_sentinel=False)
+            values, valid = _evaluate_rule(rule, pd.Series(uniques, dtype=object))
+            cleaned[rule.column] = values[codes]
+            keep &= valid[codes]
+
+        result = {}
+        for col in df.columns:
+            if col in cleaned:
+                result[col] = cleaned[col][keep]
+            elif isinstance(df[col].dtype, pd.ArrowDtype):
+                # Kolom Arrow-backed difilter tanpa diubah menjadi object Python
+                result[col] = df[col].array[keep]
+            else:
+                result[col] = df[col].to_numpy()[keep]
+        df_clean = pd.DataFrame(result, columns=df.columns, index=df.index[keep])
+
+        for rule in self.rules:
+            df_clean[rule.column] = df_clean[rule.column].astype(rule.dtype)
+        for col in df_clean.columns:
+            if col not in cleaned and not isinstance(df_clean[col].dtype, pd.ArrowDtype):
+                df_clean[col] = df_clean[col].astype('object')
+
+        return df_clean.dropna()
+
+
+def compile_spec(spec=None):
+    """Compile spec (list ColumnRule) menjadi TransformPlan"""
+    return TransformPlan(spec or DEFAULT_SPEC)
+
+
+def _evaluate_rule(rule, series):
+    """Return (nilai hasil cleaning, mask baris valid) untuk satu kolom"""
+    valid = ~series.isin(rule.sentinels).to_numpy() if rule.sentinels else np.ones(len(series), dtype=bool)
+
+    if rule.dtype == 'object':
+        text = series.astype(str)
+        if rule.strip_prefix:
+            text = text.str.replace(rule.strip_prefix, '', regex=False)
+        text = text.str.strip()
+        if rule.drop_values:
+            valid &= ~text.isin(rule.drop_values).to_numpy()
+        return text.to_numpy(), valid
+
+    # Nilai yang sudah numerik dipakai apa adanya (sama seperti parser lama)
+    text_mask = _text_mask(series)
+    parsed = np.full(len(series), np.nan)
+    if not text_mask.all():
+        parsed[~text_mask] = pd.to_numeric(series[~text_mask], errors='coerce').to_numpy(dtype='float64')
+
+    positions = np.flatnonzero(text_mask)
+    text = series.iloc[positions]
+    for pattern, bounds in rule.patterns:
+        if positions.size == 0:
+            break
+        extracted = text.str.extract(pattern, expand=False)
+        matched = extracted.notna().to_numpy()
+        if rule.thousands:
+            extracted = extracted.str.replace(rule.thousands, '', regex=False)
+        numbers = pd.to_numeric(extracted, errors='coerce').to_numpy(dtype='float64')
+        if rule.multiplier is not None:
+            numbers = numbers * rule.multiplier
+        if bounds is not None:
+            # Di luar rentang dianggap tidak match, lanjut ke pattern berikutnya
+            matched &= (numbers >= bounds[0]) & (numbers <= bounds[1])
+        parsed[positions[matched]] = numbers[matched]
+        positions = positions[~matched]
+        text = text[~matched]
+
+    valid &= ~np.isnan(parsed)
+    return parsed, valid
+
+
+def _text_mask(series):
+    """Mask baris yang berisi string (nilai lain dianggap sudah numerik)"""
+    if series.dtype != object:
+        return np.zeros(len(series), dtype=bool)
+    try:
+        return series.str.len().notna().to_numpy()
+    except AttributeError:
+        # Kolom object tanpa satupun string
+        return np.zeros(len(series), dtype=bool)
@@ -0,0 +1,177 @@
+import heapq
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+import requests
+
+# Status code yang dianggap server sedang kewalahan dan layak di-retry
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class AdaptiveScheduler:
+    """
+    Scheduler request dengan rate adaptif (AIMD) dan antrian retry
+
+    Rate naik sedikit demi sedikit (additive increase) selama server sehat,
+    dan turun drastis (multiplicative decrease) saat latency tinggi atau
+    server membalas 429/5xx. Halaman yang gagal dimasukkan lagi ke antrian
+    dengan exponential backoff sampai retry budget habis.
+    """
+
+    def __init__(self, initial_rate=1.0, min_rate=0.1, max_rate=10.0,
+                 increase_step=0.5, decrease_factor=0.5, target_latency=2.0,
+                 max_retries=3, backoff_base=1.0, backoff_max=60.0,
+                 sleep=None, clock=None):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep or time.sleep
+        self._clock = clock or time.monotonic
+
+        self._pending = deque()
+        self._retries = []  # heap of (ready_at, seq, page, attempt)
+        self._seq = 0
+        self._next_request_at = 0.0
+
+        self.requests_made = 0
+        self.retried_pages = set()
+        self.failed_pages = []
+        self.started_at = None
+        self.finished_at = None
+
+    def add_pages(self, pages):
+        """Tambahkan halaman baru ke antrian"""
+        for page in pages:
+            self._pending.append((page, 0))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Ambil halaman berikutnya (page, attempt), menunggu jika perlu"""
+        now = self._clock()
+        if self._retries and (self._retries[0][0] <= now or not self._pending):
+            ready_at, _, page, attempt = heapq.heappop(self._retries)
+            if ready_at > now:
+                self._sleep(ready_at - now)
+            return page, attempt
+        if self._pending:
+            return self._pending.popleft()
+        self.finished_at = self._clock()
+        raise StopIteration
+
+    def wait(self):
+        """Tunggu sampai boleh mengirim request berikutnya sesuai rate saat ini"""
+        now = self._clock()
+        if self.started_at is None:
+            self.started_at = now
+        if self._next_request_at > now:
+            self._sleep(self._next_request_at - now)
+            now = self._clock()
+        self._next_request_at = now + 1.0 / self.rate
+        self.requests_made += 1
+
+    def record_success(self, latency):
+        """Update rate setelah request berhasil"""
+        if latency > self.target_latency:
+            self._decrease()
+        else:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def record_failure(self, page, attempt, retry_after=None):
+        """
+        Update rate setelah request gagal dan jadwalkan retry
+
+        Return True jika halaman dijadwalkan ulang, False jika retry budget habis
+        """
+        delay = self.backoff(page, attempt, retry_after)
+        if delay is None:
+            return False
+        self._seq += 1
+        heapq.heappush(self._retries, (self._clock() + delay, self._seq, page, attempt + 1))
+        return True
+
+    def record_fatal(self, page):
+        """Halaman gagal permanen (mis. 404): langsung failed tanpa retry dan tanpa menurunkan rate"""
+        self.failed_pages.append(page)
+
+    def backoff(self, page, attempt, retry_after=None):
+        """
+        Update rate setelah request gagal, return delay sebelum retry
+
+        Dipakai langsung oleh fetcher yang me-retry sendiri (tanpa antrian
+        retry scheduler). Return None jika retry budget habis.
+        """
+        self._decrease()
+        if retry_after is not None:
+            # Hormati Retry-After: jangan kirim request apapun sebelum waktunya
+            self._next_request_at = max(self._next_request_at, self._clock() + retry_after)
+
+        if attempt >= self.max_retries:
+            self.failed_pages.append(page)
+            return None
+
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.retried_pages.add(page)
+        return delay
+
+    def _decrease(self):
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+
+    def effective_rate(self):
+        """Request per detik yang benar-benar tercapai"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else self._clock()
+        elapsed = end - self.started_at
+        if elapsed <= 0:
+            return float(self.requests_made)
+        return self.requests_made / elapsed
+
+    def summary(self):
+        """Ringkasan statistik scheduler untuk run report"""
+        return {
+            'requests': self.requests_made,
+            'requests_per_sec': round(self.effective_rate(), 3),
+            'retried_pages': len(self.retried_pages),
+            'failed_pages': len(self.failed_pages),
+            'final_rate': round(self.rate, 3),
+        }
+
+
+def is_retryable_error(error):
+    """
+    True jika exception requests layak di-retry
+
+    Error koneksi/timeout dan HTTP 429/5xx di-retry; 4xx lain dan URL yang
+    tidak valid tidak akan berhasil dengan retry, jadi langsung gagal.
+    """
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return not isinstance(error, (requests.exceptions.InvalidURL, requests.exceptions.MissingSchema,
+                                  requests.exceptions.InvalidSchema, requests.exceptions.InvalidHeader))
+
+
+def parse_retry_after(value):
+    """Parse header Retry-After (detik atau HTTP-date) menjadi detik"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
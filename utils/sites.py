@@ -0,0 +1,288 @@
+import itertools
+import json
+import threading
+from datetime import datetime
+from functools import partial
+from urllib.parse import urlparse
+
+import soupsieve
+
+from utils.extract import ProductColumns, ProductRecord, parse_page
+from utils.logger import get_logger
+from utils.scheduler import AdaptiveScheduler
+from utils.stages import PageFetcher, PageWindow, Stage, StagedExecutor, log_stage_stats
+
+logger = get_logger(__name__)
+
+RECORD_FIELDS = ProductRecord._fields
+
+# Nilai mentah jika field tidak ditemukan (sama dengan extract_product_record);
+# sentinel ini dikenali rule transform sehingga barisnya dibuang
+FIELD_DEFAULTS = {
+    'Title': 'Unknown Product',
+    'Price': 'Price Unavailable',
+    'Rating': 'Not Rated',
+    'Colors': '0 Colors',
+    'Size': 'Size: Unknown',
+    'Gender': 'Gender: Unknown',
+}
+
+
+class FieldSelector:
+    """
+    Cara mengambil satu field dari product card
+
+    css:      selector CSS (atau list selector yang dicoba berurutan), relatif
+              ke card; teks dicocokkan dengan :-soup-contains("Rating:").
+              None = field tidak ada di situs ini, selalu pakai default
+    attr:     ambil atribut elemen (mis. 'content', 'data-rating') alih-alih teks
+    count:    nilai = jumlah elemen yang cocok (mis. swatch warna)
+    template: format nilai mentah supaya sama dengan format Fashion Studio yang
+              dikenali rule transform, mis. 'Size: {}' atau '{} Colors'
+    default:  nilai jika elemen tidak ditemukan (default FIELD_DEFAULTS)
+
+    Selector di-compile sekali saat profil dibuat (soupsieve), bukan per card.
+    """
+
+    def __init__(self, css=None, attr=None, count=False, template='{}', default=None):
+        selectors = [] if css is None else [css] if isinstance(css, str) else list(css)
+        self.selectors = selectors
+        self.patterns = [soupsieve.compile(selector) for selector in selectors]
+        self.attr = attr
+        self.count = count
+        self.template = template
+        self.default = default
+
+    def extract(self, card):
+        for pattern in self.patterns:
+            if self.count:
+                matched = len(pattern.select(card))
+                if matched:
+                    return self.template.format(matched)
+                continue
+            element = pattern.select_one(card)
+            if element is None:
+                continue
+            value = element.get(self.attr) if self.attr else element.get_text()
+            if value is not None:
+                return self.template.format(str(value).strip())
+        return self.default
+
+    def __repr__(self):
+        return f"FieldSelector({self.selectors!r})"
+
+
+class SiteProfile:
+    """
+    Profil satu storefront: skema URL pagination dan selector field
+
+    name:         nama profil (log, ringkasan run)
+    base_url:     root katalog
+    card:         selector CSS satu product card
+    fields:       dict field ProductRecord -> FieldSelector atau dict argumennya;
+                  field yang tidak disebut selalu bernilai FIELD_DEFAULTS
+    page_pattern: URL halaman n, placeholder {base_url} dan {page}
+    first_page:   URL khusus halaman 1 (None = page_pattern juga untuk halaman 1)
+    start_page, end_page: rentang halaman yang di-crawl
+    max_rate:     batas request per detik ke host situs ini
+    max_retries:  retry budget per halaman
+    """
+
+    def __init__(self, name, base_url, card, fields, page_pattern='{base_url}/page{page}', first_page=None,
+                 start_page=1, end_page=50, max_rate=10.0, max_retries=3):
+        unknown = set(fields) - set(RECORD_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown field in site profile {name!r}: {sorted(unknown)[0]}")
+        self.name = name
+        self.base_url = base_url
+        self.card = soupsieve.compile(card)
+        self.fields = {}
+        for field in RECORD_FIELDS:
+            selector = fields.get(field, FieldSelector())
+            if isinstance(selector, dict):
+                selector = FieldSelector(**selector)
+            if selector.default is None:
+                selector.default = FIELD_DEFAULTS[field]
+            self.fields[field] = selector
+        self.page_pattern = page_pattern
+        self.first_page = first_page
+        self.start_page = start_page
+        self.end_page = end_page
+        self.max_rate = max_rate
+        self.max_retries = max_retries
+
+    @classmethod
+    def from_dict(cls, data):
+        """Profil dari dict (mis. satu entri file JSON)"""
+        return cls(**data)
+
+    @property
+    def host(self):
+        return urlparse(self.base_url).netloc
+
+    def page_url(self, page):
+        pattern = self.first_page if page == 1 and self.first_page else self.page_pattern
+        return pattern.format(base_url=self.base_url, page=page)
+
+    def select_cards(self, soup):
+        return self.card.select(soup)
+
+    def extract_record(self, card, errors=None):
+        """ProductRecord mentah dari satu card (None jika gagal, error dicatat di errors)"""
+        try:
+            return ProductRecord(*(self.fields[field].extract(card) for field in RECORD_FIELDS))
+        except Exception as e:
+            if errors is not None:
+                errors.add(e)
+            else:
+                logger.warning("Error extracting product data (%s): %s", self.name, e)
+            return None
+
+    def parse(self, content, products, timestamp=None, page=None):
+        """Parse satu halaman HTML situs ini, return (jumlah card, jumlah produk valid)"""
+        return parse_page(content, products, timestamp=timestamp, page=page, profile=self)
+
+    def __repr__(self):
+        return f"SiteProfile({self.name!r}, {self.base_url!r})"
+
+
+# Profil bawaan; markup sama dengan extract_product_record
+FASHION_STUDIO = SiteProfile(
+    'fashion-studio', 'https://fashion-studio.dicoding.dev',
+    card='div.collection-card',
+    fields={
+        'Title': {'css': 'h3.product-title'},
+        'Price': {'css': ['span.price', 'p.price']},
+        'Rating': {'css': 'p:-soup-contains("Rating:")'},
+        'Colors': {'css': 'p:-soup-contains("Colors"):not(:-soup-contains("Rating:"))'},
+        'Size': {'css': 'p:-soup-contains("Size:")'},
+        'Gender': {'css': 'p:-soup-contains("Gender:")'},
+    },
+    first_page='{base_url}',
+)
+
+BUILTIN_PROFILES = {FASHION_STUDIO.name: FASHION_STUDIO}
+
+
+def load_profiles(path):
+    """Baca list profil dari file JSON (list of dict argumen SiteProfile)"""
+    with open(path, encoding='utf-8') as f:
+        return [SiteProfile.from_dict(data) for data in json.load(f)]
+
+
+def resolve_profiles(spec):
+    """
+    Konfigurasi SITE_PROFILES -> list SiteProfile
+
+    spec: path file .json, atau list berisi nama profil bawaan, dict, atau SiteProfile
+    """
+    if isinstance(spec, str):
+        return load_profiles(spec) if spec.endswith('.json') else [BUILTIN_PROFILES[spec]]
+    profiles = []
+    for item in spec:
+        if isinstance(item, SiteProfile):
+            profiles.append(item)
+        elif isinstance(item, dict):
+            profiles.append(SiteProfile.from_dict(item))
+        elif item in BUILTIN_PROFILES:
+            profiles.append(BUILTIN_PROFILES[item])
+        else:
+            raise ValueError(f"Unknown site profile: {item!r}")
+    return profiles
+
+
+def parse_site_page(profiles, fetched):
+    """Stage parse: (nama profil, page, content) -> (nama profil, page, ProductColumns)"""
+    name, page, content = fetched
+    products = ProductColumns()
+    card_count, added = profiles[name].parse(content, products, timestamp=datetime.now().isoformat(), page=page)
+    if not card_count or not added:
+        logger.warning("No valid products found on %s page %d", name, page)
+        return None
+    return name, page, products
+
+
+def _interleave(profiles):
+    """Halaman semua profil disisipkan round-robin: (nama profil, page)"""
+    pages = [[(profile.name, page) for page in range(profile.start_page, profile.end_page + 1)]
+             for profile in profiles]
+    for batch in itertools.zip_longest(*pages):
+        yield from (item for item in batch if item is not None)
+
+
+def default_host_scheduler(max_rate, max_retries):
+    return AdaptiveScheduler(initial_rate=min(1.0, max_rate), max_rate=max_rate, max_retries=max_retries)
+
+
+def crawl_sites(profiles, collector=None, session=None, fetch_workers=4, parse_workers=1, parse_kind='thread',
+                queue_size=8, scheduler_factory=None, governor=None):
+    """
+    Crawl beberapa storefront bersamaan ke satu collector
+
+    Setiap host punya AdaptiveScheduler sendiri (rate dan backoff terpisah;
+    beberapa profil di host yang sama berbagi scheduler dengan max_rate
+    terkecil). Halaman antar profil disisipkan round-robin supaya worker
+    fetch tidak menumpuk di satu host. Hasil digabung urut per profil lalu
+    per halaman, sehingga transform/load berjalan sekali untuk semua situs.
+    Dengan governor jumlah halaman di pipeline mengikuti stage 'extract'.
+    Return (products atau None jika kosong, statistik stage + per situs + per host).
+    """
+    names = [profile.name for profile in profiles]
+    if len(set(names)) != len(names):
+        raise ValueError("Site profile names must be unique")
+    profiles_by_name = dict(zip(names, profiles))
+    scheduler_factory = scheduler_factory or default_host_scheduler
+
+    by_host = {}
+    for profile in profiles:
+        by_host.setdefault(profile.host, []).append(profile)
+    schedulers = {}
+    fetchers = {}
+    for host, host_profiles in by_host.items():
+        schedulers[host] = scheduler_factory(min(profile.max_rate for profile in host_profiles),
+                                             min(profile.max_retries for profile in host_profiles))
+        lock = threading.Lock()
+        for profile in host_profiles:
+            fetchers[profile.name] = PageFetcher(profile.base_url, schedulers[host], session,
+                                                 url_for=profile.page_url, lock=lock)
+
+    def fetch(item):
+        name, page = item
+        fetched = fetchers[name](page)
+        return None if fetched is None else (name, page, fetched[1])
+
+    parsed_pages = {}
+
+    def collect(parsed):
+        name, page, products = parsed
+        parsed_pages[name, page] = products
+        return parsed
+
+    stages = [
+        Stage('fetch', fetch, workers=fetch_workers),
+        Stage('parse', partial(parse_site_page, profiles_by_name), workers=parse_workers, kind=parse_kind),
+        Stage('collect', collect),
+    ]
+    pages = _interleave(profiles)
+    window = PageWindow(pages, governor, queue_size) if governor is not None else None
+    stats = StagedExecutor(stages, queue_size=queue_size,
+                           on_item_done=window.done if window else None).run(window or pages)
+    log_stage_stats(stats)
+
+    collector = collector if collector is not None else ProductColumns()
+    stats['sites'] = {}
+    for profile in profiles:
+        pages = sorted(page for name, page in parsed_pages if name == profile.name)
+        before = len(collector)
+        for page in pages:
+            collector.extend(parsed_pages[profile.name, page])
+        stats['sites'][profile.name] = {'host': profile.host, 'pages': len(pages),
+                                        'products': len(collector) - before}
+        logger.info("Site %s: %d/%d pages successful, %d products", profile.name, len(pages),
+                    profile.end_page - profile.start_page + 1, len(collector) - before)
+    stats['hosts'] = {host: scheduler.summary() for host, scheduler in schedulers.items()}
+
+    if len(collector) == 0:
+        logger.error("Scraping failed: no successful pages or no products found")
+        return None, stats
+    return collector, stats
@@ -0,0 +1,443 @@
+import queue
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from utils.extract import ProductColumns, page_url, parse_page
+from utils.logger import get_logger
+from utils.scheduler import AdaptiveScheduler, RETRYABLE_STATUS, is_retryable_error, parse_retry_after
+
+logger = get_logger(__name__)
+
+# Penanda akhir stream di antara stage
+_DONE = object()
+
+
+class Stage:
+    """
+    Satu stage pipeline: func(item) -> item untuk stage berikutnya
+
+    kind='thread' untuk stage I/O (fetch, load); kind='process' menjalankan
+    func di ProcessPoolExecutor untuk stage CPU (func dan item harus bisa
+    di-pickle). Return None membuang item. queue_size membatasi antrian
+    masuk stage ini: jika penuh, stage sebelumnya ikut menunggu (backpressure).
+    """
+
+    def __init__(self, name, func, workers=1, kind='thread', queue_size=None):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown stage kind: {kind!r}")
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.kind = kind
+        self.queue_size = queue_size
+
+
+class StageStats:
+    """Counter per stage; busy = waktu di func, blocked = menunggu antrian stage berikutnya"""
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.lock = threading.Lock()
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.starved = 0.0
+        self.depth_total = 0
+        self.depth_max = 0
+
+    def record_get(self, depth, waited):
+        with self.lock:
+            self.items_in += 1
+            self.depth_total += depth
+            self.depth_max = max(self.depth_max, depth)
+            self.starved += waited
+
+    def record_done(self, busy, blocked, produced, failed):
+        with self.lock:
+            self.busy += busy
+            self.blocked += blocked
+            self.items_out += produced
+            self.errors += failed
+
+    def summary(self, elapsed, depth):
+        with self.lock:
+            capacity = self.stage.workers * elapsed
+            return {
+                'kind': self.stage.kind,
+                'workers': self.stage.workers,
+                'items_in': self.items_in,
+                'items_out': self.items_out,
+                'errors': self.errors,
+                'queue_depth': depth,
+                'queue_depth_avg': round(self.depth_total / self.items_in, 2) if self.items_in else 0.0,
+                'queue_depth_max': self.depth_max,
+                'busy_seconds': round(self.busy, 3),
+                'blocked_seconds': round(self.blocked, 3),
+                'starved_seconds': round(self.starved, 3),
+                'utilization': round(self.busy / capacity, 3) if capacity > 0 else 0.0,
+            }
+
+
+class StagedExecutor:
+    """
+    Jalankan stage secara bersamaan, dihubungkan antrian berukuran terbatas
+
+    Setiap stage punya worker sendiri; item mengalir source -> stage 1 -> ...
+    -> stage terakhir. Karena setiap antrian dibatasi (queue_size), stage
+    lambat di hilir menahan stage di hulu sehingga memori tidak tumbuh tanpa
+    batas. Urutan item antar worker tidak dijamin. stats() bisa dipanggil
+    kapan saja (mis. dari endpoint status) untuk melihat stage bottleneck.
+    on_item_done() dipanggil setiap item keluar dari pipeline (dibuang, error
+    atau selesai di stage terakhir), mis. untuk PageWindow.
+    """
+
+    def __init__(self, stages, queue_size=8, on_item_done=None):
+        if not stages:
+            raise ValueError("StagedExecutor needs at least one stage")
+        self.stages = stages
+        self.on_item_done = on_item_done
+        self.queues = [queue.Queue(maxsize=stage.queue_size or queue_size) for stage in stages]
+        self._stats = [StageStats(stage) for stage in stages]
+        self._remaining = [stage.workers for stage in stages]
+        self._remaining_lock = threading.Lock()
+        self._pools = {}
+        self._started = None
+        self._finished = None
+
+    def run(self, source):
+        """Alirkan item dari source (iterable) melalui semua stage, blok sampai selesai"""
+        self._started = time.perf_counter()
+        self._finished = None
+        threads = []
+        try:
+            for index, stage in enumerate(self.stages):
+                if stage.kind == 'process':
+                    from concurrent.futures import ProcessPoolExecutor
+
+                    self._pools[index] = ProcessPoolExecutor(max_workers=stage.workers)
+                for worker in range(stage.workers):
+                    thread = threading.Thread(target=self._work, args=(index,), daemon=True,
+                                              name=f"stage-{stage.name}-{worker}")
+                    thread.start()
+                    threads.append(thread)
+
+            # Feeder di thread pemanggil: put() ikut menunggu jika stage pertama penuh
+            for item in source:
+                self.queues[0].put(item)
+            for _ in range(self.stages[0].workers):
+                self.queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+        finally:
+            for pool in self._pools.values():
+                pool.shutdown()
+            self._pools.clear()
+            self._finished = time.perf_counter()
+        return self.stats()
+
+    def _call(self, index, item):
+        stage = self.stages[index]
+        if stage.kind == 'process':
+            return self._pools[index].submit(stage.func, item).result()
+        return stage.func(item)
+
+    def _work(self, index):
+        stage = self.stages[index]
+        stats = self._stats[index]
+        inbox = self.queues[index]
+        outbox = self.queues[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            waiting = time.perf_counter()
+            item = inbox.get()
+            if item is _DONE:
+                break
+            stats.record_get(inbox.qsize(), time.perf_counter() - waiting)
+
+            started = time.perf_counter()
+            try:
+                result = self._call(index, item)
+                failed = 0
+            except Exception:
+                logger.exception("Stage %s failed on an item", stage.name)
+                result, failed = None, 1
+            busy = time.perf_counter() - started
+
+            blocked = 0.0
+            if result is not None and outbox is not None:
+                waiting = time.perf_counter()
+                outbox.put(result)
+                blocked = time.perf_counter() - waiting
+            stats.record_done(busy, blocked, int(result is not None), failed)
+            if self.on_item_done is not None and (result is None or outbox is None):
+                self.on_item_done()
+
+        # Worker terakhir dari stage ini menutup stream untuk stage berikutnya
+        with self._remaining_lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+        if last and outbox is not None:
+            for _ in range(self.stages[index + 1].workers):
+                outbox.put(_DONE)
+
+    def stats(self):
+        """Statistik per stage plus nama stage bottleneck (utilization tertinggi)"""
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        stages = {stage.name: stats.summary(elapsed, self.queues[index].qsize())
+                  for index, (stage, stats) in enumerate(zip(self.stages, self._stats))}
+        bottleneck = max(stages, key=lambda name: stages[name]['utilization']) if elapsed else None
+        return {'elapsed_seconds': round(elapsed, 3), 'bottleneck': bottleneck, 'stages': stages}
+
+
+class PageFetcher:
+    """
+    Stage fetch: page -> (page, content), aman dipanggil dari banyak thread
+
+    Rate dan backoff tetap diatur satu AdaptiveScheduler bersama (dijaga lock),
+    jadi worker fetch hanya menumpuk latency request, bukan menaikkan rate.
+    Halaman yang retry budget-nya habis, atau gagal dengan 4xx selain 429,
+    menghasilkan None (dibuang).
+    url_for(page) mengganti skema URL default (page_url); lock bisa dibagi
+    beberapa fetcher yang memakai scheduler yang sama (satu host).
+    """
+
+    def __init__(self, base_url, scheduler=None, session=None, sleep=None, url_for=None, lock=None):
+        self.base_url = base_url
+        self.scheduler = scheduler or AdaptiveScheduler()
+        self.http = session or requests
+        self._sleep = sleep or time.sleep
+        self._url_for = url_for or (lambda page: page_url(self.base_url, page))
+        self._lock = lock or threading.Lock()
+
+    def __call__(self, page):
+        url = self._url_for(page)
+        attempt = 0
+        while True:
+            with self._lock:
+                self.scheduler.wait()
+            retry_after = None
+            try:
+                request_started = time.monotonic()
+                response = self.http.get(url, timeout=10)
+                latency = time.monotonic() - request_started
+                if response.status_code in RETRYABLE_STATUS:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    logger.warning("Server returned %d for page %d", response.status_code, page)
+                else:
+                    response.raise_for_status()
+                    with self._lock:
+                        self.scheduler.record_success(latency)
+                    return page, response.content
+            except requests.exceptions.RequestException as e:
+                if not is_retryable_error(e):
+                    logger.error("Page %d failed, not retrying: %s", page, e)
+                    with self._lock:
+                        self.scheduler.record_fatal(page)
+                    return None
+                logger.warning("Error fetching page %d: %s", page, e)
+
+            with self._lock:
+                delay = self.scheduler.backoff(page, attempt, retry_after)
+            if delay is None:
+                logger.error("Giving up on page %d after %d attempts", page, attempt + 1)
+                return None
+            self._sleep(delay)
+            attempt += 1
+
+
+def parse_fetched_page(fetched):
+    """Stage parse (bisa di process lain): (page, content) -> (page, ProductColumns halaman tersebut)"""
+    page, content = fetched
+    products = ProductColumns()
+    card_count, added = parse_page(content, products, timestamp=datetime.now().isoformat(), page=page)
+    if not card_count or not added:
+        logger.warning("No valid products found on page %d", page)
+        return None
+    return page, products
+
+
+class PageTransformer:
+    """
+    Stage transform: ProductColumns satu halaman -> DataFrame bersih
+
+    Rule cleaning sama dengan transform_data; deduplikasi baris mentah
+    bersifat global antar halaman lewat DiskHashSet (sama dengan
+    transform_chunked), jadi memori tidak tumbuh dengan jumlah baris.
+    seen: DiskHashSet yang dipakai bersama; tanpa itu dibuat set di file
+    sementara yang dihapus saat close(). stats (StatsAccumulator) di-update
+    per halaman bersih.
+    """
+
+    def __init__(self, cleaner=None, stats=None, seen=None):
+        from utils.dedup import DiskHashSet
+
+        self.cleaner = cleaner
+        self.stats = stats
+        self._owns_seen = seen is None
+        self.seen = DiskHashSet() if seen is None else seen
+        self._lock = threading.Lock()
+
+    def __call__(self, parsed):
+        from utils.dedup import compute_row_hash
+        from utils.transform import apply_cleaning_rules
+
+        _, products = parsed
+        df = products.to_dataframe()
+        df = df[df['Title'] != "Unknown Product"]
+        df = df[self.seen.add(compute_row_hash(df, list(df.columns)))]
+        if df.empty:
+            return None
+        df_clean = apply_cleaning_rules(df, self.cleaner)
+        if df_clean.empty:
+            return None
+        if self.stats is not None:
+            with self._lock:
+                self.stats.update(df_clean)
+        return df_clean.reset_index(drop=True)
+
+    def close(self):
+        if self._owns_seen:
+            self.seen.close()
+
+
+class PageWindow:
+    """
+    Source halaman untuk StagedExecutor dengan jumlah halaman di pipeline dibatasi
+
+    Halaman berikutnya baru dimasukkan jika halaman yang sedang diproses kurang
+    dari governor.size('extract'); done() (on_item_done executor) di-adapt ke
+    governor setiap halaman keluar, jadi batas ini mengikuti RSS selama extract.
+    """
+
+    def __init__(self, pages, governor, default=8):
+        self.pages = pages
+        self.governor = governor
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        governor.initial_size('extract', default, maximum=default * 4)
+
+    def __iter__(self):
+        for page in self.pages:
+            with self._cond:
+                self._cond.wait_for(lambda: self.in_flight < self.governor.size('extract'))
+                self.in_flight += 1
+            yield page
+
+    def done(self):
+        with self._cond:
+            self.in_flight -= 1
+            self.governor.adapt('extract')
+            self._cond.notify()
+
+
+def log_stage_stats(stats):
+    """Log statistik per stage hasil StagedExecutor.run (juga dipakai crawl multi-situs)"""
+    for name, stage in stats['stages'].items():
+        logger.info("Stage %-9s workers=%d in=%d out=%d errors=%d utilization=%.0f%% max queue=%d",
+                    name, stage['workers'], stage['items_in'], stage['items_out'], stage['errors'],
+                    stage['utilization'] * 100, stage['queue_depth_max'])
+    logger.info("Staged run finished in %.1f s, bottleneck stage: %s", stats['elapsed_seconds'],
+                stats['bottleneck'])
+
+
+def archive_stage(archive, run_id, base_url):
+    """Stage yang menyimpan body setiap halaman ke archive (HtmlArchive) di bawah run_id"""
+    run_id = run_id or archive.new_run_id()
+    logger.info("Archiving HTML pages under run_id %s in %s", run_id, archive.root)
+
+    def store(fetched):
+        page, content = fetched
+        archive.store(run_id, page, page_url(base_url, page), content)
+        return fetched
+
+    return Stage('archive', store)
+
+
+def scrape_staged(base_url, start_page=1, end_page=50, scheduler=None, collector=None, session=None,
+                  fetch_workers=4, parse_workers=1, parse_kind='thread', queue_size=8, archive=None, run_id=None,
+                  governor=None):
+    """
+    Pengganti scrape_main: stage fetch dan parse berjalan bersamaan
+
+    Selama halaman di-parse, worker fetch sudah mengambil halaman berikutnya.
+    Hasil dikumpulkan ke collector (default ProductColumns) urut per halaman.
+    Dengan archive (HtmlArchive) body setiap halaman disimpan di bawah run_id
+    oleh stage archive di antara fetch dan parse, sama seperti scrape_main.
+    Dengan governor (MemoryGovernor) jumlah halaman di pipeline dibatasi
+    ukuran stage 'extract' (PageWindow).
+    Return (products atau None jika tidak ada produk, statistik stage).
+    """
+    collector = collector if collector is not None else ProductColumns()
+    parsed_pages = {}
+
+    def collect(parsed):
+        page, products = parsed
+        parsed_pages[page] = products
+        return parsed
+
+    stages = [Stage('fetch', PageFetcher(base_url, scheduler, session), workers=fetch_workers)]
+    if archive is not None:
+        stages.append(archive_stage(archive, run_id, base_url))
+    stages += [
+        Stage('parse', parse_fetched_page, workers=parse_workers, kind=parse_kind),
+        Stage('collect', collect),
+    ]
+    pages = range(start_page, end_page + 1)
+    window = PageWindow(pages, governor, queue_size) if governor is not None else None
+    stats = StagedExecutor(stages, queue_size=queue_size,
+                           on_item_done=window.done if window else None).run(window or pages)
+    log_stage_stats(stats)
+
+    for page in sorted(parsed_pages):
+        collector.extend(parsed_pages[page])
+    logger.info("Scraping completed: %d/%d pages successful, %d total products",
+                len(parsed_pages), end_page - start_page + 1, len(collector))
+    if len(collector) == 0:
+        logger.error("Scraping failed: no successful pages or no products found")
+        return None, stats
+    return collector, stats
+
+
+def run_staged_etl(base_url, pages, sink, scheduler=None, session=None, fetch_workers=4, parse_workers=1,
+                   parse_kind='thread', cleaner=None, stats=None, queue_size=8, hashset_path=None, archive=None,
+                   run_id=None, governor=None):
+    """
+    ETL streaming per halaman: fetch -> parse -> transform -> load
+
+    sink(df_clean) dipanggil per halaman oleh satu worker load (mis. append
+    ke PostgreSQL); sink yang lambat menahan fetch lewat antrian yang penuh.
+    hashset_path: file DiskHashSet dedup (default file sementara), sama
+    seperti transform_chunked. archive/run_id dan governor sama dengan
+    scrape_staged.
+    Return statistik stage.
+    """
+    from utils.dedup import DiskHashSet
+
+    def load(df_clean):
+        sink(df_clean)
+        return df_clean
+
+    seen = DiskHashSet(hashset_path)
+    stages = [Stage('fetch', PageFetcher(base_url, scheduler, session), workers=fetch_workers)]
+    if archive is not None:
+        stages.append(archive_stage(archive, run_id, base_url))
+    stages += [
+        Stage('parse', parse_fetched_page, workers=parse_workers, kind=parse_kind),
+        Stage('transform', PageTransformer(cleaner, stats, seen=seen)),
+        Stage('load', load),
+    ]
+    window = PageWindow(pages, governor, queue_size) if governor is not None else None
+    try:
+        stage_stats = StagedExecutor(stages, queue_size=queue_size,
+                                     on_item_done=window.done if window else None).run(window or pages)
+    finally:
+        seen.close()
+    log_stage_stats(stage_stats)
+    return stage_stats
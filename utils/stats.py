@@ -0,0 +1,247 @@
+import json
+import math
+import os
+import tempfile
+from collections import Counter
+
+import numpy as np
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STATS_NUMERIC_COLUMNS = ('Price', 'Rating', 'Colors')
+STATS_CATEGORICAL_COLUMNS = ('Gender', 'Size')
+STATS_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+class RunningMoments:
+    """
+    Count/mean/variance/min/max online (Welford), per batch numpy
+
+    Dua state digabung dengan rumus paralel Chan et al., jadi hasil
+    per chunk atau per partisi process bisa di-merge tanpa data mentah.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            batch_mean = float(values.mean())
+            self._merge_parts(len(values), batch_mean, float(((values - batch_mean) ** 2).sum()),
+                              float(values.min()), float(values.max()))
+        return self
+
+    def merge(self, other):
+        if other.count:
+            self._merge_parts(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    def _merge_parts(self, count, mean, m2, minimum, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else float('nan')
+
+    def to_dict(self):
+        if not self.count:
+            return {'count': 0}
+        return {'count': self.count, 'mean': self.mean, 'std': math.sqrt(self.variance),
+                'min': self.min, 'max': self.max}
+
+
+class KLLSketch:
+    """
+    Sketch kuantil KLL: memori O(k), bisa di-merge
+
+    Level h menyimpan nilai berbobot 2**h. Level yang melebihi kapasitas
+    diurutkan lalu setiap nilai kedua (offset acak) naik ke level berikutnya.
+    Error rank kira-kira 1.7 / k (k=200 -> ~1%).
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, height):
+        depth = len(self.levels) - height - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for height, values in enumerate(other.levels):
+            self.levels[height] = np.concatenate([self.levels[height], values])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _compress(self):
+        height = 0
+        while height < len(self.levels):
+            level = self.levels[height]
+            if len(level) > self._capacity(height):
+                if height + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                level = np.sort(level)
+                # Jumlah ganjil: satu nilai tetap di level ini supaya total bobot tidak berubah
+                leftover, level = level[:len(level) % 2], level[len(level) % 2:]
+                promoted = level[self._rng.integers(2)::2]
+                self.levels[height] = leftover
+                self.levels[height + 1] = np.concatenate([self.levels[height + 1], promoted])
+            height += 1
+
+    def quantiles(self, qs):
+        if not self.count:
+            return [float('nan')] * len(qs)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** height) for height, level in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, cumulative = values[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side='left')
+        return values[np.minimum(positions, len(values) - 1)].tolist()
+
+    def __len__(self):
+        return sum(len(level) for level in self.levels)
+
+
+class StatsAccumulator:
+    """
+    Statistik ringkas hasil transform, di-update per batch
+
+    Kolom numerik: moments (Welford) + sketch kuantil KLL; kolom kategori:
+    counter; breakdown per kategori: jumlah dan moments Price/Rating.
+    State bisa di-merge (chunk streaming, partisi process) dan di-pickle.
+    """
+
+    def __init__(self, numeric=STATS_NUMERIC_COLUMNS, categorical=STATS_CATEGORICAL_COLUMNS, k=200):
+        self.numeric = tuple(numeric)
+        self.categorical = tuple(categorical)
+        self.rows = 0
+        self.moments = {col: RunningMoments() for col in self.numeric}
+        self.sketches = {col: KLLSketch(k) for col in self.numeric}
+        self.counters = {col: Counter() for col in self.categorical}
+        # breakdown[kategori][nilai][kolom numerik] -> RunningMoments
+        self.breakdown = {col: {} for col in self.categorical}
+
+    def update(self, df):
+        """Tambahkan satu batch DataFrame bersih"""
+        if df is None or len(df) == 0:
+            return self
+        self.rows += len(df)
+        for col in self.numeric:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.moments[col].update(values)
+            self.sketches[col].update(values)
+        breakdown_columns = [col for col in ('Price', 'Rating') if col in self.numeric]
+        for col in self.categorical:
+            self.counters[col].update(df[col].value_counts().to_dict())
+            grouped = df.groupby(col, sort=False)[breakdown_columns]
+            parts = {'count': grouped.count(), 'mean': grouped.mean(), 'm2': grouped.var(ddof=0),
+                     'min': grouped.min(), 'max': grouped.max()}
+            for value in parts['count'].index:
+                group = self.breakdown[col].setdefault(value, {name: RunningMoments() for name in breakdown_columns})
+                for name in breakdown_columns:
+                    count = int(parts['count'].at[value, name])
+                    if count:
+                        group[name]._merge_parts(count, float(parts['mean'].at[value, name]),
+                                                 float(parts['m2'].at[value, name]) * count,
+                                                 float(parts['min'].at[value, name]),
+                                                 float(parts['max'].at[value, name]))
+        return self
+
+    def merge(self, other):
+        """Gabungkan state lain (mis. dari partisi/worker lain)"""
+        self.rows += other.rows
+        for col in self.numeric:
+            self.moments[col].merge(other.moments[col])
+            self.sketches[col].merge(other.sketches[col])
+        for col in self.categorical:
+            self.counters[col].update(other.counters[col])
+            for value, group in other.breakdown[col].items():
+                mine = self.breakdown[col].setdefault(value, {name: RunningMoments() for name in group})
+                for name, moments in group.items():
+                    mine[name].merge(moments)
+        return self
+
+    def to_dict(self, quantiles=STATS_QUANTILES):
+        """Ringkasan yang bisa ditulis sebagai JSON"""
+        numeric = {}
+        for col in self.numeric:
+            summary = self.moments[col].to_dict()
+            if summary['count']:
+                summary['quantiles'] = {f"p{round(q * 100):02d}": value
+                                        for q, value in zip(quantiles, self.sketches[col].quantiles(quantiles))}
+            numeric[col] = summary
+        breakdown = {}
+        for col in self.categorical:
+            breakdown[col] = {}
+            for value, group in sorted(self.breakdown[col].items(), key=lambda item: str(item[0])):
+                entry = {'count': self.counters[col][value]}
+                for name, moments in group.items():
+                    entry[name] = {key: value for key, value in moments.to_dict().items() if key != 'count'}
+                breakdown[col][str(value)] = entry
+        return {
+            'rows': self.rows,
+            'numeric': numeric,
+            'categorical': {col: {str(value): count for value, count in self.counters[col].most_common()}
+                            for col in self.categorical},
+            'breakdown': breakdown,
+        }
+
+
+def stats_path_for(output_path):
+    """products.csv -> products.stats.json (juga untuk .csv.gz / .csv.zst)"""
+    base = output_path
+    for suffix in ('.gz', '.zst'):
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+    return os.path.splitext(base)[0] + '.stats.json'
+
+
+def write_stats(stats, path):
+    """Tulis ringkasan statistik sebagai JSON (file sementara lalu rename)"""
+    summary = stats.to_dict() if isinstance(stats, StatsAccumulator) else stats
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        handle, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=1, default=float)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        logger.info("Run statistics saved to %s", path)
+        return True
+    except Exception as e:
+        logger.error("Error saving run statistics: %s", e)
+        return False
@@ -0,0 +1,139 @@
+import os
+import sqlite3
+from datetime import datetime
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STORE_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp']
+
+# Index untuk filter yang paling sering dipakai ("Women di bawah X Rupiah rating > 4").
+# Query selalu dibatasi satu run (default run terakhir), jadi run_id di depan:
+# tanpa itu index Gender/Price ikut memindai baris semua run lama
+STORE_INDEXES = {
+    'idx_products_run_gender_price': ['run_id', 'Gender', 'Price'],
+    'idx_products_run_size': ['run_id', 'Size'],
+    'idx_products_run_price': ['run_id', 'Price'],
+    'idx_products_run_rating': ['run_id', 'Rating'],
+}
+# Index versi lama (tanpa run_id di depan) yang dibuang dari store yang sudah ada
+LEGACY_STORE_INDEXES = ['idx_products_run', 'idx_products_gender_price', 'idx_products_size',
+                        'idx_products_price', 'idx_products_rating']
+
+
+class ProductStore:
+    """
+    Store analitik lokal (SQLite WAL) untuk data produk bersih
+
+    Setiap run di-append dengan run_id dan loaded_at, sehingga data lama
+    tetap ada dan bisa di-query tanpa membaca seluruh CSV.
+    """
+
+    def __init__(self, path='products.db'):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS products ('
+            ' run_id TEXT NOT NULL,'
+            ' loaded_at TEXT NOT NULL,'
+            ' "Title" TEXT NOT NULL,'
+            ' "Price" REAL NOT NULL,'
+            ' "Rating" REAL NOT NULL,'
+            ' "Colors" INTEGER NOT NULL,'
+            ' "Size" TEXT NOT NULL,'
+            ' "Gender" TEXT NOT NULL,'
+            ' "timestamp" TEXT NOT NULL)'
+        )
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS runs ('
+            ' run_id TEXT PRIMARY KEY,'
+            ' loaded_at TEXT NOT NULL,'
+            ' row_count INTEGER NOT NULL)'
+        )
+        for name in LEGACY_STORE_INDEXES:
+            self.conn.execute(f'DROP INDEX IF EXISTS {name}')
+        for name, columns in STORE_INDEXES.items():
+            column_list = ', '.join(f'"{col}"' for col in columns)
+            self.conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON products ({column_list})')
+        self.conn.commit()
+
+    def append(self, df, run_id=None):
+        """
+        Bulk append satu run dalam satu transaksi
+
+        Return run_id yang dipakai
+        """
+        loaded_at = datetime.now().isoformat()
+        run_id = run_id or datetime.now().strftime('%Y%m%dT%H%M%S%f')
+
+        rows = zip(
+            df['Title'].astype(str).tolist(),
+            df['Price'].astype('float64').tolist(),
+            df['Rating'].astype('float64').tolist(),
+            df['Colors'].astype('int64').tolist(),
+            df['Size'].astype(str).tolist(),
+            df['Gender'].astype(str).tolist(),
+            df['timestamp'].astype(str).tolist(),
+        )
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO products (run_id, loaded_at, "Title", "Price", "Rating", "Colors", "Size", '
+                '"Gender", "timestamp") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((run_id, loaded_at) + row for row in rows)
+            )
+            self.conn.execute(
+                'INSERT OR REPLACE INTO runs (run_id, loaded_at, row_count) VALUES (?, ?, ?)',
+                (run_id, loaded_at, len(df))
+            )
+            # Statistik planner: ANALYZE penuh sekali saat belum ada statistik (run pertama),
+            # selanjutnya PRAGMA optimize. Tanpa statistik planner bisa memilih
+            # (run_id, Rating) padahal (run_id, Gender, Price) jauh lebih selektif
+            if self._has_stats():
+                self.conn.execute('PRAGMA optimize')
+            else:
+                self.conn.execute('ANALYZE products')
+        return run_id
+
+    def _has_stats(self):
+        """Statistik planner untuk index STORE_INDEXES sudah ada (store lama hanya punya statistik index lama)"""
+        if not self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+            return False
+        found = self.conn.execute(
+            f"SELECT COUNT(DISTINCT idx) FROM sqlite_stat1 WHERE idx IN ({', '.join('?' * len(STORE_INDEXES))})",
+            list(STORE_INDEXES)
+        ).fetchone()[0]
+        return found == len(STORE_INDEXES)
+
+    def latest_run_id(self):
+        row = self.conn.execute('SELECT run_id FROM runs ORDER BY loaded_at DESC LIMIT 1').fetchone()
+        return row[0] if row else None
+
+    def runs(self):
+        """List (run_id, loaded_at, row_count), run terbaru di akhir"""
+        return self.conn.execute('SELECT run_id, loaded_at, row_count FROM runs ORDER BY loaded_at').fetchall()
+
+    def close(self):
+        self.conn.close()
+
+
+def save_to_store(df, path='products.db', run_id=None):
+    """
+    Save DataFrame ke embedded store lokal (SQLite)
+    """
+    try:
+        store = ProductStore(path)
+        try:
+            run_id = store.append(df, run_id)
+        finally:
+            store.close()
+        logger.info("Data successfully saved to local store %s (run_id=%s, %d records)", path, run_id, len(df))
+        return True
+    except Exception as e:
+        logger.error("Error saving to local store: %s", e)
+        return False
@@ -1,46 +1,56 @@
+import functools
 import pandas as pd
 import re
 import numpy as np
+from collections import OrderedDict
+
+from utils.dedup import DiskHashSet, compute_row_hash
+from utils.logger import get_logger
+from utils.memory import estimate_row_bytes
+from utils.stats import StatsAccumulator
+from utils.rules import compile_spec
+
+logger = get_logger(__name__)
 
 def transform_data(df):
     """
     Transform dan clean data - VERSION FIXED
     """
     try:
-        print("Starting data transformation...")
-        print(f"Initial data shape: {df.shape}")
-        print(f"Initial dtypes:\n{df.dtypes}")
+        logger.info("Starting data transformation...")
+        logger.debug("Initial data shape: %s", df.shape)
+        logger.debug("Initial dtypes:\n%s", df.dtypes)
         
         # Buat DEEP copy dataframe
         df_clean = df.copy(deep=True)
         
         # Step 1: Basic cleaning - remove invalid titles
         df_clean = df_clean[df_clean['Title'] != "Unknown Product"]
-        print(f"After removing invalid titles: {len(df_clean)}")
+        logger.debug("After removing invalid titles: %d", len(df_clean))
         
         # Step 2: Remove duplicates
         df_clean = df_clean.drop_duplicates()
-        print(f"After removing duplicates: {len(df_clean)}")
+        logger.debug("After removing duplicates: %d", len(df_clean))
         
         # Step 3: Clean Price - langsung convert ke numeric dan Rupiah
         df_clean = clean_price_simple(df_clean)
-        print(f"After cleaning price: {len(df_clean)}")
+        logger.debug("After cleaning price: %d", len(df_clean))
         
         # Step 4: Clean Rating - langsung convert ke numeric
         df_clean = clean_rating_simple(df_clean)
-        print(f"After cleaning rating: {len(df_clean)}")
+        logger.debug("After cleaning rating: %d", len(df_clean))
         
         # Step 5: Clean Colors - langsung convert ke numeric
         df_clean = clean_colors_simple(df_clean)
-        print(f"After cleaning colors: {len(df_clean)}")
+        logger.debug("After cleaning colors: %d", len(df_clean))
         
         # Step 6: Clean Size - remove prefix
         df_clean = clean_size_simple(df_clean)
-        print(f"After cleaning size: {len(df_clean)}")
+        logger.debug("After cleaning size: %d", len(df_clean))
         
         # Step 7: Clean Gender - remove prefix
         df_clean = clean_gender_simple(df_clean)
-        print(f"After cleaning gender: {len(df_clean)}")
+        logger.debug("After cleaning gender: %d", len(df_clean))
         
         # Step 8: Convert data types dengan cara yang lebih robust
         df_clean = convert_dtypes_fixed(df_clean)
@@ -49,136 +59,142 @@ def transform_data(df):
         df_clean = df_clean.dropna()
         df_clean = df_clean.reset_index(drop=True)
         
-        print(f"Final data shape: {df_clean.shape}")
-        print(f"Final dtypes:\n{df_clean.dtypes}")
+        logger.info("Transformation completed: %d rows", len(df_clean))
+        logger.debug("Final dtypes:\n%s", df_clean.dtypes)
         
         return df_clean
         
-    except Exception as e:
-        print(f"Error during transformation: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error during transformation")
         return None
 
-def clean_price_simple(df):
+def extract_price(value):
+    """Ambil harga dari teks seperti '$102.15' dan konversi ke Rupiah"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    
+    value_str = str(value)
+    # Look for $xxx.xx pattern
+    match = re.search(r'\$?([\d,]+\.?\d*)', value_str)
+    if match:
+        price_val = match.group(1).replace(',', '')
+        try:
+            return float(price_val) * 16000  # Convert to Rupiah immediately
+        except ValueError:
+            return None
+    return None
+
+def extract_rating(value):
+    """Ambil rating dari teks seperti 'Rating: ⭐ 3.9 / 5'"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    
+    value_str = str(value)
+    # Look for x.x / 5 pattern
+    match = re.search(r'(\d+\.?\d*)\s*\/\s*5', value_str)
+    if match:
+        try:
+            return float(match.group(1))
+        except ValueError:
+            return None
+    
+    # Try simple float conversion
+    try:
+        rating_val = float(value_str)
+        if 0 <= rating_val <= 5:
+            return rating_val
+    except ValueError:
+        pass
+    
+    return None
+
+def extract_colors(value):
+    """Ambil jumlah warna dari teks seperti '3 Colors'"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    
+    value_str = str(value)
+    # Look for numbers
+    match = re.search(r'(\d+)', value_str)
+    if match:
+        try:
+            return int(match.group(1))
+        except ValueError:
+            return None
+    return None
+
+def extract_size(value):
+    """Hapus prefix 'Size: '"""
+    value_str = str(value)
+    return value_str.replace('Size: ', '').strip()
+
+def extract_gender(value):
+    """Hapus prefix 'Gender: '"""
+    value_str = str(value)
+    return value_str.replace('Gender: ', '').strip()
+
+def clean_price_simple(df, cleaner=None):
     """Clean price dengan cara sederhana dan efektif"""
     # Filter out "Price Unavailable"
     df_clean = df[df['Price'] != "Price Unavailable"].copy()
     
-    # Function to extract price
-    def extract_price(value):
-        if isinstance(value, (int, float)):
-            return float(value)
-        
-        value_str = str(value)
-        # Look for $xxx.xx pattern
-        match = re.search(r'\$?([\d,]+\.?\d*)', value_str)
-        if match:
-            price_val = match.group(1).replace(',', '')
-            try:
-                return float(price_val) * 16000  # Convert to Rupiah immediately
-            except ValueError:
-                return None
-        return None
-    
     # Apply price extraction
-    df_clean['Price'] = df_clean['Price'].apply(extract_price)
+    df_clean['Price'] = _extract_column(df_clean['Price'], extract_price, cleaner)
     
     # Remove rows where price extraction failed
     df_clean = df_clean[df_clean['Price'].notna()]
     
     return df_clean
 
-def clean_rating_simple(df):
+def clean_rating_simple(df, cleaner=None):
     """Clean rating dengan cara sederhana dan efektif"""
     # Filter out invalid ratings
     invalid_ratings = ["Invalid Rating / 5", "Not Rated"]
     df_clean = df[~df['Rating'].isin(invalid_ratings)].copy()
     
-    # Function to extract rating
-    def extract_rating(value):
-        if isinstance(value, (int, float)):
-            return float(value)
-        
-        value_str = str(value)
-        # Look for x.x / 5 pattern
-        match = re.search(r'(\d+\.?\d*)\s*\/\s*5', value_str)
-        if match:
-            try:
-                return float(match.group(1))
-            except ValueError:
-                return None
-        
-        # Try simple float conversion
-        try:
-            rating_val = float(value_str)
-            if 0 <= rating_val <= 5:
-                return rating_val
-        except ValueError:
-            pass
-        
-        return None
-    
     # Apply rating extraction
-    df_clean['Rating'] = df_clean['Rating'].apply(extract_rating)
+    df_clean['Rating'] = _extract_column(df_clean['Rating'], extract_rating, cleaner)
     
     # Remove rows where rating extraction failed
     df_clean = df_clean[df_clean['Rating'].notna()]
     
     return df_clean
 
-def clean_colors_simple(df):
+def clean_colors_simple(df, cleaner=None):
     """Clean colors dengan cara sederhana dan efektif"""
-    # Function to extract colors
-    def extract_colors(value):
-        if isinstance(value, (int, float)):
-            return int(value)
-        
-        value_str = str(value)
-        # Look for numbers
-        match = re.search(r'(\d+)', value_str)
-        if match:
-            try:
-                return int(match.group(1))
-            except ValueError:
-                return None
-        return None
-    
     # Apply colors extraction
     df_clean = df.copy()
-    df_clean['Colors'] = df_clean['Colors'].apply(extract_colors)
+    df_clean['Colors'] = _extract_column(df_clean['Colors'], extract_colors, cleaner)
     
     # Remove rows where colors extraction failed
     df_clean = df_clean[df_clean['Colors'].notna()]
     
     return df_clean
 
-def clean_size_simple(df):
+def clean_size_simple(df, cleaner=None):
     """Clean size dengan cara sederhana dan efektif"""
     df_clean = df.copy()
     
-    def extract_size(value):
-        value_str = str(value)
-        return value_str.replace('Size: ', '').strip()
-    
-    df_clean['Size'] = df_clean['Size'].apply(extract_size)
+    df_clean['Size'] = _extract_column(df_clean['Size'], extract_size, cleaner)
     df_clean = df_clean[df_clean['Size'] != "Unknown"]
     
     return df_clean
 
-def clean_gender_simple(df):
+def clean_gender_simple(df, cleaner=None):
     """Clean gender dengan cara sederhana dan efektif"""
     df_clean = df.copy()
     
-    def extract_gender(value):
-        value_str = str(value)
-        return value_str.replace('Gender: ', '').strip()
-    
-    df_clean['Gender'] = df_clean['Gender'].apply(extract_gender)
+    df_clean['Gender'] = _extract_column(df_clean['Gender'], extract_gender, cleaner)
     df_clean = df_clean[df_clean['Gender'] != "Unknown"]
     
     return df_clean
 
+def _extract_column(series, parser, cleaner=None):
+    """Jalankan parser per baris, atau per nilai unik jika ada FactorizedCleaner"""
+    if cleaner is None:
+        return series.apply(parser)
+    return cleaner.map(series, parser)
+
 def convert_dtypes_fixed(df):
     """Convert data types dengan cara yang benar-benar bekerja"""
     df_clean = df.copy()
@@ -197,4 +213,315 @@ def convert_dtypes_fixed(df):
     df_clean['Gender'] = df_clean['Gender'].astype('object')
     df_clean['timestamp'] = df_clean['timestamp'].astype('object')
     
-    return df_clean
\ No newline at end of file
+    return df_clean
+
+class ParseMemo:
+    """Cache LRU terbatas untuk hasil parser per nilai mentah"""
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, value, parser):
+        # NaN tidak bisa dipakai sebagai key yang konsisten, parse langsung
+        if value != value:
+            return parser(value)
+        try:
+            result = self._cache[value]
+        except KeyError:
+            self.misses += 1
+            result = parser(value)
+            self._cache[value] = result
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+            return result
+        except TypeError:
+            return parser(value)
+        self.hits += 1
+        self._cache.move_to_end(value)
+        return result
+
+
+class FactorizedCleaner:
+    """
+    Jalankan parser sekali per nilai unik, bukan per baris
+
+    Kolom mentah (Rating, Colors, Size, Gender, Price) sangat repetitif, jadi
+    kolom di-factorize (pd.factorize), parser dijalankan pada nilai unik, lalu
+    hasilnya dipetakan kembali lewat integer codes. Memo cache disimpan di
+    instance sehingga bisa dipakai ulang antar batch pada streaming run.
+    """
+
+    def __init__(self, memo_size=100000):
+        self.memo_size = memo_size
+        self._memos = {}
+
+    def map(self, series, parser):
+        memo = self._memos.get(parser)
+        if memo is None:
+            memo = self._memos[parser] = ParseMemo(self.memo_size)
+
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+        parsed = np.empty(len(uniques), dtype=object)
+        for i, value in enumerate(uniques):
+            parsed[i] = memo.get(value, parser)
+
+        return pd.Series(parsed.take(codes), index=series.index, dtype=object).infer_objects()
+
+    def stats(self):
+        """Statistik memo per parser (hits, misses, size)"""
+        return {
+            parser.__name__: {'hits': memo.hits, 'misses': memo.misses, 'size': len(memo)}
+            for parser, memo in self._memos.items()
+        }
+
+
+def transform_data_factorized(df, cleaner=None):
+    """
+    Transform dengan FactorizedCleaner: hasil sama dengan transform_data,
+    tetapi regex hanya dijalankan per nilai unik
+    """
+    try:
+        cleaner = cleaner or FactorizedCleaner()
+        logger.info("Starting factorized data transformation...")
+        df_clean = df[df['Title'] != "Unknown Product"]
+        df_clean = df_clean.drop_duplicates()
+        df_clean = apply_cleaning_rules(df_clean, cleaner)
+        df_clean = df_clean.reset_index(drop=True)
+        logger.info("Factorized transformation completed: %d rows", len(df_clean))
+        return df_clean
+    except Exception:
+        logger.exception("Error during factorized transformation")
+        return None
+
+
+def transform_data_compiled(df, plan=None):
+    """
+    Transform memakai TransformPlan hasil compile spec deklaratif (utils.rules)
+
+    Hasilnya sama dengan transform_data untuk DEFAULT_SPEC.
+    """
+    try:
+        plan = plan or compile_spec()
+        logger.info("Starting compiled data transformation...")
+        df_clean = df[df['Title'] != "Unknown Product"]
+        df_clean = df_clean.drop_duplicates()
+        df_clean = plan.execute(df_clean)
+        df_clean = df_clean.reset_index(drop=True)
+        logger.info("Compiled transformation completed: %d rows", len(df_clean))
+        return df_clean
+    except Exception:
+        logger.exception("Error during compiled transformation")
+        return None
+
+
+def apply_cleaning_rules(df, cleaner=None):
+    """
+    Jalankan rule cleaning yang sama dengan transform_data (step 3-9)
+    tanpa log per step, untuk dipakai per chunk/partisi
+
+    Jika cleaner (FactorizedCleaner) diberikan, parser hanya dijalankan
+    sekali per nilai unik.
+    """
+    df_clean = clean_price_simple(df, cleaner)
+    df_clean = clean_rating_simple(df_clean, cleaner)
+    df_clean = clean_colors_simple(df_clean, cleaner)
+    df_clean = clean_size_simple(df_clean, cleaner)
+    df_clean = clean_gender_simple(df_clean, cleaner)
+    df_clean = convert_dtypes_fixed(df_clean)
+    return df_clean.dropna()
+
+
+def iter_raw_chunks(source, chunksize=100000):
+    """
+    Iterasi data mentah per chunk dari path CSV atau iterable batch
+
+    Batch boleh berupa DataFrame atau list of dict hasil scrape. chunksize
+    boleh berupa callable yang dipanggil sebelum tiap chunk (ukuran adaptif).
+    """
+    next_size = chunksize if callable(chunksize) else (lambda: chunksize)
+    if isinstance(source, str):
+        # Semua kolom dibaca sebagai string, sama seperti hasil scrape
+        with pd.read_csv(source, iterator=True, dtype=str, keep_default_na=False) as reader:
+            while True:
+                try:
+                    yield reader.get_chunk(next_size())
+                except StopIteration:
+                    return
+
+    for batch in source:
+        if not isinstance(batch, pd.DataFrame):
+            batch = pd.DataFrame(batch)
+        start = 0
+        while start < len(batch):
+            size = next_size()
+            yield batch.iloc[start:start + size]
+            start += size
+
+
+def transform_chunked(source, sink, chunksize=100000, hashset_path=None, cleaner=None, governor=None,
+                      stats=None):
+    """
+    Transform out-of-core: proses data mentah per chunk dengan memori konstan
+
+    source: path CSV mentah atau iterable batch (DataFrame / list of dict)
+    sink:   path CSV output (ditulis bertahap) atau callable(df_chunk)
+    Deduplikasi global memakai DiskHashSet sehingga duplikat antar chunk
+    tetap terbuang tanpa menyimpan semua baris di RAM. Berikan cleaner
+    (FactorizedCleaner) supaya memo parser dipakai ulang antar chunk.
+    Dengan governor (MemoryGovernor) chunksize disesuaikan per chunk
+    terhadap budget memori. stats (StatsAccumulator) di-update per chunk
+    bersih.
+
+    Return jumlah baris bersih yang ditulis, atau None jika gagal
+    """
+    seen = DiskHashSet(hashset_path)
+    written = 0
+    header_written = False
+    columns = None
+
+    try:
+        logger.info("Starting chunked transformation (chunksize=%d)...", chunksize)
+        if governor is not None:
+            governor.initial_size('transform', chunksize)
+            chunksize = functools.partial(governor.size, 'transform')
+        for chunk_number, chunk in enumerate(iter_raw_chunks(source, chunksize), start=1):
+            if governor is not None:
+                # RSS diukur saat chunk ini di memori; hasilnya menentukan ukuran chunk berikutnya
+                governor.adapt('transform', item_bytes=estimate_row_bytes(chunk))
+            columns = list(chunk.columns)
+            chunk = chunk[chunk['Title'] != "Unknown Product"]
+            if chunk.empty:
+                continue
+
+            # Deduplikasi global atas seluruh kolom mentah (sama dengan drop_duplicates)
+            is_new = seen.add(compute_row_hash(chunk, columns))
+            chunk = chunk[is_new]
+
+            df_clean = apply_cleaning_rules(chunk, cleaner)
+            if df_clean.empty:
+                continue
+            if stats is not None:
+                stats.update(df_clean)
+
+            if callable(sink):
+                sink(df_clean.reset_index(drop=True))
+            else:
+                df_clean.to_csv(sink, mode='a' if header_written else 'w',
+                                header=not header_written, index=False, encoding='utf-8')
+                header_written = True
+            written += len(df_clean)
+            logger.debug("Chunk %d: %d clean rows (total %d)", chunk_number, len(df_clean), written)
+
+        if not callable(sink) and not header_written:
+            # Tetap tulis header supaya output selalu berupa CSV yang valid
+            pd.DataFrame(columns=columns or ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp']) \
+                .to_csv(sink, index=False, encoding='utf-8')
+
+        logger.info("Chunked transformation completed: %d clean rows", written)
+        return written
+
+    except Exception:
+        logger.exception("Error during chunked transformation")
+        return None
+    finally:
+        seen.close()
+
+
+def transform_data_chunked(df, chunksize=100000, governor=None, cleaner=None):
+    """
+    transform_data per chunk untuk DataFrame mentah yang sudah di memori
+
+    Rule dan deduplikasi global sama dengan transform_chunked; dengan governor
+    ukuran chunk mengikuti stage 'transform'. Return DataFrame bersih, atau
+    None jika gagal (sama dengan transform_data).
+    """
+    frames = []
+    written = transform_chunked([df], frames.append, chunksize=chunksize, cleaner=cleaner, governor=governor)
+    if written is None:
+        return None
+    if not frames:
+        return pd.DataFrame(columns=df.columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _frame_to_buffers(df):
+    """Pecah DataFrame menjadi dict numpy array per kolom (murah untuk di-pickle)"""
+    return {col: df[col].to_numpy() for col in df.columns}
+
+
+def _buffers_to_frame(buffers):
+    return pd.DataFrame({col: values for col, values in buffers.items()})
+
+
+def _clean_partition(buffers, collect_stats=False):
+    """
+    Worker process: jalankan cleaning chain pada satu partisi
+
+    Return (buffers bersih, StatsAccumulator partisi atau None)
+    """
+    df_clean = apply_cleaning_rules(_buffers_to_frame(buffers))
+    partition_stats = StatsAccumulator().update(df_clean) if collect_stats else None
+    return _frame_to_buffers(df_clean), partition_stats
+
+
+def transform_data_parallel(source, workers=None, partitions=None, min_rows_per_partition=10000, stats=None):
+    """
+    Transform paralel dengan ProcessPoolExecutor
+
+    source: DataFrame mentah atau path CSV mentah
+    Filter title dan deduplikasi global dijalankan sekali di proses utama
+    (sebelum cleaning, sama seperti transform_data), lalu data dibagi menjadi
+    partisi berurutan yang dibersihkan paralel dan digabung kembali sesuai
+    urutan. Hasilnya identik dengan transform_data. Jika stats
+    (StatsAccumulator) diberikan, statistik dihitung per partisi di worker
+    lalu di-merge.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import os
+
+    try:
+        if isinstance(source, str):
+            df = pd.read_csv(source, dtype=str, keep_default_na=False)
+        else:
+            df = source
+
+        logger.info("Starting parallel data transformation...")
+        df_clean = df[df['Title'] != "Unknown Product"]
+        df_clean = df_clean.drop_duplicates()
+
+        workers = workers or os.cpu_count() or 1
+        if partitions is None:
+            partitions = max(1, min(workers * 4, len(df_clean) // max(1, min_rows_per_partition)))
+
+        if workers == 1 or partitions == 1:
+            # Data kecil: overhead process pool lebih mahal dari cleaning-nya
+            results = [_clean_partition(_frame_to_buffers(df_clean), stats is not None)]
+        else:
+            bounds = np.linspace(0, len(df_clean), partitions + 1, dtype=int)
+            payloads = [_frame_to_buffers(df_clean.iloc[start:end])
+                        for start, end in zip(bounds[:-1], bounds[1:])]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # executor.map menjaga urutan partisi
+                results = list(executor.map(functools.partial(_clean_partition, collect_stats=stats is not None),
+                                            payloads))
+
+        if stats is not None:
+            for _, partition_stats in results:
+                stats.merge(partition_stats)
+        df_clean = pd.concat([_buffers_to_frame(buffers) for buffers, _ in results], ignore_index=True)
+        # Kembalikan dtype yang sama dengan jalur serial walaupun ada partisi kosong
+        df_clean = convert_dtypes_fixed(df_clean)
+
+        logger.info("Parallel transformation completed: %d rows from %d partitions on %d workers",
+                    len(df_clean), partitions, workers)
+        return df_clean
+
+    except Exception:
+        logger.exception("Error during parallel transformation")
+        return None
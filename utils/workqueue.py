@@ -0,0 +1,252 @@
+import os
+import socket
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from utils.extract import PRODUCT_FIELDS, ProductColumns, scrape_main
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STATUS_PENDING = 'pending'
+STATUS_LEASED = 'leased'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+SHARD_COLUMNS = list(PRODUCT_FIELDS) + ['page']
+
+
+class PageQueue:
+    """
+    Antrian halaman yang durable (SQLite WAL) untuk scrape multi-worker
+
+    Coordinator memasukkan halaman, worker me-lease beberapa halaman sekaligus.
+    Lease punya batas waktu: halaman dari worker yang crash otomatis bisa
+    di-lease ulang setelah lease_seconds. Halaman yang gagal max_attempts kali
+    ditandai failed.
+    """
+
+    def __init__(self, path='work_queue.sqlite', lease_seconds=300, max_attempts=3, clock=None):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._clock = clock or time.time
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # isolation_level=None: transaksi dikontrol manual (BEGIN IMMEDIATE)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            ' page INTEGER PRIMARY KEY,'
+            ' status TEXT NOT NULL,'
+            ' worker TEXT,'
+            ' lease_expires REAL,'
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' shard TEXT)'
+        )
+
+    def enqueue(self, pages):
+        """Masukkan halaman ke antrian; halaman yang sudah ada tidak diubah"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        before = self.conn.total_changes
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO pages (page, status) VALUES (?, ?)',
+            ((page, STATUS_PENDING) for page in pages)
+        )
+        added = self.conn.total_changes - before
+        self.conn.execute('COMMIT')
+        return added
+
+    def lease(self, worker_id, batch=1):
+        """
+        Lease sampai batch halaman (pending atau lease-nya sudah kadaluarsa)
+
+        Lease kadaluarsa yang attempt-nya sudah habis (worker crash berulang
+        di halaman yang sama) ditandai failed, tidak di-lease ulang.
+        Return list nomor halaman, kosong jika tidak ada pekerjaan.
+        """
+        now = self._clock()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            exhausted = self.conn.execute(
+                'UPDATE pages SET status = ?, worker = NULL, lease_expires = NULL '
+                'WHERE status = ? AND lease_expires < ? AND attempts >= ?',
+                (STATUS_FAILED, STATUS_LEASED, now, self.max_attempts)
+            ).rowcount
+            rows = self.conn.execute(
+                'SELECT page FROM pages WHERE status = ? OR (status = ? AND lease_expires < ?) '
+                'ORDER BY page LIMIT ?',
+                (STATUS_PENDING, STATUS_LEASED, now, batch)
+            ).fetchall()
+            pages = [row[0] for row in rows]
+            self.conn.executemany(
+                'UPDATE pages SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 '
+                'WHERE page = ?',
+                ((STATUS_LEASED, worker_id, now + self.lease_seconds, page) for page in pages)
+            )
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        if exhausted:
+            logger.warning("%d expired leases reached %d attempts, marked failed", exhausted, self.max_attempts)
+        return pages
+
+    def heartbeat(self, worker_id):
+        """Perpanjang semua lease milik worker (untuk batch yang lama)"""
+        self.conn.execute(
+            'UPDATE pages SET lease_expires = ? WHERE worker = ? AND status = ?',
+            (self._clock() + self.lease_seconds, worker_id, STATUS_LEASED)
+        )
+
+    def complete(self, pages, worker_id, shard):
+        """
+        Tandai halaman selesai dengan output di shard
+
+        Hanya halaman yang lease-nya masih dipegang worker ini yang diterima;
+        return list halaman yang diterima.
+        """
+        self.conn.execute('BEGIN IMMEDIATE')
+        accepted = []
+        for page in pages:
+            cursor = self.conn.execute(
+                'UPDATE pages SET status = ?, shard = ?, lease_expires = NULL '
+                'WHERE page = ? AND worker = ? AND status = ?',
+                (STATUS_DONE, shard, page, worker_id, STATUS_LEASED)
+            )
+            if cursor.rowcount:
+                accepted.append(page)
+        self.conn.execute('COMMIT')
+        return accepted
+
+    def release(self, pages, worker_id):
+        """Kembalikan halaman yang gagal ke antrian (atau failed jika attempt habis)"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        for page in pages:
+            self.conn.execute(
+                'UPDATE pages SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+                'worker = NULL, lease_expires = NULL WHERE page = ? AND worker = ? AND status = ?',
+                (self.max_attempts, STATUS_FAILED, STATUS_PENDING, page, worker_id, STATUS_LEASED)
+            )
+        self.conn.execute('COMMIT')
+
+    def stats(self):
+        """Jumlah halaman per status"""
+        counts = {STATUS_PENDING: 0, STATUS_LEASED: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        for status, count in self.conn.execute('SELECT status, COUNT(*) FROM pages GROUP BY status'):
+            counts[status] = count
+        return counts
+
+    def finished(self):
+        """True jika tidak ada halaman pending/leased lagi"""
+        stats = self.stats()
+        return stats[STATUS_PENDING] == 0 and stats[STATUS_LEASED] == 0
+
+    def shards(self):
+        """Dict shard -> list halaman yang diterima dari shard tersebut"""
+        result = {}
+        rows = self.conn.execute('SELECT shard, page FROM pages WHERE status = ? ORDER BY page', (STATUS_DONE,))
+        for shard, page in rows:
+            result.setdefault(shard, []).append(page)
+        return result
+
+    def close(self):
+        self.conn.close()
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def write_shard(df, shard_dir, worker_id):
+    """
+    Tulis output satu batch ke shard CSV (tulis ke file sementara lalu rename)
+
+    df: DataFrame mentah dengan kolom tambahan page. Return path shard.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    name = f"shard-{worker_id}-{df['page'].min()}-{time.time_ns()}.csv"
+    path = os.path.join(shard_dir, name)
+    handle, tmp_path = tempfile.mkstemp(dir=shard_dir, suffix='.tmp')
+    os.close(handle)
+    df.to_csv(tmp_path, index=False, columns=SHARD_COLUMNS)
+    os.replace(tmp_path, path)
+    return path
+
+
+def run_worker(queue, base_url, shard_dir='shards', worker_id=None, batch=5, scheduler=None,
+               idle_timeout=0, poll_interval=5.0, governor=None):
+    """
+    Loop worker: lease halaman, scrape, tulis shard, tandai selesai
+
+    Berhenti saat antrian kosong (setelah menunggu idle_timeout detik untuk
+    lease yang mungkin kadaluarsa). Dengan governor (MemoryGovernor) jumlah
+    halaman per lease disesuaikan dengan budget memori, maksimal 4x batch.
+    Return jumlah halaman yang diselesaikan.
+    """
+    worker_id = worker_id or default_worker_id()
+    if governor is not None:
+        batch = governor.initial_size('extract', batch, maximum=batch * 4)
+    completed = 0
+    idle_since = None
+
+    while True:
+        pages = queue.lease(worker_id, batch)
+        if not pages:
+            if queue.finished():
+                break
+            idle_since = idle_since or time.monotonic()
+            if time.monotonic() - idle_since >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+        idle_since = None
+
+        frames = []
+        failed = []
+        for page in pages:
+            products = scrape_main(base_url, page, page, scheduler=scheduler, collector=ProductColumns())
+            if not products:
+                failed.append(page)
+                continue
+            frames.append(products.to_dataframe().assign(page=page))
+            queue.heartbeat(worker_id)
+
+        if frames:
+            done = [int(frame['page'].iat[0]) for frame in frames]
+            shard = write_shard(pd.concat(frames, ignore_index=True), shard_dir, worker_id)
+            accepted = queue.complete(done, worker_id, shard)
+            completed += len(accepted)
+            logger.info("Worker %s: %d pages written to %s", worker_id, len(accepted), shard)
+        if failed:
+            queue.release(failed, worker_id)
+            logger.warning("Worker %s: %d pages returned to queue: %s", worker_id, len(failed), failed)
+        if governor is not None:
+            batch = governor.adapt('extract')
+
+    logger.info("Worker %s finished: %d pages completed", worker_id, completed)
+    return completed
+
+
+def merge_shards(queue):
+    """
+    Gabungkan shard menjadi satu ProductColumns mentah, urut per halaman
+
+    Hanya halaman yang diterima queue dari shard tersebut yang diambil, sehingga
+    output worker yang lease-nya sudah kadaluarsa (duplikat) diabaikan.
+    """
+    frames = []
+    for shard, pages in queue.shards().items():
+        df = pd.read_csv(shard, dtype=str, keep_default_na=False)
+        df['page'] = df['page'].astype(int)
+        frames.append(df[df['page'].isin(pages)])
+
+    if not frames:
+        return ProductColumns()
+    merged = pd.concat(frames, ignore_index=True).sort_values('page', kind='stable')
+    return ProductColumns.from_dataframe(merged)